@@ -29,6 +29,7 @@ from agentstack_sdk.server.store.platform_context_store import PlatformContextSt
 from granite_core.config import settings as core_settings
 from granite_core.logging import get_logger
 from granite_core.utils import log_settings
+from granite_core.work import cpu_pool
 
 from a2a_agents import __version__
 from a2a_agents.agents.chat.agent_chat import chat, chat_skill
@@ -160,6 +161,7 @@ else:
 if __name__ == "__main__":
     log_settings(settings, name="Agent")
     log_settings(core_settings)
+    cpu_pool.start()
     server.run(
         host=settings.HOST,
         port=settings.PORT,
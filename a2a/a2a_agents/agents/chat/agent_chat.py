@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
@@ -125,6 +126,11 @@ async def chat(
         logger.info(msg=f"Agent: {''.join(agent_response_text)}")
         await context.store(data=AgentMessage(text="".join(agent_response_text)))
 
+    except asyncio.CancelledError:
+        # The run is cancelled when the client goes away, let it propagate so in flight work is cancelled too
+        logger.info("Chat agent run cancelled")
+        raise
+
     except BaseException as e:
         logger.exception(msg="Chat agent error, threw exception...")
         error_msg: str = f"Error processing request: {e!s}"
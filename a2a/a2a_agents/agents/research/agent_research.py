@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
@@ -37,6 +38,7 @@ from granite_core.events import (
 from granite_core.logging import get_logger
 from granite_core.research.researcher import Researcher
 from granite_core.utils import log_settings
+from granite_core.work import cpu_pool
 
 from a2a_agents import __version__
 from a2a_agents.config import agent_detail, settings
@@ -204,6 +206,11 @@ async def research(
             )
         )
 
+    except asyncio.CancelledError:
+        # The run is cancelled when the client goes away, let it propagate so in flight work is cancelled too
+        logger.info("Research agent run cancelled")
+        raise
+
     except BaseException as e:
         logger.exception("Research agent error, threw exception...")
         error_msg = f"Error processing request: {e!s}"
@@ -214,6 +221,7 @@ async def research(
 if __name__ == "__main__":
     log_settings(settings, name="Agent")
     log_settings(core_settings)
+    cpu_pool.start()
     server.run(
         host=settings.HOST,
         port=settings.PORT,
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
 from collections.abc import AsyncGenerator
 from typing import Annotated
 
@@ -35,7 +36,7 @@ from granite_core.logging import get_logger
 from granite_core.search.prompts import SearchPrompts
 from granite_core.search.tool import SearchTool
 from granite_core.utils import log_settings
-from granite_core.work import chat_pool
+from granite_core.work import Priority, WorkSession, chat_pool, cpu_pool
 from langchain_core.documents import Document
 
 from a2a_agents import __version__
@@ -144,6 +145,7 @@ async def search(
         # set up chat models
         chat_model = ChatModelFactory.create()
         structured_chat_model = ChatModelFactory.create(model_type="structured")
+        pool_session = WorkSession(session_id=context.context_id, agent_type="search")
 
         guardrail = CopyrightViolationGuardrail(chat_model=chat_model)
         guardrail_result = await guardrail.evaluate(messages)
@@ -157,7 +159,7 @@ async def search(
             )
 
             # yield response
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                 async for event, _ in chat_model.run(messages, stream=True):
                     if isinstance(event, ChatModelNewTokenEvent):
                         agent_response_text = event.value.get_text_content()
@@ -193,7 +195,7 @@ async def search(
         await trajectory_handler.yield_trajectory(title="Searching the web", content="Complete", group_id="search")
 
         # yield response
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
             async for event, _ in chat_model.run(messages, stream=True):
                 if isinstance(event, ChatModelNewTokenEvent):
                     agent_response_text = event.value.get_text_content()
@@ -238,6 +240,11 @@ async def search(
             )
         )
 
+    except asyncio.CancelledError:
+        # The run is cancelled when the client goes away, let it propagate so in flight work is cancelled too
+        logger.info("Search agent run cancelled")
+        raise
+
     except BaseException as e:
         logger.exception("Search agent error, threw exception...")
         error_msg = f"Error processing request: {e!s}"
@@ -248,6 +255,7 @@ async def search(
 if __name__ == "__main__":
     log_settings(settings, name="Agent")
     log_settings(core_settings)
+    cpu_pool.start()
     server.run(
         host=settings.HOST,
         port=settings.PORT,
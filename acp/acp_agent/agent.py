@@ -44,12 +44,13 @@ from granite_core.thinking.stream_handler import TagStartEvent, ThinkingStreamHa
 from granite_core.thinking.tool import ThinkingTool
 from granite_core.usage import create_usage_info
 from granite_core.utils import log_settings
-from granite_core.work import chat_pool
+from granite_core.work import Priority, WorkSession, chat_pool, cpu_pool
 from langchain_core.documents import Document
 from redis.asyncio import Redis
 
 from acp_agent import utils
 from acp_agent.config import settings
+from acp_agent.disconnect import DisconnectWatcher
 from acp_agent.heartbeat import Heartbeat
 from acp_agent.phases import GeneratingCitationsPhase, SearchingWebPhase, Status
 from acp_agent.resources import AsyncCachingResourceLoader, ResourceStoreFactory
@@ -62,6 +63,9 @@ log_settings(core_settings)
 # Preload the embeddings tokenizer if set
 EmbeddingsTokenizer.get_instance()
 
+# Start CPU workers before serving
+cpu_pool.start()
+
 server = Server()
 
 
@@ -91,6 +95,8 @@ def log_context(input: list[Message], context: Context) -> None:
 async def granite_chat(input: list[Message], context: Context) -> AsyncGenerator:
     hb = Heartbeat(context=context, interval=settings.HEARTBEAT_INTERVAL)
     hb.start()
+    watcher = DisconnectWatcher(context=context, interval=settings.DISCONNECT_POLL_INTERVAL)
+    watcher.start()
 
     try:
         log_context(input, context)
@@ -128,6 +134,7 @@ async def granite_chat(input: list[Message], context: Context) -> AsyncGenerator
         logger.exception(repr(e))
         raise e
     finally:
+        await watcher.stop()
         await hb.stop()
 
 
@@ -158,6 +165,8 @@ async def granite_chat(input: list[Message], context: Context) -> AsyncGenerator
 async def granite_think(input: list[Message], context: Context) -> AsyncGenerator:
     hb = Heartbeat(context=context, interval=settings.HEARTBEAT_INTERVAL)
     hb.start()
+    watcher = DisconnectWatcher(context=context, interval=settings.DISCONNECT_POLL_INTERVAL)
+    watcher.start()
 
     try:
         log_context(input, context)
@@ -166,6 +175,7 @@ async def granite_think(input: list[Message], context: Context) -> AsyncGenerato
         messages = utils.to_beeai_framework_messages(messages=history + input)
 
         chat_model = ChatModelFactory.create()
+        pool_session = WorkSession(session_id=str(context.session.id), agent_type="chat")
 
         guardrail = CopyrightViolationGuardrail(chat_model=chat_model)
         guardrail_result = await guardrail.evaluate(messages)
@@ -211,7 +221,7 @@ async def granite_think(input: list[Message], context: Context) -> AsyncGenerato
             handler = ThinkingStreamHandler(tags=["think", "response"])
 
             if core_settings.STREAMING is True:
-                async with chat_pool.throttle():
+                async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                     async for event, _ in chat_model.run(messages, stream=True, max_retries=core_settings.MAX_RETRIES):
                         if isinstance(event, ChatModelNewTokenEvent):
                             token = event.value.get_text_content()
@@ -224,7 +234,7 @@ async def granite_think(input: list[Message], context: Context) -> AsyncGenerato
                         elif isinstance(event, ChatModelSuccessEvent):
                             yield create_usage_info(event.value.usage, chat_model.model_id)
             else:
-                async with chat_pool.throttle():
+                async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                     chat_output = await chat_model.run(messages, max_retries=core_settings.MAX_RETRIES)
 
                 text = chat_output.get_text_content()
@@ -244,6 +254,7 @@ async def granite_think(input: list[Message], context: Context) -> AsyncGenerato
         logger.exception(repr(e))
         raise e
     finally:
+        await watcher.stop()
         await hb.stop()
 
 
@@ -275,6 +286,8 @@ async def granite_think(input: list[Message], context: Context) -> AsyncGenerato
 async def granite_search(input: list[Message], context: Context) -> AsyncGenerator:
     hb = Heartbeat(context=context, interval=settings.HEARTBEAT_INTERVAL)
     hb.start()
+    watcher = DisconnectWatcher(context=context, interval=settings.DISCONNECT_POLL_INTERVAL)
+    watcher.start()
 
     try:
         log_context(input, context)
@@ -283,6 +296,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
         messages = utils.to_beeai_framework_messages(messages=history + input)
 
         chat_model = ChatModelFactory.create()
+        pool_session = WorkSession(session_id=str(context.session.id), agent_type="search")
         structured_chat_model = ChatModelFactory.create(model_type="structured")
 
         guardrail = CopyrightViolationGuardrail(chat_model=chat_model)
@@ -305,7 +319,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
 
         if guardrail_result.violated:
             if core_settings.STREAMING is True:
-                async with chat_pool.throttle():
+                async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                     async for event, _ in chat_model.run(messages, stream=True, max_retries=core_settings.MAX_RETRIES):
                         if isinstance(event, ChatModelNewTokenEvent):
                             content = event.value.get_text_content()
@@ -314,7 +328,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
                         elif isinstance(event, ChatModelSuccessEvent):
                             yield create_usage_info(event.value.usage, chat_model.model_id)
             else:
-                async with chat_pool.throttle():
+                async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                     output = await chat_model.run(messages, max_retries=core_settings.MAX_RETRIES)
 
                 response.append(output.get_text_content())
@@ -338,7 +352,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
         await context.yield_async(SearchingWebPhase(status=Status.completed).wrapped)
 
         if core_settings.STREAMING is True:
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                 async for event, _ in chat_model.run(messages, stream=True, max_retries=core_settings.MAX_RETRIES):
                     if isinstance(event, ChatModelNewTokenEvent):
                         content = event.value.get_text_content()
@@ -347,7 +361,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
                     elif isinstance(event, ChatModelSuccessEvent):
                         yield create_usage_info(event.value.usage, chat_model.model_id)
         else:
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, session=pool_session, site="response"):
                 output = await chat_model.run(messages, max_retries=core_settings.MAX_RETRIES)
 
             response.append(output.get_text_content())
@@ -373,6 +387,7 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
         logger.exception(repr(e))
         raise e
     finally:
+        await watcher.stop()
         await hb.stop()
 
 
@@ -404,6 +419,8 @@ async def granite_search(input: list[Message], context: Context) -> AsyncGenerat
 async def granite_research(input: list[Message], context: Context) -> AsyncGenerator:
     hb = Heartbeat(context=context, interval=settings.HEARTBEAT_INTERVAL)
     hb.start()
+    watcher = DisconnectWatcher(context=context, interval=settings.DISCONNECT_POLL_INTERVAL)
+    watcher.start()
 
     try:
         log_context(input, context)
@@ -451,6 +468,7 @@ async def granite_research(input: list[Message], context: Context) -> AsyncGener
         logger.exception(repr(e))
         raise e
     finally:
+        await watcher.stop()
         await hb.stop()
 
 
@@ -19,6 +19,9 @@ class Settings(BaseSettings):
     # Agent behaviour
     TWO_STEP_THINKING: bool = Field(default=False, description="Enable two step thinking.")
     HEARTBEAT_INTERVAL: float = Field(default=10, description="Interval between heartbeat messages.")
+    DISCONNECT_POLL_INTERVAL: float = Field(
+        default=1, description="Interval between checks for a disconnected client, the run is cancelled on disconnect."
+    )
 
     # Key store
     KEY_STORE_PROVIDER: Literal["redis"] | None = None
@@ -32,6 +35,10 @@ class Settings(BaseSettings):
     S3_ENDPOINT: str | None = Field(default=None, description="S3 resource store endpoint")
     S3_ACCESS_KEY_ID: SecretStr | None = Field(default=None, description="S3 access key id")
     S3_SECRET_ACCESS_KEY: SecretStr | None = Field(default=None, description="S3 secret access ket")
+    RESOURCE_CACHE_MAX_BYTES: int = Field(
+        default=50 * 1024 * 1024, ge=0, description="Total size of resources cached in memory by the resource loader"
+    )
+    RESOURCE_CACHE_TTL: float = Field(default=3600, gt=0, description="Resource loader cache entry lifetime (seconds)")
 
     # Memory store
     MEM_STORE_NOTIFICATION_DEBOUNCE: float = Field(
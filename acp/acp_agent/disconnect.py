@@ -0,0 +1,73 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+from contextlib import suppress
+
+from acp_sdk.models import RunMode
+from acp_sdk.server import Context
+from granite_core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DisconnectWatcher:
+    """
+    Cancels the run when the client that requested it disconnects.
+
+    ACP runs execute in their own task, so without this a dropped stream keeps searching, scraping and generating
+    until the run completes.
+    """
+
+    def __init__(self, context: Context, interval: float = 1) -> None:
+        self._context = context
+        self._interval = interval
+        self._run_task: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+        self.disconnected = False
+
+    def start(self) -> None:
+        """Start watching the client connection, must be called from the run task"""
+        if self._task is None or self._task.done():
+            self._run_task = asyncio.current_task()
+            if self._run_task is None:
+                logger.warning(f"Not watching for disconnects of session {self._context.session.id}: no run task")
+                return
+            self._task = asyncio.create_task(self._run())
+
+    async def _run_mode(self) -> RunMode | None:
+        # The context carries the request but not the run parsed from it, the server has already read its body
+        try:
+            body = await self._context.request.json()
+            # Runs created without a mode are sync, as in RunCreateRequest
+            return RunMode(body.get("mode", RunMode.SYNC))
+        except Exception as e:
+            logger.warning(f"Not watching for disconnects of session {self._context.session.id}: {e!r}")
+            return None
+
+    async def _run(self) -> None:
+        # Async mode runs return immediately, the client polls for the result
+        if await self._run_mode() not in (RunMode.STREAM, RunMode.SYNC):
+            return
+
+        while self._run_task is not None and not self._run_task.done():
+            try:
+                disconnected = await self._context.request.is_disconnected()
+            except Exception as e:
+                logger.warning(f"Stopped watching for disconnects of session {self._context.session.id}: {e!r}")
+                return
+
+            if disconnected:
+                logger.info(f"Client disconnected, cancelling run for session {self._context.session.id}")
+                self.disconnected = True
+                self._run_task.cancel()
+                return
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        """Stop watching"""
+        if self._task:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
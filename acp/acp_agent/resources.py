@@ -19,21 +19,19 @@ logger = get_logger(__name__)
 
 
 class AsyncCachingResourceLoader(ResourceLoader):
-    cache: AsyncLRUCache[str, bytes] = AsyncLRUCache(max_size=200)
+    cache: AsyncLRUCache[str, bytes] = AsyncLRUCache(
+        max_weight=settings.RESOURCE_CACHE_MAX_BYTES, weigher=len, ttl=settings.RESOURCE_CACHE_TTL
+    )
 
     async def load(self, url: ResourceUrl) -> bytes:  # type: ignore[override]
         key = str(url)
 
-        value = await self.cache.get(key)
-        if value is not None:
-            return value
+        async def fetch() -> bytes:
+            response = await self._client.get(key)
+            response.raise_for_status()
+            return await response.aread()
 
-        response = await self._client.get(key)
-        response.raise_for_status()
-        value = await response.aread()
-
-        await self.cache.set(key, value)
-        return value
+        return await self.cache.get_or_load(key, fetch)
 
 
 class ResourceStoreFactory:
@@ -0,0 +1,2 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
@@ -0,0 +1,74 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from acp_agent.disconnect import DisconnectWatcher
+
+
+class FakeRequest:
+    """Request whose client disconnects after `connected_polls` polls"""
+
+    def __init__(self, body: Any, connected_polls: int) -> None:
+        self.body = body
+        self.connected_polls = connected_polls
+        self.polls = 0
+
+    async def json(self) -> Any:
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.polls > self.connected_polls
+
+
+async def run_watched(request: FakeRequest) -> tuple[DisconnectWatcher, bool]:
+    """Run a long task under a watcher, whether the task was cancelled"""
+    watcher = DisconnectWatcher(
+        context=SimpleNamespace(request=request, session=SimpleNamespace(id="session")),  # type: ignore[arg-type]
+        interval=0.01,
+    )
+
+    async def run() -> None:
+        watcher.start()
+        try:
+            await asyncio.sleep(0.2)
+        finally:
+            await watcher.stop()
+
+    try:
+        await asyncio.create_task(run())
+    except asyncio.CancelledError:
+        return watcher, True
+    return watcher, False
+
+
+@pytest.mark.parametrize("body", [{"mode": "stream"}, {"mode": "sync"}, {}])
+def test_disconnect_cancels_run(body: dict[str, str]) -> None:
+    """Stream and sync runs, sync being the default mode, are cancelled when the client disconnects"""
+    request = FakeRequest(body, connected_polls=2)
+
+    watcher, cancelled = asyncio.run(run_watched(request))
+
+    assert cancelled
+    assert watcher.disconnected
+    assert request.polls == 3
+
+
+@pytest.mark.parametrize("body", [{"mode": "async"}, {"mode": "unknown"}, ValueError("no body")])
+def test_disconnect_not_watched(body: Any) -> None:
+    """Async runs and requests without a readable mode are left to finish"""
+    request = FakeRequest(body, connected_polls=0)
+
+    watcher, cancelled = asyncio.run(run_watched(request))
+
+    assert not cancelled
+    assert not watcher.disconnected
+    assert request.polls == 0
@@ -3,38 +3,167 @@
 
 
 import asyncio
+import time
 from collections import OrderedDict
-from typing import Generic, TypeVar
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, NamedTuple, TypeVar
 
-K = TypeVar("K", bound=str)  # Key type
+from pydantic import BaseModel
+
+K = TypeVar("K", bound=Hashable)  # Key type
 V = TypeVar("V")  # Value type
 
 
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    coalesced: int = 0  # misses that waited on a load already in flight
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _Entry(NamedTuple, Generic[V]):
+    value: V
+    weight: int
+    created_at: float
+    expires_at: float | None
+
+
 class AsyncLRUCache(Generic[K, V]):
-    def __init__(self, max_size: int) -> None:
-        self._cache: OrderedDict[K, V] = OrderedDict()
+    """
+    LRU cache bounded by entry count and/or total weight (e.g. bytes), with optional per entry TTL.
+
+    The cache is only touched from the event loop and never awaits while updating, so reads and writes take no lock.
+    `get_or_load` coalesces concurrent misses for a key into a single load.
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        max_weight: int | None = None,
+        weigher: Callable[[V], int] | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        self._cache: OrderedDict[K, _Entry[V]] = OrderedDict()
         self._max_size = max_size
-        self._lock = asyncio.Lock()
+        self._max_weight = max_weight
+        self._weigher = weigher
+        self._ttl = ttl
+        self._weight = 0
+        self._loading: dict[K, asyncio.Task[V]] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @property
+    def weight(self) -> int:
+        """Total weight of the cached entries"""
+        return self._weight
 
     async def exists(self, key: K) -> bool:
-        async with self._lock:
-            return key in self._cache
-
-    async def get(self, key: K) -> V | None:
-        async with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)  # mark as recently used
-                return self._cache[key]
-            return None
-
-    async def set(self, key: K, value: V) -> None:
-        async with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)
-            self._cache[key] = value
-            if len(self._cache) > self._max_size:
-                self._cache.popitem(last=False)  # remove least recently used
+        return self._lookup(key, record=False) is not None
+
+    async def get(self, key: K, max_age: float | None = None) -> V | None:
+        """Cached value, None if missing, expired or older than `max_age` seconds"""
+        entry = self._lookup(key, max_age)
+        return entry.value if entry else None
+
+    async def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Cache a value, `ttl` overrides the cache default for this entry"""
+        self._set(key, value, ttl)
 
     async def delete(self, key: K) -> None:
-        async with self._lock:
-            self._cache.pop(key, None)
+        self._remove(key)
+
+    async def get_or_load(
+        self,
+        key: K,
+        loader: Callable[[], Awaitable[V]],
+        ttl: float | Callable[[V], float | None] | None = None,
+        max_age: float | None = None,
+    ) -> V:
+        """
+        Cached value, loading and caching it on a miss. Concurrent misses for the same key share one load.
+
+        `ttl` may be a function of the loaded value, e.g. to keep negative results for less time.
+        The load runs in its own task, a caller giving up does not cancel it for the others.
+        """
+        entry = self._lookup(key, max_age)
+        if entry is not None:
+            return entry.value
+
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader, ttl))
+            # Retrieve the exception even when every caller has given up
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._loading[key] = task
+        else:
+            self.stats.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: K, loader: Callable[[], Awaitable[V]], ttl: float | Callable[[V], float | None] | None
+    ) -> V:
+        try:
+            value = await loader()
+            self._set(key, value, ttl(value) if callable(ttl) else ttl)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+    def _lookup(self, key: K, max_age: float | None = None, record: bool = True) -> _Entry[V] | None:
+        entry = self._cache.get(key)
+        now = time.monotonic()
+
+        if entry is not None and entry.expires_at is not None and now >= entry.expires_at:
+            self._remove(key)
+            self.stats.expirations += 1
+            entry = None
+
+        if entry is not None and max_age is not None and now - entry.created_at > max_age:
+            entry = None
+
+        if not record:
+            return entry
+
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self._cache.move_to_end(key)  # mark as recently used
+
+        return entry
+
+    def _set(self, key: K, value: V, ttl: float | None) -> None:
+        weight = self._weigher(value) if self._weigher else 1
+        self._remove(key)
+
+        if self._max_weight is not None and weight > self._max_weight:
+            # Would evict everything else and still not fit
+            return
+
+        ttl = ttl if ttl is not None else self._ttl
+        now = time.monotonic()
+        self._cache[key] = _Entry(value, weight, now, now + ttl if ttl is not None else None)
+        self._weight += weight
+
+        while self._cache and (
+            (self._max_size is not None and len(self._cache) > self._max_size)
+            or (self._max_weight is not None and self._weight > self._max_weight)
+        ):
+            _, evicted = self._cache.popitem(last=False)  # remove least recently used
+            self._weight -= evicted.weight
+            self.stats.evictions += 1
+
+    def _remove(self, key: K) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._weight -= entry.weight
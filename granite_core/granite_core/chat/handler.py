@@ -23,7 +23,7 @@ from granite_core.gurardrails.copyright import CopyrightViolationGuardrail
 from granite_core.gurardrails.web_access import WebAccessGuardrail
 from granite_core.logging import get_logger_with_prefix
 from granite_core.memory import estimate_tokens
-from granite_core.work import chat_pool
+from granite_core.work import Priority, WorkSession, chat_pool, work_session
 
 
 class ChatHandler(EventEmitter):
@@ -78,83 +78,84 @@ class ChatHandler(EventEmitter):
             messages: Sequence of messages to process (conversation history)
             stream: Whether to stream the response (emits TextEvent for each token)
         """
-        self.logger.info(f"Processing chat with {len(messages)} messages")
-
-        # Evaluate all guardrails concurrently
-        guardrail_results: list[GuardrailResult] = await asyncio.gather(
-            *[guardrail.evaluate(messages=messages) for guardrail in self.guardrails]
-        )
-
-        # Map results back to guardrails for precedence checking
-        results_with_guardrails = list(zip(self.guardrails, guardrail_results, strict=True))
-
-        # Check for copyright violation first (highest precedence)
-        copyright_violation = None
-        web_access_violation = None
-
-        for guardrail, result in results_with_guardrails:
-            if result.violated:
-                if isinstance(guardrail, CopyrightViolationGuardrail):
-                    copyright_violation = result
-                    self.logger.warning(msg=f"Copyright guardrail violated: {result.reason}")
-                elif isinstance(guardrail, WebAccessGuardrail):
-                    web_access_violation = result
-                    self.logger.warning(msg=f"Web access guardrail violated: {result.reason}")
-
-        # Prepare system message based on precedence
-        if copyright_violation:
-            # Copyright violation has highest precedence
-            system_message = SystemMessage(
-                content=f"Providing an answer to the user would result in a potential copyright violation.\n"
-                f"Reason: {copyright_violation.reason}\n\n"
-                f"Inform the user and suggest alternatives."
-            )
-        elif web_access_violation:
-            # Web access violation is checked if copyright passes
-            system_message = SystemMessage(
-                content=f"You cannot answer this request because it requires web search or internet access.\n"
-                f"Reason: {web_access_violation.reason}\n\n"
+        with work_session(WorkSession(session_id=self.session_id, agent_type="chat")):
+            self.logger.info(f"Processing chat with {len(messages)} messages")
+
+            # Evaluate all guardrails concurrently
+            guardrail_results: list[GuardrailResult] = await asyncio.gather(
+                *[guardrail.evaluate(messages=messages) for guardrail in self.guardrails]
             )
-        else:
-            # No violations, use standard system prompt
-            system_message = SystemMessage(content=ChatPrompts.chat_system_prompt())
-
-        # Prepend system message to conversation
-        full_messages: list[Any] = [system_message, *messages]
-
-        # Check token limit
-        if self.token_limit is not None:
-            estimated_tokens = estimate_tokens(full_messages)
-            if estimated_tokens >= self.token_limit:
-                self.logger.warning(f"Token limit exceeded: {estimated_tokens} > {self.token_limit}")
-                await self._emit(
-                    TokenLimitExceededEvent(estimated_tokens=estimated_tokens, token_limit=self.token_limit)
+
+            # Map results back to guardrails for precedence checking
+            results_with_guardrails = list(zip(self.guardrails, guardrail_results, strict=True))
+
+            # Check for copyright violation first (highest precedence)
+            copyright_violation = None
+            web_access_violation = None
+
+            for guardrail, result in results_with_guardrails:
+                if result.violated:
+                    if isinstance(guardrail, CopyrightViolationGuardrail):
+                        copyright_violation = result
+                        self.logger.warning(msg=f"Copyright guardrail violated: {result.reason}")
+                    elif isinstance(guardrail, WebAccessGuardrail):
+                        web_access_violation = result
+                        self.logger.warning(msg=f"Web access guardrail violated: {result.reason}")
+
+            # Prepare system message based on precedence
+            if copyright_violation:
+                # Copyright violation has highest precedence
+                system_message = SystemMessage(
+                    content=f"Providing an answer to the user would result in a potential copyright violation.\n"
+                    f"Reason: {copyright_violation.reason}\n\n"
+                    f"Inform the user and suggest alternatives."
+                )
+            elif web_access_violation:
+                # Web access violation is checked if copyright passes
+                system_message = SystemMessage(
+                    content=f"You cannot answer this request because it requires web search or internet access.\n"
+                    f"Reason: {web_access_violation.reason}\n\n"
                 )
-                return
-
-        # Generate response
-        response_text_parts: list[str] = []
-
-        async with chat_pool.throttle():
-            if stream:
-                # Stream response and emit events
-                async for event, _ in self.chat_model.run(full_messages, stream=True):
-                    if isinstance(event, ChatModelNewTokenEvent):
-                        token: str = event.value.get_text_content()
-                        response_text_parts.append(token)
-                        # Emit text event for streaming
-                        await self._emit(event=TextEvent(text=token))
-                    elif isinstance(event, ChatModelSuccessEvent):
-                        # Emit success event when streaming
-                        await self._emit(event=PassThroughEvent(event=event))
             else:
-                # Non-streaming response
-                output: ChatModelOutput = await self.chat_model.run(full_messages, stream=False)
-                response_text: str = output.get_text_content()
-                response_text_parts.append(response_text)
-
-                # Emit full text for non-streaming
-                full_response: str = "".join(response_text_parts)
-                await self._emit(event=TextEvent(text=full_response))
-                # Emit success event
-                await self._emit(event=PassThroughEvent(event=ChatModelSuccessEvent(value=output)))
+                # No violations, use standard system prompt
+                system_message = SystemMessage(content=ChatPrompts.chat_system_prompt())
+
+            # Prepend system message to conversation
+            full_messages: list[Any] = [system_message, *messages]
+
+            # Check token limit
+            if self.token_limit is not None:
+                estimated_tokens = estimate_tokens(full_messages)
+                if estimated_tokens >= self.token_limit:
+                    self.logger.warning(f"Token limit exceeded: {estimated_tokens} > {self.token_limit}")
+                    await self._emit(
+                        TokenLimitExceededEvent(estimated_tokens=estimated_tokens, token_limit=self.token_limit)
+                    )
+                    return
+
+            # Generate response
+            response_text_parts: list[str] = []
+
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="response"):
+                if stream:
+                    # Stream response and emit events
+                    async for event, _ in self.chat_model.run(full_messages, stream=True):
+                        if isinstance(event, ChatModelNewTokenEvent):
+                            token: str = event.value.get_text_content()
+                            response_text_parts.append(token)
+                            # Emit text event for streaming
+                            await self._emit(event=TextEvent(text=token))
+                        elif isinstance(event, ChatModelSuccessEvent):
+                            # Emit success event when streaming
+                            await self._emit(event=PassThroughEvent(event=event))
+                else:
+                    # Non-streaming response
+                    output: ChatModelOutput = await self.chat_model.run(full_messages, stream=False)
+                    response_text: str = output.get_text_content()
+                    response_text_parts.append(response_text)
+
+                    # Emit full text for non-streaming
+                    full_response: str = "".join(response_text_parts)
+                    await self._emit(event=TextEvent(text=full_response))
+                    # Emit success event
+                    await self._emit(event=PassThroughEvent(event=ChatModelSuccessEvent(value=output)))
@@ -35,7 +35,7 @@ from granite_core.emitter import EventEmitter
 from granite_core.logging import get_logger
 from granite_core.markdown import MarkdownSection, get_markdown_sections, get_markdown_tokens_with_content
 from granite_core.search.embeddings.factory import EmbeddingsFactory
-from granite_core.work import chat_pool, task_pool
+from granite_core.work import Priority, chat_pool, task_pool
 
 logger = get_logger(__name__)
 
@@ -94,7 +94,7 @@ class GraniteIOCitationGenerator(CitationGenerator):
             sections = get_markdown_sections(response)
             for section in sections:
                 if section.content.strip():
-                    async with task_pool.throttle():
+                    async with task_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                         await self._generate_citations(docs, section)
         except asyncio.CancelledError:
             raise
@@ -105,7 +105,7 @@ class GraniteIOCitationGenerator(CitationGenerator):
             granite_io_documents = [GraniteIODocument(doc_id=str(i), text=d.page_content) for i, d in enumerate(docs)]
             doc_index = {str(i): d for i, d in enumerate(docs)}
 
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                 result = await self.citations_io_processor.acreate_chat_completion(
                     ChatCompletionInputs(
                         messages=granite_io_messages,
@@ -170,7 +170,7 @@ class DefaultCitationGenerator(CitationGenerator):
             sections = get_markdown_sections(response)
             for section in sections:
                 if section.content.strip():
-                    async with task_pool.throttle():
+                    async with task_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                         await self._generate_citations(docs, section)
 
         except asyncio.CancelledError:
@@ -195,7 +195,7 @@ class DefaultCitationGenerator(CitationGenerator):
             sent_index: dict[str, Sentence] = {str(s.id): s for s in sentences}
             prompt = CitationsPrompts.generate_citations_prompt(sentences=sentences, docs=docs)
 
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                 st_response = await self.chat_model.run(
                     [UserMessage(content=prompt)],
                     response_format=CitationsSchema,
@@ -255,7 +255,7 @@ class ReferencingMatchingCitationGenerator(CitationGenerator):
 
             for section in sections:
                 if section.content.strip():
-                    async with task_pool.throttle():
+                    async with task_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                         counter = count(start=0, step=1)
                         tokens = get_markdown_tokens_with_content(section.content)
                         response_as_sentences: list[Sentence] = []
@@ -302,7 +302,7 @@ class ReferencingMatchingCitationGenerator(CitationGenerator):
                                     response=response_list, docs=rewritten_docs
                                 )
 
-                                async with chat_pool.throttle():
+                                async with chat_pool.throttle(priority=Priority.BACKGROUND, site="citations"):
                                     structured_output = await self.chat_model.run(
                                         [UserMessage(content=prompt)],
                                         response_format=ReferencingCitationsSchema,
@@ -45,16 +45,117 @@ class Settings(BaseSettings):
 
     DDG_SEARCH_PROXY: str | None = Field(default=None, description="DuckDuckGo Search proxy")
     DDG_SEARCH_VERIFY: bool = Field(default=True, description="DuckDuckGo SSL Verification")
+    SEARCH_CACHE_TTL: float = Field(
+        default=900, ge=0, description="Seconds search engine results are reused for identical queries, 0 disables"
+    )
+    SEARCH_CACHE_MAX_ENTRIES: int = Field(default=2000, ge=1, description="Max. cached search engine queries")
 
     CHECK_ROBOTS_TXT: bool = Field(default=True, description="Check robots.txt before scraping")
+    ROBOTS_STORE_PROVIDER: Literal["local", "redis"] = Field(
+        default="local", description="Where parsed robots.txt rules are shared between processes"
+    )
+    ROBOTS_STORE_REDIS_URL: SecretStr | None = Field(
+        default=None, description="Redis URL of the robots.txt store when ROBOTS_STORE_PROVIDER is redis"
+    )
+    ROBOTS_NEGATIVE_CACHE_TTL: float = Field(
+        default=3600, gt=0, description="Seconds to assume allowed for hosts whose robots.txt could not be fetched"
+    )
     USER_AGENT_CONTACT: EmailStr | None = Field(default=None, description="Contact email for user-agent string")
 
+    # Shared HTTP client for scraping, search engines and robots.txt
+    HTTP2: bool = Field(default=False, description="Use HTTP/2 where servers support it, needs the h2 package")
+    HTTP_MAX_CONNECTIONS: int = Field(default=100, ge=1, description="Max. open connections of the HTTP client")
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = Field(default=8, ge=1, description="Max. requests in flight to one host")
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=40, ge=0, description="Max. idle connections kept open")
+    HTTP_KEEPALIVE_EXPIRY: float = Field(default=30, ge=0, description="Seconds an idle connection is kept open")
+    HTTP_DNS_CACHE_TTL: float = Field(default=300, ge=0, description="Seconds host names stay resolved, 0 disables")
+
     SCRAPER_MAX_CONTENT_LENGTH: int = Field(
         description="Max size of scraped content in characters, anything larger will be truncated.", default=15000
     )
 
     SCRAPER_TIMEOUT: int = Field(description="Seconds elapsed before scraper task times out.", default=20)
 
+    SCRAPER_EARLY_STOP: bool = Field(
+        default=True, description="Stop scraping once enough pages are in instead of waiting for every page"
+    )
+    SCRAPER_HEDGE_FACTOR: float = Field(
+        default=1.5, ge=1, description="Pages scraped at once as a multiple of the pages wanted, with early stop"
+    )
+
+    SCRAPER_HTML_EXTRACTOR: Literal["beautifulsoup", "readability"] = Field(
+        default="beautifulsoup",
+        description="How text is extracted from HTML pages, readability keeps only the main content and is faster",
+    )
+    SCRAPER_MAX_DOWNLOAD_BYTES: int = Field(
+        default=2 * 1024 * 1024, ge=1, description="Max. decoded bytes read from a page, the rest is not downloaded"
+    )
+    SCRAPER_MAX_PDF_BYTES: int = Field(
+        default=20 * 1024 * 1024, ge=1, description="Max. size of a PDF, larger ones are not downloaded"
+    )
+    SCRAPER_PDF_MAX_PAGES: int = Field(
+        default=30, ge=1, description="Max. pages of a PDF parsed, text past the content length stops parsing earlier"
+    )
+    SCRAPER_PDF_PARALLEL_MIN_PAGES: int = Field(
+        default=0,
+        ge=0,
+        description="PDFs with this many pages or more are parsed in parallel across the CPU workers, "
+        "without stopping early at the content length. 0 always parses one page after the other",
+    )
+    SCRAPER_ARXIV_FULL_TEXT: bool = Field(
+        default=False,
+        description="Add the full text of arXiv papers to their abstract, within the PDF page and size limits",
+    )
+    SCRAPER_ARXIV_CACHE_TTL: float = Field(
+        default=24 * 3600, gt=0, description="Seconds arXiv paper metadata is cached"
+    )
+    SCRAPER_MAX_COMPRESSION_RATIO: float = Field(
+        default=100, gt=1, description="Pages whose body decodes to more than this times its download are dropped"
+    )
+
+    SCRAPER_HOST_MAX_CONCURRENT: int = Field(default=2, ge=1, description="Max. pages scraped from one host at once")
+    SCRAPER_HOST_MIN_INTERVAL: float = Field(
+        default=0.5,
+        ge=0,
+        description="Min. seconds between requests to one host, robots.txt Crawl-delay may raise it up to "
+        "SCRAPER_TIMEOUT",
+    )
+    SCRAPER_MAX_PAGES_PER_DOMAIN: int = Field(
+        default=3, ge=1, description="Max. pages of one domain counted towards the scraped content of a run"
+    )
+
+    SCRAPER_SPECULATIVE: bool = Field(
+        default=False,
+        description="Start scraping search results while their relevance is still being judged, "
+        "pages of rejected results are discarded",
+    )
+    SCRAPER_SPECULATIVE_MAX_PAGES: int = Field(
+        default=20, ge=0, description="Max pages scraped speculatively per search or research run"
+    )
+
+    # Scraped page cache
+    PAGE_CACHE_PROVIDER: Literal["memory", "disk", "obstore"] | None = Field(
+        default="memory", description="Where scraped page content is cached, None disables the cache"
+    )
+    PAGE_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="Size of the in-memory page cache in bytes of extracted content"
+    )
+    PAGE_CACHE_DIR: str = Field(default=".cache/pages", description="Directory of the disk page cache")
+    PAGE_CACHE_DISK_MAX_BYTES: int = Field(
+        default=1024 * 1024 * 1024,
+        ge=0,
+        description="Size of the disk page cache, the oldest pages are removed past it",
+    )
+    PAGE_CACHE_OBSTORE_URL: str | None = Field(
+        default=None, description="Object store URL of the page cache e.g. s3://bucket/pages, credentials from env"
+    )
+    PAGE_CACHE_DEFAULT_TTL: float = Field(
+        default=3600, ge=0, description="Freshness (seconds) of pages without cache headers or when they can't be used"
+    )
+    PAGE_CACHE_MAX_TTL: float = Field(
+        default=86400, gt=0, description="Max. freshness (seconds) of a page, also how long stale pages are kept"
+    )
+
     OLLAMA_BASE_URL: Annotated[
         HttpUrl,
         Field(
@@ -101,6 +202,17 @@ class Settings(BaseSettings):
         default=512, description="The maximum sequence length in characters (or tokens if HF tokenizer configured)."
     )
 
+    # Embeddings cache
+    EMBEDDINGS_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, ge=0, description="Size of the in-memory embeddings cache, 0 disables it"
+    )
+    EMBEDDINGS_CACHE_DIR: str | None = Field(
+        default=None, description="Directory of the memory-mapped on-disk embeddings cache, None disables it"
+    )
+    EMBEDDINGS_CACHE_DISK_MAX_BYTES: int = Field(
+        default=1024 * 1024 * 1024, gt=0, description="Size at which the on-disk embeddings cache starts over"
+    )
+
     # Populate these vars to enable lora citations via granite-io
     # Otherwise agent will fall back on default implementation
     GRANITE_IO_OPENAI_API_BASE: Annotated[
@@ -143,6 +255,12 @@ class Settings(BaseSettings):
         ge=0.0,
         le=2.0,
     )
+    STRUCTURED_MEMO_TTL: float = Field(
+        default=0,
+        description="Seconds structured LLM results at temperature 0 are reused for identical input, 0 disables",
+        ge=0,
+    )
+    STRUCTURED_MEMO_MAX_ENTRIES: int = Field(default=5000, ge=1, description="Max. memoized structured LLM results")
 
     CHAT_TOKEN_LIMIT: int = Field(
         default=5_000,
@@ -166,6 +284,29 @@ class Settings(BaseSettings):
         default=10, description="The number of documents to return from the vector store"
     )
     SEARCH_MAX_SCRAPED_CONTENT: int = Field(default=10, description="The max scraped web results")
+    SEARCH_FILTER_MODE: Literal["per_result", "batched"] = Field(
+        default="batched",
+        description="Judge the relevance of each search result in its own LLM call, or all results of a query in one",
+    )
+    SEARCH_FILTER_BATCH_TOKENS: int = Field(
+        default=2000, ge=100, description="Approx. token budget of the search results in one batched filter call"
+    )
+    SEARCH_PREFILTER_ENABLED: bool = Field(
+        default=False,
+        description="Settle clear cut search results by query/snippet embedding similarity before the LLM, "
+        "results accepted this way skip the LLM's relevance and safety check",
+    )
+    SEARCH_PREFILTER_REJECT_BELOW: float = Field(
+        default=0.25, ge=-1, le=1, description="Similarity below which a search result is dropped without the LLM"
+    )
+    SEARCH_PREFILTER_ACCEPT_ABOVE: float = Field(
+        default=0.85, ge=-1, le=1, description="Similarity above which a search result is kept without the LLM"
+    )
+    SEARCH_DEADLINE: float = Field(
+        default=90,
+        description="Seconds a search may spend gathering sources before continuing with partial results, 0 disables",
+        ge=0,
+    )
 
     # Research configuration
     RESEARCH_PLAN_BREADTH: int = Field(default=5, description="Controls how many search queries are executed", ge=1)
@@ -179,11 +320,16 @@ class Settings(BaseSettings):
     RESEARCH_MAX_SCRAPED_CONTENT: int = Field(default=10, description="The max scraped web results")
     RESEARCH_PRELIM_MAX_TOKENS: int = Field(default=2048, description="Token budget for preliminary research step")
     RESEARCH_FINDINGS_MAX_TOKENS: int = Field(default=2048, description="Token budget for finding research step")
+    RESEARCH_DEADLINE: float = Field(
+        default=480,
+        description="Seconds a research run may spend before the report is written from partial results, 0 disables",
+        ge=0,
+    )
 
     # Inference throttle
     MAX_CONCURRENT_INFERENCE_TASKS: int = Field(
         default=20,
-        description="The max. number of inference operations that can run simultaneously, includes chat and embeddings",
+        description="The max. number of chat inference operations that can run simultaneously",
     )
     RATE_LIMIT_INFERENCE_TASKS: int = Field(
         default=8, description="Rate limit for inference tasks in specified rate period"
@@ -192,6 +338,42 @@ class Settings(BaseSettings):
         default=2, description="Rate period in seconds, use with rate limit to implement throttle"
     )
 
+    # Adaptive inference throttle
+    ADAPTIVE_CONCURRENCY: bool = Field(
+        default=False,
+        description="Adapt the inference concurrency limit to backend health (AIMD), starting at MAX_CONCURRENT_INFERENCE_TASKS",  # noqa: E501
+    )
+    ADAPTIVE_MIN_CONCURRENT_INFERENCE_TASKS: int = Field(
+        default=2, description="Lower bound of the adaptive inference concurrency limit", ge=1
+    )
+    ADAPTIVE_MAX_CONCURRENT_INFERENCE_TASKS: int = Field(
+        default=40, description="Upper bound of the adaptive inference concurrency limit", ge=1
+    )
+    ADAPTIVE_LATENCY_TARGET: float = Field(
+        default=30,
+        description="Seconds a non streamed inference call may take before it is treated as a sign of overload",
+        gt=0,
+    )
+    ADAPTIVE_DECREASE_FACTOR: float = Field(
+        default=0.5,
+        description="Factor applied to the adaptive concurrency limit on rate limiting, timeouts or latency spikes",
+        gt=0,
+        lt=1,
+    )
+
+    # Embeddings throttle
+    MAX_CONCURRENT_EMBEDDINGS_TASKS: int = Field(
+        default=10,
+        description="The max. number of embeddings requests that can run simultaneously",
+    )
+    RATE_LIMIT_EMBEDDINGS_TASKS: int = Field(
+        default=1600,
+        description="Rate limit for embeddings in specified rate period, counted in texts rather than requests",
+    )
+    RATE_PERIOD_EMBEDDINGS_TASKS: int = Field(
+        default=2, description="Rate period in seconds, use with rate limit to implement throttle"
+    )
+
     # General task throttle
     MAX_CONCURRENT_TASKS: int = Field(
         default=30,
@@ -205,6 +387,38 @@ class Settings(BaseSettings):
         default=2, description="Rate period in seconds, use with rate limit to implement throttle"
     )
 
+    # CPU bound work
+    MAX_CPU_WORKERS: int = Field(
+        default=2,
+        description="Worker processes for CPU bound parsing (HTML, chunk splitting, PDF), 0 runs it in threads instead",
+        ge=0,
+    )
+    CPU_POOL_WARM_START: bool = Field(
+        default=True, description="Start the CPU worker processes and import parsers before serving requests"
+    )
+
+    # Scheduling
+    PRIORITY_AGING_PERIOD: float = Field(
+        default=5,
+        description="Seconds a queued task waits before being promoted to the next priority class, 0 disables aging",
+        ge=0,
+    )
+    SESSION_MAX_SHARE: float = Field(
+        default=0.5,
+        description="The max. fraction of a pool's concurrency and rate budget that a single session can use",
+        gt=0,
+        le=1,
+    )
+    SESSION_WEIGHT_CHAT: float = Field(
+        default=4, description="Fair share weight of chat sessions when competing for a pool", gt=0
+    )
+    SESSION_WEIGHT_SEARCH: float = Field(
+        default=2, description="Fair share weight of search sessions when competing for a pool", gt=0
+    )
+    SESSION_WEIGHT_RESEARCH: float = Field(
+        default=1, description="Fair share weight of research sessions when competing for a pool", gt=0
+    )
+
     # Citations
     CITATIONS_MAX_STATEMENTS: int = Field(
         default=10,
@@ -240,6 +454,9 @@ class Settings(BaseSettings):
         if self.LLM_API_HEADERS:
             os.environ["OPENAI_API_HEADERS"] = self.LLM_API_HEADERS.get_secret_value()
 
+        if self.SEARCH_PREFILTER_REJECT_BELOW >= self.SEARCH_PREFILTER_ACCEPT_ABOVE:
+            raise ValueError("SEARCH_PREFILTER_REJECT_BELOW must be below SEARCH_PREFILTER_ACCEPT_ABOVE")
+
         if "granite" not in self.LLM_MODEL.lower():
             raise ValueError("LLM_MODEL must be set to an IBM Granite model ID")
 
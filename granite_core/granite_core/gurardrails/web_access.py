@@ -8,7 +8,8 @@ from pydantic import BaseModel, Field
 from granite_core.config import settings
 from granite_core.gurardrails.base import Guardrail, GuardrailResult
 from granite_core.logging import get_logger
-from granite_core.work import chat_pool
+from granite_core.memo import structured_memo
+from granite_core.work import Priority, chat_pool
 
 logger = get_logger(__name__)
 
@@ -28,9 +29,10 @@ class WebAccessGuardrail(Guardrail):
     allowing them to inform users that they need to use a different agent/tool.
     """
 
-    def __init__(self, chat_model: ChatModel) -> None:
+    def __init__(self, chat_model: ChatModel, memoize: bool = True) -> None:
         super().__init__()
         self.chat_model = chat_model
+        self.memoize = memoize
 
     def system_prompt(self) -> str:
         return """
@@ -57,12 +59,14 @@ When in doubt, if the information could reasonably be in the model's training da
 
     async def evaluate(self, messages: list[AnyMessage]) -> GuardrailResult:
         logger.info("Evaluating messages for web access requirement")
-        async with chat_pool.throttle():
-            response = await self.chat_model.run(
-                [SystemMessage(self.system_prompt()), *messages],
-                response_format=WebAccessRequirementSchema,
-                max_retries=settings.MAX_RETRIES,
-            )
+        response = await structured_memo.run(
+            self.chat_model,
+            [SystemMessage(self.system_prompt()), *messages],
+            response_format=WebAccessRequirementSchema,
+            memoize=self.memoize,
+            throttle=lambda: chat_pool.throttle(priority=Priority.PLANNING, site="guardrail"),
+            max_retries=settings.MAX_RETRIES,
+        )
 
         assert isinstance(response.output_structured, WebAccessRequirementSchema)
         guardrail = response.output_structured
@@ -0,0 +1,121 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Any
+
+from beeai_framework.backend import AnyMessage, AssistantMessage, ChatModel, ChatModelOutput
+from pydantic import BaseModel, ValidationError
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Run options that don't change the model output
+_UNKEYED_OPTIONS = ("max_retries", "signal", "context")
+
+
+class StructuredRunStore(ABC):
+    """Store of structured LLM results, JSON keyed by call"""
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        pass
+
+
+class MemoryStructuredRunStore(StructuredRunStore):
+    def __init__(self, max_size: int) -> None:
+        self._cache: AsyncLRUCache[str, str] = AsyncLRUCache(max_size=max_size)
+
+    async def get(self, key: str) -> str | None:
+        return await self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._cache.set(key, value, ttl=ttl)
+
+
+class StructuredRunMemo:
+    """
+    Memoizes `ChatModel.run(..., response_format=...)` for deterministic calls, those at temperature 0.
+
+    Calls are keyed by provider and model id, the response schema, the messages and the other run options.
+    """
+
+    def __init__(self, store: StructuredRunStore, ttl: float) -> None:
+        self.store = store
+        self.ttl = ttl
+
+    def cache_key(
+        self, chat_model: ChatModel, messages: list[AnyMessage], response_format: type[BaseModel], **kwargs: Any
+    ) -> str:
+        key = {
+            "model": f"{chat_model.provider_id}:{chat_model.model_id}",
+            "parameters": chat_model.parameters.model_dump(exclude_none=True),
+            "schema": response_format.model_json_schema(),
+            "messages": [message.to_plain() for message in messages],
+            "options": {k: v for k, v in kwargs.items() if k not in _UNKEYED_OPTIONS},
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_deterministic(self, chat_model: ChatModel, **kwargs: Any) -> bool:
+        return kwargs.get("temperature", chat_model.parameters.temperature) == 0
+
+    async def run(
+        self,
+        chat_model: ChatModel,
+        messages: list[AnyMessage],
+        response_format: type[BaseModel],
+        memoize: bool = True,
+        throttle: Callable[[], AbstractAsyncContextManager[Any]] | None = None,
+        **kwargs: Any,
+    ) -> ChatModelOutput:
+        """
+        Run the chat model, reusing the result of an identical earlier call unless `memoize` is off.
+
+        `throttle` makes the context held around the model call e.g. a pool slot, results reused don't take one.
+        """
+
+        async def run_model() -> ChatModelOutput:
+            async with throttle() if throttle is not None else nullcontext():
+                return await chat_model.run(messages, response_format=response_format, **kwargs)
+
+        if not memoize or self.ttl <= 0 or not self.is_deterministic(chat_model, **kwargs):
+            return await run_model()
+
+        key = self.cache_key(chat_model, messages, response_format, **kwargs)
+
+        try:
+            if (cached := await self.store.get(key)) is not None:
+                return ChatModelOutput(
+                    output=[AssistantMessage(cached)], output_structured=response_format.model_validate_json(cached)
+                )
+        except ValidationError:
+            pass  # schema changed since the result was stored
+        except Exception as e:
+            logger.warning(f"Failed to read memoized {response_format.__name__} result: {e!r}")
+
+        response = await run_model()
+
+        if isinstance(response.output_structured, response_format):
+            try:
+                await self.store.set(key, response.output_structured.model_dump_json(), ttl=self.ttl)
+            except Exception as e:
+                logger.warning(f"Failed to memoize {response_format.__name__} result: {e!r}")
+
+        return response
+
+
+structured_memo = StructuredRunMemo(
+    MemoryStructuredRunStore(max_size=settings.STRUCTURED_MEMO_MAX_ENTRIES), ttl=settings.STRUCTURED_MEMO_TTL
+)
@@ -0,0 +1,192 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import math
+import weakref
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# Seconds, covers fast rate limiter waits up to slow report generation
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Histogram:
+    """Fixed bucket histogram, updated from the event loop so needs no locking"""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs as used by Prometheus"""
+        total = 0
+        result = []
+        for bound, count in zip([*self.buckets, math.inf], self.counts, strict=True):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class SiteMetrics:
+    """Metrics of one call site within a pool"""
+
+    def __init__(self) -> None:
+        self.semaphore_wait = Histogram()
+        self.rate_limit_wait = Histogram()
+        self.service_time = Histogram()
+        self.in_flight = 0
+        self.outcomes: Counter[str] = Counter()
+        self.wasted_seconds = 0.0  # service time of tasks cancelled before they finished
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "outcomes": dict(self.outcomes),
+            "wasted_seconds": self.wasted_seconds,
+            "semaphore_wait": self.semaphore_wait.snapshot(),
+            "rate_limit_wait": self.rate_limit_wait.snapshot(),
+            "service_time": self.service_time.snapshot(),
+        }
+
+
+class PoolMetrics:
+    """
+    Per call site metrics of a WorkerPool.
+
+    All updates happen on the event loop thread, plain attribute updates are atomic there so no lock is taken.
+    """
+
+    def __init__(self, pool: str, gauges: Callable[[], dict[str, Any]] | None = None) -> None:
+        self.pool = pool
+        self.sites: defaultdict[str, SiteMetrics] = defaultdict(SiteMetrics)
+        self._gauges = gauges
+        _registry.add(self)
+
+    def site(self, name: str) -> SiteMetrics:
+        return self.sites[name]
+
+    @property
+    def in_flight(self) -> int:
+        return sum(site.in_flight for site in self.sites.values())
+
+    def gauges(self) -> dict[str, Any]:
+        """Point in time pool state e.g. queue depths and concurrency limit"""
+        return self._gauges() if self._gauges else {}
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.gauges(),
+            "in_flight": self.in_flight,
+            "sites": {name: site.snapshot() for name, site in sorted(self.sites.items())},
+        }
+
+
+_registry: weakref.WeakSet[PoolMetrics] = weakref.WeakSet()
+
+
+def registered_pools() -> list[PoolMetrics]:
+    return sorted(_registry, key=lambda m: m.pool)
+
+
+class MetricsExporter(ABC):
+    """Renders pool metrics for an external consumer"""
+
+    @abstractmethod
+    def export(self, pools: Iterable[PoolMetrics]) -> Any:
+        pass
+
+
+class SnapshotExporter(MetricsExporter):
+    """In-process snapshot, a dict keyed by pool name"""
+
+    def export(self, pools: Iterable[PoolMetrics]) -> dict[str, Any]:
+        return {metrics.pool: metrics.snapshot() for metrics in pools}
+
+
+class PrometheusExporter(MetricsExporter):
+    """Prometheus text exposition format"""
+
+    def __init__(self, namespace: str = "granite_pool") -> None:
+        self.namespace = namespace
+
+    def export(self, pools: Iterable[PoolMetrics]) -> str:
+        pools = list(pools)
+        lines: list[str] = []
+
+        def header(name: str, kind: str, description: str) -> str:
+            lines.append(f"# HELP {self.namespace}_{name} {description}")
+            lines.append(f"# TYPE {self.namespace}_{name} {kind}")
+            return f"{self.namespace}_{name}"
+
+        metric = header("concurrency_limit", "gauge", "Current concurrency limit of the pool")
+        for m in pools:
+            if "concurrency_limit" in (gauges := m.gauges()):
+                lines.append(f"{metric}{_labels(pool=m.pool)} {gauges['concurrency_limit']}")
+
+        metric = header("queued", "gauge", "Tasks waiting for a concurrency slot")
+        for m in pools:
+            for priority, depth in m.gauges().get("queued", {}).items():
+                lines.append(f"{metric}{_labels(pool=m.pool, priority=priority)} {depth}")
+
+        metric = header("in_flight", "gauge", "Tasks holding a concurrency slot")
+        for m in pools:
+            for name, site in sorted(m.sites.items()):
+                lines.append(f"{metric}{_labels(pool=m.pool, site=name)} {site.in_flight}")
+
+        metric = header("requests_total", "counter", "Completed tasks by outcome")
+        for m in pools:
+            for name, site in sorted(m.sites.items()):
+                for outcome, count in sorted(site.outcomes.items()):
+                    lines.append(f"{metric}{_labels(pool=m.pool, site=name, outcome=outcome)} {count}")
+
+        metric = header("wasted_seconds_total", "counter", "Time spent on tasks that were cancelled before finishing")
+        for m in pools:
+            for name, site in sorted(m.sites.items()):
+                lines.append(f"{metric}{_labels(pool=m.pool, site=name)} {site.wasted_seconds}")
+
+        for attr, description in (
+            ("semaphore_wait", "Time spent waiting for a concurrency slot"),
+            ("rate_limit_wait", "Time spent waiting for the rate limiter"),
+            ("service_time", "Time spent holding a concurrency slot"),
+        ):
+            metric = header(f"{attr}_seconds", "histogram", description)
+            for m in pools:
+                for name, site in sorted(m.sites.items()):
+                    histogram: Histogram = getattr(site, attr)
+                    for bound, count in histogram.cumulative():
+                        le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                        lines.append(f"{metric}_bucket{_labels(pool=m.pool, site=name, le=le)} {count}")
+                    lines.append(f"{metric}_sum{_labels(pool=m.pool, site=name)} {histogram.sum}")
+                    lines.append(f"{metric}_count{_labels(pool=m.pool, site=name)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def export_metrics(exporter: MetricsExporter | None = None) -> Any:
+    """Export the metrics of all live worker pools, defaults to an in-process snapshot"""
+    return (exporter or SnapshotExporter()).export(registered_pools())
@@ -2,7 +2,6 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-import asyncio
 from typing import Any
 
 from beeai_framework.backend import (
@@ -28,6 +27,7 @@ from granite_core.events import (
     TrajectoryEvent,
 )
 from granite_core.logging import get_logger_with_prefix
+from granite_core.memo import structured_memo
 from granite_core.research.prompts import ResearchPrompts
 from granite_core.research.types import (
     IntentRoutingSchema,
@@ -42,11 +42,26 @@ from granite_core.search.filter import SearchResultsFilter
 from granite_core.search.mixins import ScrapedSearchResultsMixin, SearchResultsMixin
 from granite_core.search.prompts import SearchPrompts
 from granite_core.search.scraping import scrape_search_results
+from granite_core.search.scraping.runner import ScraperRunner
 from granite_core.search.scraping.types import ScrapedSearchResult
 from granite_core.search.tool import SearchTool
 from granite_core.search.types import SearchResult
 from granite_core.search.vector_store.factory import VectorStoreWrapperFactory
-from granite_core.work import chat_pool, task_pool
+from granite_core.work import (
+    Priority,
+    WorkSession,
+    chat_pool,
+    deadline,
+    deadline_stage,
+    gather_within,
+    task_pool,
+    work_session,
+)
+
+NO_FINDINGS_REPORT = (
+    "I couldn't research this topic within the time available, no findings are ready yet. "
+    "Please try again, or ask about a narrower topic."
+)
 
 
 class Researcher(
@@ -61,6 +76,7 @@ class Researcher(
         messages: list[Message],
         session_id: str,
         interactive: bool = False,
+        memoize: bool = True,
         *args: Any,
         **kwargs: Any,
     ) -> None:
@@ -70,6 +86,7 @@ class Researcher(
         self.messages = messages
         self.session_id = session_id
         self.interactive = interactive
+        self.memoize = memoize
         self.logger = get_logger_with_prefix(__name__, tool_name="Researcher", session_id=session_id)
 
         self.research_topic: str | None = None
@@ -82,61 +99,87 @@ class Researcher(
 
         self.logger.debug("Initializing Researcher")
         self.vector_store = VectorStoreWrapperFactory.create()
-        self.search_results_filter = SearchResultsFilter(chat_model=self.structured_chat_model, session_id=session_id)
+        self.search_results_filter = SearchResultsFilter(
+            chat_model=self.structured_chat_model, session_id=session_id, memoize=memoize
+        )
+        self._scraper: ScraperRunner | None = None
 
     async def run(self) -> None:
         """Perform research investigation"""
-        self.logger.info("Running Researcher")
+        with (
+            work_session(WorkSession(session_id=self.session_id, agent_type="research")),
+            deadline(settings.RESEARCH_DEADLINE or None),
+        ):
+            self.logger.info("Running Researcher")
 
-        # Determine user intent first
-        if self.interactive is True:
-            intent: IntentRoutingSchema = await self._determine_intent()
-            self.logger.info(msg=f"Determined intent: {intent.intent} - {intent.reasoning}")
+            # Determine user intent first
+            if self.interactive is True:
+                intent: IntentRoutingSchema = await self._determine_intent()
+                self.logger.info(msg=f"Determined intent: {intent.intent} - {intent.reasoning}")
 
-            if intent.intent == "clarification":
-                # User is still clarifying - help them clarify and don't proceed with research yet
-                self.logger.info(msg="User is still clarifying topic. Providing clarification assistance.")
-                await self._handle_clarification()
-                return
+                if intent.intent == "clarification":
+                    # User is still clarifying - help them clarify and don't proceed with research yet
+                    self.logger.info(msg="User is still clarifying topic. Providing clarification assistance.")
+                    await self._handle_clarification()
+                    return
 
-        # Intent is "research" - proceed with full research workflow
-        self.research_topic = await self._generate_research_topic()
+            # Intent is "research" - proceed with full research workflow
+            self.research_topic = await self._generate_research_topic()
 
-        await self._emit(TrajectoryEvent(title="Research topic", content=self.research_topic.strip()))
-        # await self._emit(TrajectoryEvent(title="Developing a research plan"))
+            await self._emit(TrajectoryEvent(title="Research topic", content=self.research_topic.strip()))
+            # await self._emit(TrajectoryEvent(title="Developing a research plan"))
 
-        # Do some pre research
-        await self._emit(TrajectoryEvent(title="Conducting preliminary research"))
-        self._context = await self._generate_research_context()
+            # Do some pre research
+            await self._emit(TrajectoryEvent(title="Conducting preliminary research"))
+            with deadline_stage(0.2):
+                self._context = await self._generate_research_context()
 
-        # Generate the research plan
-        self.research_plan = await self._generate_research_plan()
+            # Generate the research plan
+            self.research_plan = await self._generate_research_plan()
 
-        await self._emit(TrajectoryEvent(title="Research plan", content=[s.question for s in self.research_plan]))
+            await self._emit(TrajectoryEvent(title="Research plan", content=[s.question for s in self.research_plan]))
 
-        self.logger.debug(f"Research plan: {self.research_plan}")
+            self.logger.debug(f"Research plan: {self.research_plan}")
 
-        # await self._emit(TrajectoryEvent(title="Gathering information"))
+            # await self._emit(TrajectoryEvent(title="Gathering information"))
 
-        await self._emit(TrajectoryEvent(title="Searching for information"))
-        await self._gather_sources()
-        await self._extract_sources()
+            # Each stage gets a share of the time left and continues with partial results once it runs out
+            await self._emit(TrajectoryEvent(title="Searching for information"))
 
-        # await self._emit(TrajectoryEvent(title="Performing research"))
+            # Results start scraping as soon as they are found, while they are being filtered
+            if settings.SCRAPER_SPECULATIVE:
+                self._scraper = ScraperRunner(
+                    [], "bs", self.session_id, max_scraped_content=settings.RESEARCH_MAX_SCRAPED_CONTENT
+                )
 
-        if self.scraped_search_results:
-            await self.vector_store.load(self.scraped_search_results)
+            try:
+                with deadline_stage(0.25):
+                    await self._gather_sources()
+                with deadline_stage(0.35):
+                    await self._extract_sources()
+            finally:
+                if self._scraper is not None:
+                    await self._scraper.close()
+                    self._scraper = None
+
+            # await self._emit(TrajectoryEvent(title="Performing research"))
 
-        await self._perform_research()
+            if self.scraped_search_results:
+                with deadline_stage(0.25):
+                    await self.vector_store.load(self.scraped_search_results)
 
-        self.logger.debug(f"reports: {self.interim_reports}")
+            # Leave the rest for the final report
+            with deadline_stage(0.6):
+                await self._perform_research()
 
-        self.logger.info("Starting report writing")
-        await self._generate_final_report()
+            self.logger.debug(f"reports: {self.interim_reports}")
 
-        self.logger.info("Generating citations")
-        await self._generate_citations()
-        self.logger.info("Research run complete.")
+            self.logger.info("Starting report writing")
+            await self._generate_final_report()
+
+            self.logger.info("Generating citations")
+            await self._generate_citations()
+            self.logger.info("Research run complete.")
 
     async def _determine_intent(self) -> IntentRoutingSchema:
         """Determine the user's intent from the conversation history"""
@@ -146,7 +189,7 @@ class Researcher(
         intent_messages: list[Message] = [SystemMessage(content=system_prompt)]
         intent_messages.extend(self.messages)
 
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.PLANNING, site="intent"):
             response = await self.structured_chat_model.run(
                 intent_messages,
                 response_format=IntentRoutingSchema,
@@ -165,7 +208,7 @@ class Researcher(
 
         if settings.STREAMING is True:
             # Stream the clarification response
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="clarification"):
                 async for event, _ in self.chat_model.run(
                     clarification_messages, stream=True, max_retries=settings.MAX_RETRIES
                 ):
@@ -176,7 +219,7 @@ class Researcher(
                         await self._emit(event=PassThroughEvent(event=event))
         else:
             # Non-streaming response
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="clarification"):
                 output: ChatModelOutput = await self.chat_model.run(
                     clarification_messages, max_retries=settings.MAX_RETRIES
                 )
@@ -188,7 +231,7 @@ class Researcher(
         """Generate/extract the research topic"""
         standalone_prompt = ResearchPrompts.interpret_research_topic(self.messages)
 
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.PLANNING, site="research_topic"):
             response = await self.chat_model.run(
                 [UserMessage(content=standalone_prompt)],
                 response_format=ResearchTopicSchema,
@@ -212,7 +255,7 @@ class Researcher(
             SystemMessage(content=SearchPrompts.search_system_prompt(docs, include_core_chat=False))
         ]
 
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.PLANNING, site="research_context"):
             output = await self.chat_model.run(
                 search_messages,
                 max_retries=settings.MAX_RETRIES,
@@ -226,7 +269,7 @@ class Researcher(
         if self.research_plan is None or len(self.research_plan) == 0:
             raise ValueError("No research plan has been set!")
 
-        await asyncio.gather(*(self._gather_sources_for_step(step) for step in self.research_plan))
+        await gather_within(*(self._gather_sources_for_step(step) for step in self.research_plan))
 
     async def _gather_sources_for_step(self, query: ResearchQuery) -> None:
         """Gather information for a single research plan step"""
@@ -235,6 +278,8 @@ class Researcher(
     async def _web_search(self, query: str) -> None:
         search_results = await self._search_query(query, max_results=settings.RESEARCH_MAX_SEARCH_RESULTS_PER_STEP)
         search_results = [s for s in search_results if not self.contains_search_result(s.url)]
+        if self._scraper is not None:
+            self._scraper.prefetch([s.url for s in search_results])
         search_results = await self.search_results_filter.filter(query, search_results)
         for s in search_results:
             self.add_search_result(s)
@@ -250,6 +295,7 @@ class Researcher(
             session_id=self.session_id,
             emitter=self,
             max_scraped_content=settings.RESEARCH_MAX_SCRAPED_CONTENT,
+            runner=self._scraper,
         )
         self.add_scraped_search_results(scraped_search_results)
         # await self._emit(TrajectoryEvent(title="Extracting knowledge"))
@@ -259,22 +305,24 @@ class Researcher(
 
     async def _get_language(self) -> str:
         recent_user_message = self._get_most_recent_user_message()
-        async with chat_pool.throttle():
-            response = await self.structured_chat_model.run(
-                [UserMessage(content=ResearchPrompts.language_identification(recent_user_message.text))],
-                response_format=LanguageIdentificationSchema,
-                max_retries=settings.MAX_RETRIES,
+        response = await structured_memo.run(
+            self.structured_chat_model,
+            [UserMessage(content=ResearchPrompts.language_identification(recent_user_message.text))],
+            response_format=LanguageIdentificationSchema,
+            memoize=self.memoize,
+            throttle=lambda: chat_pool.throttle(priority=Priority.PLANNING, site="language"),
+            max_retries=settings.MAX_RETRIES,
+        )
+        try:
+            assert isinstance(response.output_structured, LanguageIdentificationSchema)
+            identified_language = response.output_structured.language.title()
+            self.logger.info(
+                f"Writing report in {identified_language} based on the most recent user message: {recent_user_message.text}"  # noqa: E501
             )
-            try:
-                assert isinstance(response.output_structured, LanguageIdentificationSchema)
-                identified_language = response.output_structured.language.title()
-                self.logger.info(
-                    f"Writing report in {identified_language} based on the most recent user message: {recent_user_message.text}"  # noqa: E501
-                )
-                return identified_language
-            except Exception:
-                self.logger.info("Writing report in English")
-                return "English"
+            return identified_language
+        except Exception:
+            self.logger.info("Writing report in English")
+            return "English"
 
     async def _generate_final_report(self) -> None:
         if self.research_topic is None:
@@ -284,7 +332,11 @@ class Researcher(
             raise ValueError("No research plan set!")
 
         if len(self.interim_reports) == 0:
-            raise ValueError("No interim reports available!")
+            # Every research step ran out of time, answer rather than failing the turn
+            self.logger.warning("No research findings within the time budget")
+            self.final_report = NO_FINDINGS_REPORT
+            await self._emit(TextEvent(text=self.final_report))
+            return
 
         # await self._emit(TrajectoryEvent(title="Generating final report"))
         language = await self._get_language()
@@ -299,7 +351,7 @@ class Researcher(
 
         if settings.STREAMING is True:
             # Final report is streamed
-            async with chat_pool.throttle():
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="report"):
                 async for event, _ in self.chat_model.run(
                     [UserMessage(content=prompt)], stream=True, max_retries=settings.MAX_RETRIES
                 ):
@@ -325,7 +377,7 @@ class Researcher(
             topic=self.research_topic, context=self._context, max_queries=settings.RESEARCH_PLAN_BREADTH
         )
 
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.PLANNING, site="research_plan"):
             response = await self.structured_chat_model.run(
                 [UserMessage(content=prompt)],
                 response_format=ResearchPlanSchema,
@@ -338,8 +390,9 @@ class Researcher(
         if self.research_plan is None or len(self.research_plan) == 0:
             raise ValueError("No research plan has been set!")
 
-        reports = await asyncio.gather(*(self._research_step(step) for step in self.research_plan))
-        self.interim_reports.extend(reports)
+        # Steps still running at the deadline are left out of the final report
+        reports = await gather_within(*(self._research_step(step) for step in self.research_plan))
+        self.interim_reports.extend(r for r in reports if r is not None)
 
     async def _research_step(self, query: ResearchQuery) -> ResearchReport:
         await self._emit(TrajectoryEvent(title="Researching", content=query.question))
@@ -349,25 +402,26 @@ class Researcher(
             k=settings.RESEARCH_MAX_DOCS_PER_STEP,
         )
 
-        self.final_report_docs += docs
-
         self.logger.info(f"Generating research report {query.question}")
 
         research_report_prompt = ResearchPrompts.research_report_prompt(query=query, docs=docs)
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.BACKGROUND, site="research_step"):
             response = await self.chat_model.run(
                 [UserMessage(content=research_report_prompt)],
                 max_retries=settings.MAX_RETRIES,
                 max_tokens=settings.RESEARCH_FINDINGS_MAX_TOKENS,
             )
         report = response.get_text_content()
+
+        # Only steps that made it into the findings are cited
+        self.final_report_docs += docs
         return ResearchReport(query=query, report=report)
 
     async def _search_query(self, query: str, max_results: int = 3) -> list[SearchResult]:
         try:
             engine = SearchEngineFactory.create()
             # search engines do not throttle internally
-            async with task_pool.throttle():
+            async with task_pool.throttle(priority=Priority.PLANNING, site="search_engine"):
                 return await engine.search(query=query, max_results=max_results)
         except Exception as e:
             self.logger.exception(repr(e))
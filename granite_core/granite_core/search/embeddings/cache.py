@@ -0,0 +1,242 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+from granite_core.search.embeddings.utils import sanitize_for_embedding
+
+logger = get_logger(__name__)
+
+_KEY_SIZE = 32  # sha256 digest
+
+
+def embedding_key(text: str) -> str:
+    return hashlib.sha256(sanitize_for_embedding(text).encode(errors="surrogatepass")).hexdigest()
+
+
+class MmapVectorStore:
+    """
+    Append-only on-disk float32 vectors, read through a memory map.
+
+    Rows are appended to `<path>.f32` and their keys to `<path>.keys`, so a restart only has to read the keys.
+    Once the store reaches `max_bytes` it starts over, the old files are unlinked so existing maps stay valid.
+
+    Processes sharing the directory append under a lock on `<path>.lock` and first pick up the rows appended by the
+    others. Rows left without a key or vector by a writer that died are cut off.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self._path = path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        self._dim: int | None = None
+        # Device and inode of the keys file indexed
+        self._files: tuple[int, int] | None = None
+        self._vectors: np.ndarray | None = None
+        self._open()
+
+    def _open(self) -> None:
+        with self._file_lock():
+            self._load()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        with open(f"{self._path}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _load(self) -> None:
+        """Index the rows on disk, call with the file lock held"""
+        try:
+            with open(f"{self._path}.json") as f:
+                dim = int(json.load(f)["dim"])
+            with open(f"{self._path}.keys", "r+b") as k, open(f"{self._path}.f32", "r+b") as v:
+                files = (os.fstat(k.fileno()).st_dev, os.fstat(k.fileno()).st_ino)
+                rows = min(os.fstat(k.fileno()).st_size // _KEY_SIZE, os.fstat(v.fileno()).st_size // (4 * dim))
+                k.truncate(rows * _KEY_SIZE)
+                v.truncate(rows * dim * 4)
+
+                # Files replaced by another process start over, otherwise only read the keys appended since
+                if files != self._files or dim != self._dim or rows < len(self._index):
+                    self._index = {}
+                known = len(self._index)
+                k.seek(known * _KEY_SIZE)
+                keys = k.read((rows - known) * _KEY_SIZE)
+        except (OSError, ValueError, KeyError):
+            self._dim = None
+            self._files = None
+            self._index = {}
+            self._vectors = None
+            return
+
+        self._dim = dim
+        self._files = files
+        self._index.update({keys[i * _KEY_SIZE : (i + 1) * _KEY_SIZE].hex(): known + i for i in range(rows - known)})
+        self._map(rows)
+
+    def _map(self, rows: int) -> None:
+        if rows and self._dim:
+            self._vectors = np.memmap(f"{self._path}.f32", dtype=np.float32, mode="r", shape=(rows, self._dim))
+        else:
+            self._vectors = None
+
+    def _reset(self, dim: int) -> None:
+        for suffix in (".f32", ".keys", ".json"):
+            if os.path.exists(self._path + suffix):
+                os.remove(self._path + suffix)
+
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+        with open(f"{self._path}.json", "w") as f:
+            json.dump({"dim": dim}, f)
+
+        self._dim = dim
+        self._index = {}
+        self._vectors = None
+
+    def get(self, key: str) -> np.ndarray | None:
+        row = self._index.get(key)
+        vectors = self._vectors
+        if row is None or vectors is None or row >= len(vectors):
+            return None
+        return np.array(vectors[row])
+
+    def append(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Blocking, call from a thread"""
+        with self._lock, self._file_lock():
+            self._load()
+
+            dim = vectors.shape[1]
+            if self._dim != dim or (len(self._index) + len(keys)) * dim * 4 > self._max_bytes:
+                self._reset(dim)
+
+            first = {key: i for i, key in reversed(list(enumerate(keys)))}
+            new = sorted(i for key, i in first.items() if key not in self._index)
+            if not new:
+                return
+
+            # Vectors first, rows without a key are cut off when the store is next loaded
+            with open(f"{self._path}.f32", "ab") as f:
+                rows = f.tell() // (4 * dim)
+                f.write(np.ascontiguousarray(vectors[new], dtype=np.float32).tobytes())
+            with open(f"{self._path}.keys", "ab") as f:
+                f.write(b"".join(bytes.fromhex(keys[i]) for i in new))
+                self._files = (os.fstat(f.fileno()).st_dev, os.fstat(f.fileno()).st_ino)
+
+            for offset, i in enumerate(new):
+                self._index[keys[i]] = rows + offset
+            self._map(len(self._index))
+
+
+class EmbeddingCache:
+    """Embeddings of one provider and model, an in-memory LRU tier in front of an optional memory-mapped tier"""
+
+    def __init__(self, namespace: str, max_bytes: int, directory: str | None, disk_max_bytes: int) -> None:
+        self.namespace = namespace
+        self._memory: AsyncLRUCache[str, np.ndarray] | None = (
+            AsyncLRUCache(max_weight=max_bytes, weigher=lambda v: v.nbytes) if max_bytes > 0 else None
+        )
+        self._disk: MmapVectorStore | None = None
+
+        if directory:
+            name = hashlib.sha256(namespace.encode()).hexdigest()[:16]
+            try:
+                self._disk = MmapVectorStore(os.path.join(directory, name), max_bytes=disk_max_bytes)
+            except OSError as e:
+                logger.warning(f"Embeddings disk cache unavailable: {e!r}")
+
+    async def get(self, key: str) -> np.ndarray | None:
+        vector = await self._memory.get(key) if self._memory else None
+        if vector is None and self._disk is not None:
+            vector = self._disk.get(key)
+            if vector is not None and self._memory is not None:
+                await self._memory.set(key, vector)
+        return vector
+
+    async def put(self, keys: list[str], vectors: np.ndarray) -> None:
+        if self._memory is not None:
+            for key, vector in zip(keys, vectors, strict=True):
+                await self._memory.set(key, vector.copy())  # don't keep the whole batch alive
+
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.append, keys, vectors)
+            except OSError as e:
+                logger.warning(f"Failed to write to the embeddings disk cache: {e!r}")
+
+
+_caches: dict[str, EmbeddingCache] = {}
+
+
+def get_embedding_cache(namespace: str) -> EmbeddingCache:
+    """Cache shared by all embeddings of the namespace"""
+    if namespace not in _caches:
+        _caches[namespace] = EmbeddingCache(
+            namespace,
+            max_bytes=settings.EMBEDDINGS_CACHE_MAX_BYTES,
+            directory=settings.EMBEDDINGS_CACHE_DIR,
+            disk_max_bytes=settings.EMBEDDINGS_CACHE_DISK_MAX_BYTES,
+        )
+    return _caches[namespace]
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings that only send texts missing from the cache to the wrapped provider, each distinct text once.
+
+    Vectors are cached as float32. The blocking methods are not cached, they are not used on the event loop.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache) -> None:
+        self.embeddings = embeddings
+        self.cache = cache
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [embedding_key(t) for t in texts]
+        found: dict[str, np.ndarray] = {}
+        missing: dict[str, str] = {}
+
+        for key, text in zip(keys, texts, strict=True):
+            if key in found or key in missing:
+                continue
+            vector = await self.cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                found[key] = vector
+
+        if missing:
+            embedded = np.asarray(await self.embeddings.aembed_documents(list(missing.values())), dtype=np.float32)
+            await self.cache.put(list(missing), embedded)
+            found.update(zip(missing, embedded, strict=True))
+
+        return [found[key].tolist() for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = embedding_key(text)
+        vector = await self.cache.get(key)
+        if vector is None:
+            vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+            await self.cache.put([key], vector[np.newaxis])
+        return vector.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
@@ -2,11 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from langchain_core.embeddings import Embeddings
 from langchain_ollama import OllamaEmbeddings
 from langchain_openai import OpenAIEmbeddings
 
 from granite_core import utils
 from granite_core.config import settings
+from granite_core.search.embeddings.cache import CachedEmbeddings, get_embedding_cache
 from granite_core.search.embeddings.model import EmbeddingsModel
 from granite_core.search.embeddings.types import EmbeddingsModelType
 from granite_core.search.embeddings.watsonx import WatsonxEmbeddings
@@ -24,18 +26,14 @@ class EmbeddingsFactory:
         if model_type == "similarity" and settings.EMBEDDINGS_SIM_MODEL:
             model_name = settings.EMBEDDINGS_SIM_MODEL
 
+        embeddings: Embeddings
+        max_sequence = (
+            settings.EMBEDDINGS_SIM_MAX_SEQUENCE if model_type == "similarity" else settings.EMBEDDINGS_MAX_SEQUENCE
+        )
+
         if provider == "watsonx":
-            return EmbeddingsModel(
-                embeddings=WatsonxEmbeddings(
-                    model_id=model_name,
-                    worker_pool=embeddings_pool,
-                    truncate_input_tokens=(
-                        settings.EMBEDDINGS_SIM_MAX_SEQUENCE
-                        if model_type == "similarity"
-                        else settings.EMBEDDINGS_MAX_SEQUENCE
-                    ),
-                ),
-                type=model_type,
+            embeddings = WatsonxEmbeddings(
+                model_id=model_name, worker_pool=embeddings_pool, truncate_input_tokens=max_sequence
             )
 
         elif provider == "openai":
@@ -47,22 +45,22 @@ class EmbeddingsFactory:
                 else None
             )
 
-            return EmbeddingsModel(
-                embeddings=OpenAIEmbeddings(
-                    model=model_name,
-                    api_key=settings.EMBEDDINGS_OPENAI_API_KEY,
-                    base_url=str(settings.EMBEDDINGS_OPENAI_API_BASE),
-                    check_embedding_ctx_length=False,
-                    default_headers=extra_headers,
-                ),
-                type=model_type,
+            embeddings = OpenAIEmbeddings(
+                model=model_name,
+                api_key=settings.EMBEDDINGS_OPENAI_API_KEY,
+                base_url=str(settings.EMBEDDINGS_OPENAI_API_BASE),
+                check_embedding_ctx_length=False,
+                default_headers=extra_headers,
             )
 
         elif provider == "ollama":
-            return EmbeddingsModel(
-                embeddings=OllamaEmbeddings(model=model_name, base_url=str(settings.OLLAMA_BASE_URL)),
-                type=model_type,
-            )
+            embeddings = OllamaEmbeddings(model=model_name, base_url=str(settings.OLLAMA_BASE_URL))
 
         else:
             raise Exception(f"Unsupported embeddings provider {provider}")
+
+        if settings.EMBEDDINGS_CACHE_MAX_BYTES > 0 or settings.EMBEDDINGS_CACHE_DIR:
+            # Truncation changes the vectors of long texts, so it is part of the namespace
+            embeddings = CachedEmbeddings(embeddings, get_embedding_cache(f"{provider}:{model_name}:{max_sequence}"))
+
+        return EmbeddingsModel(embeddings=embeddings, type=model_type)
@@ -12,7 +12,7 @@ from langchain_core.embeddings import Embeddings
 from granite_core.config import settings
 from granite_core.search.embeddings.utils import sanitize_for_embedding
 from granite_core.utils import batch
-from granite_core.work import WorkerPool
+from granite_core.work import Priority, WorkerPool
 
 
 class WatsonxEmbeddings(Embeddings):
@@ -33,7 +33,7 @@ class WatsonxEmbeddings(Embeddings):
     async def _embed_doc_batch(self, texts: list[str]) -> list[list[float]]:
         safe_texts: list[str] = [sanitize_for_embedding(t) for t in texts]
 
-        async with self.worker_pool.throttle():
+        async with self.worker_pool.throttle(priority=Priority.BACKGROUND, cost=len(safe_texts), site="embeddings"):
             response: EmbeddingModelOutput = await self.embedding_model.create(
                 values=safe_texts, max_retries=settings.MAX_RETRIES
             )
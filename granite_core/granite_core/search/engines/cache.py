@@ -0,0 +1,114 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import hashlib
+import json
+import re
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import ClassVar
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+from granite_core.search.engines.engine import SearchEngine
+from granite_core.search.types import SearchResult
+
+logger = get_logger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, width and whitespace, and drop trailing punctuation, which search engines ignore anyway"""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return re.sub(r"\s+", " ", query).strip().rstrip("?!.").strip()
+
+
+class SearchResultStore(ABC):
+    """Store of search engine results keyed by query"""
+
+    @abstractmethod
+    async def get(self, key: str) -> list[SearchResult] | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, results: list[SearchResult], ttl: float) -> None:
+        pass
+
+
+class MemorySearchResultStore(SearchResultStore):
+    def __init__(self, max_size: int) -> None:
+        self._cache: AsyncLRUCache[str, list[SearchResult]] = AsyncLRUCache(max_size=max_size)
+
+    async def get(self, key: str) -> list[SearchResult] | None:
+        return await self._cache.get(key)
+
+    async def set(self, key: str, results: list[SearchResult], ttl: float) -> None:
+        await self._cache.set(key, results, ttl=ttl)
+
+
+class CachingSearchEngine(SearchEngine):
+    """
+    Reuses results of a wrapped engine for identical queries, and sends concurrent identical queries upstream once.
+
+    Empty results and errors are not cached, engines return those when rate limited.
+    """
+
+    _in_flight: ClassVar[dict[str, asyncio.Task[list[SearchResult]]]] = {}
+
+    def __init__(self, engine: SearchEngine, store: SearchResultStore, ttl: float) -> None:
+        self.engine = engine
+        self.store = store
+        self.ttl = ttl
+
+    def cache_key(self, query: str, domains: list[str] | None, max_results: int) -> str:
+        key = [
+            type(self.engine).__name__,
+            normalize_query(query),
+            max_results,
+            sorted({d.lower() for d in domains or []}),
+            settings.SAFE_SEARCH,
+        ]
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    async def search(self, query: str, domains: list[str] | None = None, max_results: int = 7) -> list[SearchResult]:
+        key = self.cache_key(query, domains, max_results)
+
+        try:
+            results = await self.store.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read search results from the cache: {e!r}")
+            results = None
+
+        if results is not None:
+            logger.info(f"Search cache hit for query: {query}")
+            return list(results)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._search(key, query, domains, max_results))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+        else:
+            logger.info(f"Joining in flight search for query: {query}")
+
+        # The shared search carries on if this caller gives up
+        return list(await asyncio.shield(task))
+
+    async def _search(self, key: str, query: str, domains: list[str] | None, max_results: int) -> list[SearchResult]:
+        try:
+            results = await self.engine.search(query=query, domains=domains, max_results=max_results)
+
+            if results:
+                try:
+                    await self.store.set(key, results, ttl=self.ttl)
+                except Exception as e:
+                    logger.warning(f"Failed to write search results to the cache: {e!r}")
+
+            return results
+        finally:
+            self._in_flight.pop(key, None)
+
+
+search_result_store: SearchResultStore = MemorySearchResultStore(max_size=settings.SEARCH_CACHE_MAX_ENTRIES)
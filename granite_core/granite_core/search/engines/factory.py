@@ -3,6 +3,7 @@
 
 
 from granite_core.config import settings
+from granite_core.search.engines.cache import CachingSearchEngine, search_result_store
 from granite_core.search.engines.duckduckgo import DuckDuckGoSearch
 from granite_core.search.engines.engine import SearchEngine
 from granite_core.search.engines.google import GoogleSearch
@@ -15,12 +16,18 @@ class SearchEngineFactory:
     @staticmethod
     def create() -> SearchEngine:
         provider = settings.RETRIEVER
+        engine: SearchEngine
 
         if provider == "duckduckgo":
-            return DuckDuckGoSearch()
+            engine = DuckDuckGoSearch()
         elif provider == "google":
-            return GoogleSearch()
+            engine = GoogleSearch()
         elif provider == "tavily":
-            return TavilySearch()
+            engine = TavilySearch()
         else:
             raise Exception(f"Unsupported search provider {provider}")
+
+        if settings.SEARCH_CACHE_TTL > 0:
+            engine = CachingSearchEngine(engine, store=search_result_store, ttl=settings.SEARCH_CACHE_TTL)
+
+        return engine
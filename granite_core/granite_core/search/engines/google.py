@@ -13,15 +13,15 @@
 # Changes made:
 # - Simplified Key management
 # - Safe search settings
+# - Use the shared HTTP client
 
 import json
 
-import httpx
-
 from granite_core import utils
 from granite_core.config import settings
 from granite_core.logging import get_logger
 from granite_core.search.engines.engine import SearchEngine
+from granite_core.search.http_client import http_clients
 from granite_core.search.types import SearchResult
 
 logger = get_logger(__name__)
@@ -48,37 +48,36 @@ class GoogleSearch(SearchEngine):
 
         url = f"https://www.googleapis.com/customsearch/v1?key={self.api_key}&cx={self.cx_key}&q={query}&start=1&safe={safe}"
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url)
+        resp = await http_clients.get().get(url)
+
+        if resp.status_code < 200 or resp.status_code >= 300:
+            logger.warning("Google search: unexpected response status: ", resp.status_code)
 
-            if resp.status_code < 200 or resp.status_code >= 300:
-                logger.warning("Google search: unexpected response status: ", resp.status_code)
+        if resp is None:
+            return [{}]
+        try:
+            search_results = json.loads(resp.text)
+        except Exception:
+            return []
+        if search_results is None:
+            return []
 
-            if resp is None:
-                return [{}]
+        results = search_results.get("items", [])
+        search_results = []
+
+        # Normalizing results to match the format of the other search APIs
+        for result in results:
+            # skip youtube results
+            if "youtube.com" in result["link"]:
+                continue
             try:
-                search_results = json.loads(resp.text)
+                search_result = SearchResult(
+                    title=result["title"],
+                    url=result["link"],
+                    snippet=result["snippet"],
+                )
             except Exception:
-                return []
-            if search_results is None:
-                return []
-
-            results = search_results.get("items", [])
-            search_results = []
-
-            # Normalizing results to match the format of the other search APIs
-            for result in results:
-                # skip youtube results
-                if "youtube.com" in result["link"]:
-                    continue
-                try:
-                    search_result = SearchResult(
-                        title=result["title"],
-                        url=result["link"],
-                        snippet=result["snippet"],
-                    )
-                except Exception:
-                    continue
-                search_results.append(search_result)
-
-            return search_results[:max_results]
+                continue
+            search_results.append(search_result)
+
+        return search_results[:max_results]
@@ -2,49 +2,166 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-import asyncio
-
+import numpy as np
 from beeai_framework.backend import ChatModel, UserMessage
 
 from granite_core.config import settings
 from granite_core.logging import get_logger_with_prefix
+from granite_core.memo import structured_memo
+from granite_core.search.embeddings.factory import EmbeddingsFactory
+from granite_core.search.embeddings.model import EmbeddingsModel
 from granite_core.search.prompts import SearchPrompts
-from granite_core.search.types import SearchResult, SearchResultRelevanceSchema
-from granite_core.work import chat_pool
+from granite_core.search.types import SearchResult, SearchResultRelevanceSchema, SearchResultsRelevanceSchema
+from granite_core.work import Priority, chat_pool, gather_within
+
+# Rough token estimate, the filter has no tokenizer for the chat model
+CHARS_PER_TOKEN = 4
 
 
 class SearchResultsFilter:
-    def __init__(self, chat_model: ChatModel, session_id: str) -> None:
+    def __init__(self, chat_model: ChatModel, session_id: str, memoize: bool = True) -> None:
         self.chat_model = chat_model
+        self.memoize = memoize
         self.logger = get_logger_with_prefix(__name__, tool_name="SearchResultsFilter", session_id=session_id)
+        self._embeddings_model: EmbeddingsModel | None = None
 
     async def filter(self, query: str, results: list[SearchResult]) -> list[SearchResult]:
-        filtered_results = await asyncio.gather(*(self._filter_search_result(query, result) for result in results))
-        return [r for r in filtered_results if r is not None]
+        accepted: list[SearchResult] = []
+        ambiguous = results
 
-    async def _filter_search_result(self, query: str, result: SearchResult) -> SearchResult | None:
-        self.logger.info(f"Validating search result {result.url}")
+        if settings.SEARCH_PREFILTER_ENABLED and results:
+            accepted, ambiguous = await self._prefilter(query, results)
 
-        prompt = SearchPrompts.filter_search_result_prompt(query=query, search_result=result)
+        # Results not validated before the deadline are dropped
+        if settings.SEARCH_FILTER_MODE == "batched" and len(ambiguous) > 1:
+            batches = await gather_within(*(self._filter_batch(query, b) for b in self._batches(ambiguous)))
+            filtered_results = [r for batch in batches if batch is not None for r in batch]
+        else:
+            filtered_results = await gather_within(*(self._filter_search_result(query, r) for r in ambiguous))
+
+        kept = {id(r) for r in [*accepted, *filtered_results] if r is not None}
+        return [r for r in results if id(r) in kept]
+
+    async def _prefilter(
+        self, query: str, results: list[SearchResult]
+    ) -> tuple[list[SearchResult], list[SearchResult]]:
+        """
+        Accept and reject results by embedding similarity of query and title/snippet.
+
+        Returns the accepted results and the ambiguous ones left for the LLM judge.
+        """
+        if self._embeddings_model is None:
+            self._embeddings_model = EmbeddingsFactory.create(model_type="similarity")
+
+        try:
+            vectors = np.array(
+                await self._embeddings_model.embeddings.aembed_documents(
+                    [query, *(f"{r.title}\n{r.snippet}" for r in results)]
+                )
+            )
+        except Exception as e:
+            self.logger.warning(f"Search result pre-filter failed, judging all results: {e!r}")
+            return [], results
+
+        norms = np.linalg.norm(vectors, axis=1)
+        similarities = vectors[1:] @ vectors[0] / np.maximum(norms[1:] * norms[0], 1e-12)
+
+        accepted: list[SearchResult] = []
+        ambiguous: list[SearchResult] = []
+
+        for result, similarity in zip(results, similarities, strict=True):
+            if similarity < settings.SEARCH_PREFILTER_REJECT_BELOW:
+                decision = "rejected"
+            elif similarity > settings.SEARCH_PREFILTER_ACCEPT_ABOVE:
+                decision = "accepted"
+                accepted.append(result)
+            else:
+                decision = "ambiguous"
+                ambiguous.append(result)
+            self.logger.info(f"Pre-filter {decision} {result.url} with similarity {similarity:.3f} to: {query}")
+
+        return accepted, ambiguous
+
+    def _batches(self, results: list[SearchResult]) -> list[list[SearchResult]]:
+        """Split results so the results of each batch fit the token budget"""
+        budget = settings.SEARCH_FILTER_BATCH_TOKENS * CHARS_PER_TOKEN
+        batches: list[list[SearchResult]] = []
+        size = 0
+
+        for result in results:
+            result_size = len(result.url) + len(result.title) + len(result.snippet)
+            if batches and size + result_size <= budget:
+                batches[-1].append(result)
+                size += result_size
+            else:
+                batches.append([result])
+                size = result_size
+
+        return batches
 
-        async with chat_pool.throttle():
-            response = await self.chat_model.run(
+    async def _filter_batch(self, query: str, results: list[SearchResult]) -> list[SearchResult | None]:
+        if len(results) == 1:
+            return [await self._filter_search_result(query, results[0])]
+
+        self.logger.info(f"Validating {len(results)} search results")
+
+        prompt = SearchPrompts.filter_search_results_prompt(query=query, search_results=results)
+        verdicts: dict[int, bool] = {}
+
+        try:
+            response = await structured_memo.run(
+                self.chat_model,
                 [UserMessage(content=prompt)],
-                response_format=SearchResultRelevanceSchema,
+                response_format=SearchResultsRelevanceSchema,
+                memoize=self.memoize,
+                throttle=lambda: chat_pool.throttle(priority=Priority.BACKGROUND, site="filter"),
                 max_retries=settings.MAX_RETRIES,
             )
 
+            assert isinstance(response.output_structured, SearchResultsRelevanceSchema)
+            verdicts = {v.index - 1: v.is_relevant for v in response.output_structured.verdicts}
+        except Exception as e:
+            self.logger.warning(f"Batched search result validation failed, validating one by one: {e!r}")
+
+        # Results the model skipped are judged on their own
+        missing = [i for i in range(len(results)) if i not in verdicts]
+        if missing:
+            judged = await gather_within(*(self._filter_search_result(query, results[i]) for i in missing))
+            verdicts.update({i: result is not None for i, result in zip(missing, judged, strict=True)})
+
+        for i, result in enumerate(results):
+            if not verdicts[i] and i not in missing:
+                self._log_rejected(query, result)
+
+        return [result if verdicts[i] else None for i, result in enumerate(results)]
+
+    async def _filter_search_result(self, query: str, result: SearchResult) -> SearchResult | None:
+        self.logger.info(f"Validating search result {result.url}")
+
+        prompt = SearchPrompts.filter_search_result_prompt(query=query, search_result=result)
+
+        response = await structured_memo.run(
+            self.chat_model,
+            [UserMessage(content=prompt)],
+            response_format=SearchResultRelevanceSchema,
+            memoize=self.memoize,
+            throttle=lambda: chat_pool.throttle(priority=Priority.BACKGROUND, site="filter"),
+            max_retries=settings.MAX_RETRIES,
+        )
+
         assert isinstance(response.output_structured, SearchResultRelevanceSchema)
         relevance = response.output_structured
 
         if relevance.is_relevant:
             return result
 
+        self._log_rejected(query, result)
+        return None
+
+    def _log_rejected(self, query: str, result: SearchResult) -> None:
         self.logger.info("==================================================")
         self.logger.info(f"Rejected search result: {result.url}")
         self.logger.info(f"Query: {query}")
         self.logger.info(f"Title: {result.title}")
         self.logger.info(f"Snippet: {result.snippet}")
         # self.logger.info(f"Rationale: {relevance.rationale}")
-
-        return None
@@ -0,0 +1,312 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import importlib.util
+import ipaddress
+import socket
+import weakref
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+import httpcore
+import httpx
+from httpx import (
+    AsyncBaseTransport,
+    AsyncByteStream,
+    AsyncClient,
+    PoolTimeout,
+    Request,
+    Response,
+    Timeout,
+    create_ssl_context,
+)
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+from granite_core.search.user_agent import UserAgent
+
+logger = get_logger(__name__)
+
+_DNS_CACHE_MAX_HOSTS = 4096
+
+
+class CachingResolver(httpcore.AsyncNetworkBackend):
+    """Network backend that resolves host names once per `ttl` seconds and connects the wrapped backend by address"""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, ttl: float) -> None:
+        self.backend = backend
+        self._addresses: AsyncLRUCache[tuple[str, int], list[str]] = AsyncLRUCache(
+            max_size=_DNS_CACHE_MAX_HOSTS, ttl=ttl
+        )
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        async def lookup() -> list[str]:
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            except OSError as e:
+                raise httpcore.ConnectError(f"Failed to resolve {host}: {e}") from e
+            return list(dict.fromkeys(str(info[4][0]) for info in infos))
+
+        return await self._addresses.get_or_load((host, port), lookup)
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,  # noqa: ASYNC109
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        async with asyncio.timeout(timeout):
+            addresses = await self._resolve(host, port)
+
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+
+        # The host may have moved, look it up again next time
+        await self._addresses.delete((host, port))
+        raise error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,  # noqa: ASYNC109
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors raised for them, subclasses first
+_TRANSPORT_ERRORS: dict[type[Exception], type[httpx.TransportError]] = {
+    httpcore.ConnectTimeout: httpx.ConnectTimeout,
+    httpcore.ReadTimeout: httpx.ReadTimeout,
+    httpcore.WriteTimeout: httpx.WriteTimeout,
+    httpcore.PoolTimeout: httpx.PoolTimeout,
+    httpcore.TimeoutException: httpx.TimeoutException,
+    httpcore.ConnectError: httpx.ConnectError,
+    httpcore.ReadError: httpx.ReadError,
+    httpcore.WriteError: httpx.WriteError,
+    httpcore.NetworkError: httpx.NetworkError,
+    httpcore.ProxyError: httpx.ProxyError,
+    httpcore.UnsupportedProtocol: httpx.UnsupportedProtocol,
+    httpcore.LocalProtocolError: httpx.LocalProtocolError,
+    httpcore.RemoteProtocolError: httpx.RemoteProtocolError,
+    httpcore.ProtocolError: httpx.ProtocolError,
+}
+
+
+@contextmanager
+def _httpx_errors(request: Request) -> Iterator[None]:
+    try:
+        yield
+    except Exception as e:
+        for error, httpx_error in _TRANSPORT_ERRORS.items():
+            if isinstance(e, error):
+                raise httpx_error(str(e), request=request) from e
+        raise
+
+
+class _PoolResponseStream(AsyncByteStream):
+    def __init__(self, stream: AsyncIterable[bytes], request: Request) -> None:
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _httpx_errors(self._request):
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            with _httpx_errors(self._request):
+                await self._stream.aclose()
+
+
+class PoolTransport(AsyncBaseTransport):
+    """
+    Transport over an httpcore connection pool built by the caller, httpx's own transport doesn't take a network
+    backend for its pool.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool) -> None:
+        self.pool = pool
+
+    async def handle_async_request(self, request: Request) -> Response:
+        assert isinstance(request.stream, AsyncByteStream)
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _httpx_errors(request):
+            response = await self.pool.handle_async_request(core_request)
+
+        assert isinstance(response.stream, AsyncIterable)
+        return Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_PoolResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+class _ReleasingStream(AsyncByteStream):
+    """Response body that gives back its host slot once closed"""
+
+    def __init__(self, stream: AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class HostLimitedTransport(AsyncBaseTransport):
+    """Transport that caps the requests in flight to each host, a request holds its slot until the body is closed"""
+
+    def __init__(self, transport: AsyncBaseTransport, max_per_host: int) -> None:
+        self.transport = transport
+        self.max_per_host = max_per_host
+        self._hosts: dict[str, tuple[asyncio.Semaphore, list[int]]] = {}
+
+    async def handle_async_request(self, request: Request) -> Response:
+        host = request.url.host
+        semaphore, users = self._hosts.setdefault(host, (asyncio.Semaphore(self.max_per_host), [0]))
+        users[0] += 1
+
+        def leave() -> None:
+            users[0] -= 1
+            if users[0] == 0:
+                self._hosts.pop(host, None)
+
+        def release() -> None:
+            semaphore.release()
+            leave()
+
+        try:
+            async with asyncio.timeout(request.extensions.get("timeout", {}).get("pool")):
+                await semaphore.acquire()
+        except BaseException as e:
+            leave()
+            if isinstance(e, TimeoutError):
+                raise PoolTimeout(f"Timed out waiting for a connection to {host}", request=request) from e
+            raise
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        if response.is_closed:
+            release()  # body already read, e.g. responses built in memory
+        else:
+            assert isinstance(response.stream, AsyncByteStream)
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_http_client() -> AsyncClient:
+    http2 = settings.HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("The h2 package is not installed, using HTTP/1.1 only")
+        http2 = False
+
+    pool = httpcore.AsyncConnectionPool(
+        ssl_context=create_ssl_context(),
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http1=True,
+        http2=http2,
+        network_backend=CachingResolver(httpcore.AnyIOBackend(), ttl=settings.HTTP_DNS_CACHE_TTL)
+        if settings.HTTP_DNS_CACHE_TTL > 0
+        else None,
+    )
+
+    return AsyncClient(
+        transport=HostLimitedTransport(PoolTransport(pool), max_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST),
+        timeout=Timeout(connect=5, read=10, write=5, pool=5),
+        headers={"User-Agent": UserAgent().user_agent},
+    )
+
+
+class HttpClients:
+    """
+    Long-lived pooled HTTP clients for scraping, search engines and robots.txt, shared by all sessions.
+
+    Connections are bound to the event loop they were opened on, so there is one client per running loop. A client
+    is closed when its loop shuts down, asyncio.run and the servers built on it cancel the remaining tasks on exit.
+    """
+
+    def __init__(self) -> None:
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[AsyncClient, asyncio.Task[None]]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self) -> AsyncClient:
+        """Client of the running event loop, callers must not close it"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+
+        client = create_http_client()
+        self._clients[loop] = (client, loop.create_task(self._close_on_shutdown(client)))
+        return client
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop"""
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            client, closer = entry
+            closer.cancel()
+            await client.aclose()
+
+    @staticmethod
+    async def _close_on_shutdown(client: AsyncClient) -> None:
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await client.aclose()
+
+
+http_clients = HttpClients()
@@ -171,4 +171,38 @@ Output format:
 {{
     "is_relevant": True|False,
 }}
+"""  # noqa: E501
+
+    @staticmethod
+    def filter_search_results_prompt(query: str, search_results: list[SearchResult]) -> str:
+        results_str = "\n\n".join(
+            f"[{i}]\n- URL: {r.url}\n- Title: {r.title}\n- A snippet from the page: {r.snippet}"
+            for i, r in enumerate(search_results, start=1)
+        )
+        return f"""
+You are given a topic and a numbered list of search results (URL, title and snippet of page content).
+Your task is to determine, for each search result, whether the web page it links to is likely to contain useful information that is directly relevant to the topic.
+You need to extrapolate based on the limited details provided by each search result. Judge each search result on its own.
+
+A relevant search result has the following properties:
+- The url, title or page snippet indicate that the linked page likely contains content that is relevant to the topic.
+- It is likely that the page is specific, accurate, and up-to-date.
+- It is likely that the page contributes an interesting angle or theme to the topic.
+
+If a search result looks like it may contain or promote violent, hateful or pornographic material it should be automatically marked as irrelevant.
+
+Here is the topic: {query}
+
+Here are the search results:
+{results_str}
+
+Return one verdict for every search result, with its number and True if the result is likely relevant to the topic; otherwise, False.
+
+Output format:
+{{
+    "verdicts": [
+        {{"index": 1, "is_relevant": True|False}},
+        ...
+    ]
+}}
 """  # noqa: E501
@@ -3,15 +3,17 @@
 
 import time
 from logging import Logger
+from typing import NamedTuple
 from urllib.parse import ParseResult, urlparse
 from urllib.robotparser import RobotFileParser
 
 from httpx import AsyncClient
 from httpx._models import Response
-from pydantic import BaseModel, ConfigDict
 
 from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
 from granite_core.logging import get_logger
+from granite_core.search.robots_store import RobotsRecord, RobotsStore, create_robots_store
 
 
 class MutableRobotFileParser(RobotFileParser):
@@ -23,58 +25,124 @@ class MutableRobotFileParser(RobotFileParser):
     def set_allow_all(self, value: bool) -> None:
         self.allow_all = value
 
+    @classmethod
+    def from_record(cls, record: RobotsRecord) -> "MutableRobotFileParser":
+        rp = cls()
+        if record.allow_all:
+            rp.set_allow_all(value=True)
+        elif record.disallow_all:
+            rp.set_disallow_all(value=True)
+        else:
+            rp.parse(lines=record.lines)
+        return rp
+
 
-class CachedRobotParser(BaseModel):
+class _CachedRobots(NamedTuple):
     parser: MutableRobotFileParser
-    timestamp: float
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    record: RobotsRecord
 
 
 logger: Logger = get_logger(logger_name=__name__)
-_robot_cache: AsyncLRUCache[str, CachedRobotParser] = AsyncLRUCache[str, CachedRobotParser](max_size=500)
 CACHE_TTL = 604800  # 7 days in seconds: 7 * 24 * 60 * 60
+_robot_cache: AsyncLRUCache[str, _CachedRobots] = AsyncLRUCache[str, _CachedRobots](max_size=500)
+_robots_store: RobotsStore | None = None
+
+
+def get_robots_store() -> RobotsStore:
+    global _robots_store
+    if _robots_store is None:
+        _robots_store = create_robots_store()
+    return _robots_store
+
+
+def set_robots_store(store: RobotsStore) -> None:
+    """Share robots.txt rules through the given store, e.g. a Redis client the application already holds"""
+    global _robots_store
+    _robots_store = store
+
+
+async def _fetch_robots(client: AsyncClient, robots_url: str, user_agent: str) -> RobotsRecord:
+    logger.info(msg=f"Need to load {robots_url}, it is not available or stale.")
+    record = RobotsRecord(fetched_at=time.time(), ttl=CACHE_TTL)
+
+    try:
+        response: Response = await client.get(
+            url=robots_url, headers={"User-Agent": user_agent}, timeout=5.0, follow_redirects=True
+        )
+
+        if response.status_code == 200:
+            record.lines = response.text.splitlines()
+        elif response.status_code in [401, 403]:
+            # If forbidden, robots.txt logic usually says 'disallow all'
+            logger.info(msg=f"Robots.txt for {robots_url} is forbidden! Assuming disallowed.")
+            record.disallow_all = True
+        elif response.status_code == 429 or response.status_code >= 500:
+            # Server trouble says nothing about the rules, try again sooner
+            logger.info(msg=f"Robots.txt for {robots_url} returned {response.status_code}! Assuming allowed for now.")
+            record.allow_all = record.negative = True
+        else:
+            # If not found, robots.txt logic usually says 'allow all'
+            logger.info(msg=f"Robots.txt for {robots_url} is unavailable! Assuming allowed.")
+            record.allow_all = True
+
+    except Exception:
+        # If robots.txt is unreachable, treat as allowed
+        logger.info(msg=f"Robots.txt for {robots_url} is unreachable! Assuming allowed for now.")
+        record.allow_all = record.negative = True
+
+    if record.negative:
+        record.ttl = min(CACHE_TTL, settings.ROBOTS_NEGATIVE_CACHE_TTL)
+
+    return record
 
 
 async def get_robots_parser(client: AsyncClient, robots_url: str, user_agent: str = "*") -> MutableRobotFileParser:
-    cached_parser: CachedRobotParser | None = await _robot_cache.get(key=robots_url)
+    max_age = CACHE_TTL  # read per call so it can be tuned at runtime
 
-    # If nothing in cache, or what we have in cache is stale then we need to fetch it
-    if not cached_parser or (cached_parser and (time.time() - cached_parser.timestamp > CACHE_TTL)):
-        logger.info(msg=f"Need to load {robots_url}, it is not available or stale.")
-        rp: MutableRobotFileParser = MutableRobotFileParser()
+    async def load() -> _CachedRobots:
+        store = get_robots_store()
+        record: RobotsRecord | None = None
 
         try:
-            async with AsyncClient(timeout=5.0, headers={"User-Agent": user_agent}) as client:
-                response: Response = await client.get(url=robots_url, follow_redirects=True)
-
-                if response.status_code == 200:
-                    rp.parse(lines=response.text.splitlines())
-                elif response.status_code in [401, 403]:
-                    # If forbidden, robots.txt logic usually says 'disallow all'
-                    logger.info(msg=f"Robots.txt for {robots_url} is forbidden! Assuming disallowed.")
-                    rp.set_disallow_all(value=True)
-                else:
-                    # If not found, robots.txt logic usually says 'allow all'
-                    logger.info(msg=f"Robots.txt for {robots_url} is unavailable! Assuming allowed.")
-                    rp.set_allow_all(value=True)
-
-        except Exception:
-            # If robots.txt is unreachable, treat as allowed
-            logger.info(msg=f"Robots.txt for {robots_url} is unavailable! Assuming allowed.")
-            rp.set_allow_all(value=True)
+            record = await store.get(robots_url)
+        except Exception as e:
+            logger.warning(f"Failed to read {robots_url} from the robots.txt store: {e!r}")
+
+        if record is None or record.expires_in <= 0 or time.time() - record.fetched_at > max_age:
+            record = await _fetch_robots(client, robots_url, user_agent)
+            try:
+                await store.set(robots_url, record)
+            except Exception as e:
+                logger.warning(f"Failed to write {robots_url} to the robots.txt store: {e!r}")
+
+        return _CachedRobots(MutableRobotFileParser.from_record(record), record)
+
+    # Concurrent requests for the same site share one load, whichever process fetched it
+    cached = await _robot_cache.get_or_load(
+        key=robots_url, loader=load, ttl=lambda cached: max(0, cached.record.expires_in), max_age=max_age
+    )
+    return cached.parser
 
-        cached_parser = CachedRobotParser(parser=rp, timestamp=time.time())
-        await _robot_cache.set(key=robots_url, value=cached_parser)
 
-    return cached_parser.parser
+def _robots_url(url: str) -> str:
+    parsed: ParseResult = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
 
 
 async def can_fetch(client: AsyncClient, url: str, user_agent: str = "*") -> bool:
-    parsed: ParseResult = urlparse(url)
-    robots_url: str = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
+    robots_url: str = _robots_url(url)
     parser: MutableRobotFileParser = await get_robots_parser(
         robots_url=robots_url, client=client, user_agent=user_agent
     )
     allow_fetch: bool = parser.can_fetch(useragent=user_agent, url=url)
     logger.info(msg=f"Robots.txt for {robots_url} {'allows' if allow_fetch else 'disallows'} fetching {url}")
     return allow_fetch
+
+
+async def crawl_delay(client: AsyncClient, url: str, user_agent: str = "*") -> float | None:
+    """Seconds the site asks crawlers to wait between requests, None if it does not say"""
+    parser: MutableRobotFileParser = await get_robots_parser(
+        robots_url=_robots_url(url), client=client, user_agent=user_agent
+    )
+    delay = parser.crawl_delay(useragent=user_agent)
+    return float(delay) if delay is not None else None
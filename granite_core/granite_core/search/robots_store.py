@@ -0,0 +1,85 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from pydantic import BaseModel
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RobotsRecord(BaseModel):
+    """Outcome of a robots.txt fetch, serialized to share it between processes"""
+
+    lines: list[str] = []
+    allow_all: bool = False
+    disallow_all: bool = False
+    negative: bool = False  # robots.txt was unreachable, kept for less time
+    fetched_at: float
+    ttl: float
+
+    @property
+    def expires_in(self) -> float:
+        return self.fetched_at + self.ttl - time.time()
+
+
+class RobotsStore(ABC):
+    """Cross-process store of robots.txt records keyed by robots.txt URL"""
+
+    @abstractmethod
+    async def get(self, key: str) -> RobotsRecord | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, record: RobotsRecord) -> None:
+        pass
+
+
+class LocalRobotsStore(RobotsStore):
+    """In-process stand-in for a shared store"""
+
+    def __init__(self, max_size: int = 10000) -> None:
+        self._cache: AsyncLRUCache[str, str] = AsyncLRUCache(max_size=max_size)
+
+    async def get(self, key: str) -> RobotsRecord | None:
+        value = await self._cache.get(key)
+        return RobotsRecord.model_validate_json(value) if value is not None else None
+
+    async def set(self, key: str, record: RobotsRecord) -> None:
+        await self._cache.set(key, record.model_dump_json(), ttl=record.ttl)
+
+
+class RedisRobotsStore(RobotsStore):
+    """Robots.txt records in Redis, or anything speaking its protocol, expiring with the record TTL"""
+
+    def __init__(self, redis: Any, prefix: str = "robots:") -> None:
+        self._redis = redis
+        self._prefix = prefix
+
+    async def get(self, key: str) -> RobotsRecord | None:
+        value = await self._redis.get(self._prefix + key)
+        return RobotsRecord.model_validate_json(value) if value is not None else None
+
+    async def set(self, key: str, record: RobotsRecord) -> None:
+        await self._redis.set(self._prefix + key, record.model_dump_json(), ex=max(1, int(record.expires_in)))
+
+
+def create_robots_store() -> RobotsStore:
+    if settings.ROBOTS_STORE_PROVIDER == "redis":
+        if settings.ROBOTS_STORE_REDIS_URL is None:
+            logger.warning("ROBOTS_STORE_REDIS_URL is not set, using a local robots.txt store")
+        else:
+            try:
+                from redis.asyncio import Redis
+            except ImportError:
+                logger.warning("The redis package is not installed, using a local robots.txt store")
+            else:
+                return RedisRobotsStore(Redis.from_url(settings.ROBOTS_STORE_REDIS_URL.get_secret_value()))
+
+    return LocalRobotsStore()
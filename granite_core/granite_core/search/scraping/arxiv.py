@@ -11,37 +11,200 @@
 #     http://www.apache.org/licenses/LICENSE-2.0
 #
 # Changes made:
+# - Look papers up by arXiv ID with the arXiv API instead of searching for the last segment of the link
+# - Batch the papers of a scraper run into one API call and cache them
+# - Full text only if enabled, within the PDF scraper's budgets
+
+import asyncio
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 from httpx import AsyncClient
-from langchain_community.retrievers import ArxivRetriever
-from langchain_core.documents.base import Document
+from lxml import etree
 
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
 from granite_core.search.scraping.base import AsyncScraper
+from granite_core.search.scraping.docling import DoclingPDFScraper
 from granite_core.search.scraping.types import ScrapedContent
 
+logger = get_logger(__name__)
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+
+# IDs per API call, the API pages larger lists
+_MAX_IDS_PER_CALL = 100
+_CACHE_MAX_PAPERS = 4096
+
+_NS = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+
+# New style 2402.05749v2 and old style hep-th/9901001v1 IDs in abs, pdf and html links
+_ARXIV_ID = re.compile(
+    r"arxiv\.org/(?:abs|pdf|html)/((?:\d{4}\.\d{4,5}|[a-z][a-z\-]*(?:\.[A-Z]{2})?/\d{7})(?:v\d+)?)",
+    re.IGNORECASE,
+)
+_VERSION = re.compile(r"v\d+$")
+
+
+def arxiv_id(link: str) -> str | None:
+    """The arXiv ID of an abs, pdf or html link, with its version if any"""
+    match = _ARXIV_ID.search(link)
+    return match.group(1) if match else None
+
+
+@dataclass
+class ArxivPaper:
+    id: str
+    title: str
+    summary: str
+    authors: list[str]
+    published: str
+    updated: str
+    categories: list[str]
+    pdf_url: str | None
+
+
+def _text(entry: etree._Element, path: str) -> str:
+    return " ".join((entry.findtext(path, default="", namespaces=_NS)).split())
+
+
+def parse_arxiv_feed(xml: bytes) -> list[ArxivPaper]:
+    """Papers of an arXiv API Atom feed"""
+    root = etree.fromstring(xml, parser=etree.XMLParser(resolve_entities=False, no_network=True))
+    papers = []
+
+    for entry in root.iterfind("atom:entry", _NS):
+        # Malformed IDs come back as an error entry, without an abs link
+        _, abs_path, entry_id = _text(entry, "atom:id").rpartition("/abs/")
+        title = _text(entry, "atom:title")
+        if not abs_path or not entry_id or not title:
+            continue
+
+        pdf_url = next((link.get("href") for link in entry.iterfind("atom:link[@title='pdf']", _NS)), None)
+        papers.append(
+            ArxivPaper(
+                id=entry_id,
+                title=title,
+                summary=_text(entry, "atom:summary"),
+                authors=[_text(author, "atom:name") for author in entry.iterfind("atom:author", _NS)],
+                published=_text(entry, "atom:published")[:10],
+                updated=_text(entry, "atom:updated")[:10],
+                categories=[c.get("term", "") for c in entry.iterfind("atom:category", _NS)],
+                pdf_url=pdf_url,
+            )
+        )
+
+    return papers
+
+
+class ArxivPapers:
+    """
+    Paper metadata from the arXiv API, shared by all sessions.
+
+    IDs asked for together are fetched in one API call, calls for IDs already being fetched wait for that call,
+    and papers are cached for SCRAPER_ARXIV_CACHE_TTL seconds.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        # Unknown IDs are cached too, as (None,)
+        self._cache: AsyncLRUCache[str, tuple[ArxivPaper | None]] = AsyncLRUCache(max_size=_CACHE_MAX_PAPERS, ttl=ttl)
+        self._pending: dict[str, asyncio.Future[ArxivPaper | None]] = {}
+
+    async def load(self, client: AsyncClient, ids: Iterable[str]) -> dict[str, ArxivPaper | None]:
+        """Papers by ID, those missing from the cache are fetched in one API call, None if arXiv doesn't know them"""
+        loop = asyncio.get_running_loop()
+        waiting: dict[str, asyncio.Future[ArxivPaper | None]] = {}
+        fetching: dict[str, asyncio.Future[ArxivPaper | None]] = {}
+
+        # Claim the IDs before the first await so concurrent callers join this call
+        for paper_id in dict.fromkeys(ids):
+            if paper_id in self._pending:
+                waiting[paper_id] = self._pending[paper_id]
+            else:
+                fetching[paper_id] = self._pending[paper_id] = loop.create_future()
+
+        papers: dict[str, ArxivPaper | None] = {}
+        try:
+            missing = []
+            for paper_id in fetching:
+                if (cached := await self._cache.get(paper_id)) is not None:
+                    papers[paper_id] = cached[0]
+                else:
+                    missing.append(paper_id)
+
+            if missing:
+                fetched = await self._fetch(client, missing)
+                for paper_id in missing:
+                    papers[paper_id] = fetched.get(paper_id)
+                    await self._cache.set(paper_id, (papers[paper_id],))
+        finally:
+            # Callers waiting on a failed call get None
+            for paper_id, future in fetching.items():
+                future.set_result(papers.get(paper_id))
+                self._pending.pop(paper_id, None)
+
+        for paper_id, future in waiting.items():
+            papers[paper_id] = await asyncio.shield(future)
+
+        return papers
+
+    async def get(self, client: AsyncClient, paper_id: str) -> ArxivPaper | None:
+        return (await self.load(client, [paper_id])).get(paper_id)
+
+    async def _fetch(self, client: AsyncClient, ids: list[str]) -> dict[str, ArxivPaper]:
+        papers: dict[str, ArxivPaper] = {}
+
+        for start in range(0, len(ids), _MAX_IDS_PER_CALL):
+            batch = ids[start : start + _MAX_IDS_PER_CALL]
+            response = await client.get(
+                ARXIV_API_URL, params={"id_list": ",".join(batch), "max_results": len(batch)}, follow_redirects=True
+            )
+            response.raise_for_status()
+            logger.info(f"Fetched {len(batch)} papers from the arXiv API")
+
+            # The feed has the latest version of IDs asked for without one
+            for paper in parse_arxiv_feed(response.content):
+                papers[paper.id] = paper
+                papers.setdefault(_VERSION.sub("", paper.id), paper)
+
+        return {paper_id: papers[paper_id] for paper_id in ids if paper_id in papers}
+
+
+arxiv_papers = ArxivPapers(ttl=settings.SCRAPER_ARXIV_CACHE_TTL)
+
 
 class ArxivScraper(AsyncScraper):
+    # Papers come from the batched API call, nothing is requested from arxiv.org itself
+    api_backed = True
+
     async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
         """
-        The function scrapes relevant documents from Arxiv based on a given link and returns the content
-        of the first document.
+        The function looks up the paper of an arXiv link with the arXiv API and returns its abstract and
+        metadata, followed by its full text if SCRAPER_ARXIV_FULL_TEXT is enabled.
 
         Returns:
-          The code is returning the page content of the first document retrieved by the ArxivRetriever
-        for a given query extracted from the link.
+          The abstract of the paper, prefixed with its published date and authors. None if the link has no
+        arXiv ID or the paper isn't found.
         """
 
-        if not await self.can_scrape(client=client, link=link):
+        paper_id = arxiv_id(link)
+        if paper_id is None:
             return None
 
-        query: str = link.split(sep="/")[-1]
-        retriever: ArxivRetriever = ArxivRetriever(load_max_docs=2, doc_content_chars_max=None)  # type: ignore[call-arg]
-        docs: list[Document] = await retriever.ainvoke(query)
+        paper = await arxiv_papers.get(client, paper_id)
+        if paper is None:
+            return None
 
-        if docs:
-            # Include the published date and author to provide additional context,
-            # aligning with APA-style formatting in the report.
-            context: str = f"Published: {docs[0].metadata['Published']}; Author: {docs[0].metadata['Authors']}; Content: {docs[0].page_content}"  # noqa: E501
-            return ScrapedContent(url=link, content=context, title=docs[0].metadata["Title"])
+        content = paper.summary
+        if settings.SCRAPER_ARXIV_FULL_TEXT and paper.pdf_url:
+            # Bounded by SCRAPER_MAX_PDF_BYTES, SCRAPER_PDF_MAX_PAGES and SCRAPER_MAX_CONTENT_LENGTH
+            full_text = await DoclingPDFScraper().ascrape(paper.pdf_url, client)
+            if full_text is not None:
+                content = f"{content}\n\n{full_text.content}"
 
-        return None
+        # Include the published date and author to provide additional context,
+        # aligning with APA-style formatting in the report.
+        context: str = f"Published: {paper.published}; Author: {', '.join(paper.authors)}; Content: {content}"
+        return ScrapedContent(url=link, content=context, title=paper.title)
@@ -3,19 +3,75 @@
 
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import ClassVar
 
-from httpx import AsyncClient
+from httpx import USE_CLIENT_DEFAULT, AsyncClient, Headers, Response
 
 from granite_core.config import settings
 from granite_core.logging import get_logger
 from granite_core.search.robots import can_fetch
+from granite_core.search.scraping.media import (
+    SNIFF_BYTES,
+    declared_media_type,
+    is_binary_media,
+    sniff_media_type,
+)
 from granite_core.search.scraping.types import ScrapedContent
 from granite_core.search.user_agent import UserAgent
 
 logger = get_logger(__name__)
 
+# Compressed bodies are allowed to expand this much before the ratio check kicks in
+_MIN_BOMB_SIZE = 1024 * 1024
+
+
+class DecompressionBombError(Exception):
+    pass
+
+
+async def read_capped(
+    response: Response,
+    max_bytes: int,
+    max_ratio: float,
+    head: bytes = b"",
+    stream: AsyncIterator[bytes] | None = None,
+) -> tuple[bytes, bool]:
+    """
+    Read the decoded body of a streamed response up to `max_bytes`, returning it and whether it was cut short, i.e.
+    the body goes on past `max_bytes`.
+
+    `head` is the start of the body already read from `stream`, an iterator over `response.aiter_bytes()`.
+    Raises DecompressionBombError if the body decodes to more than `max_ratio` times the bytes downloaded.
+    """
+    chunks: list[bytes] = []
+    size = 0
+
+    async def body() -> AsyncIterator[bytes]:
+        if head:
+            yield head
+        async for chunk in stream if stream is not None else response.aiter_bytes():
+            yield chunk
+
+    async for chunk in body():
+        chunks.append(chunk)
+        size += len(chunk)
+
+        if size > _MIN_BOMB_SIZE and size > max_ratio * max(response.num_bytes_downloaded, 1):
+            raise DecompressionBombError(
+                f"{response.num_bytes_downloaded} bytes downloaded decoded to more than {size} bytes"
+            )
+        # Cut short only once bytes arrive past the cap, a body of exactly `max_bytes` is whole
+        if size > max_bytes:
+            return b"".join(chunks)[:max_bytes], True
+
+    return b"".join(chunks), False
+
 
 class AsyncScraper(ABC):
+    # Scrapers that read a site's API instead of the page skip robots.txt and per-host politeness
+    api_backed: ClassVar[bool] = False
+
     @abstractmethod
     async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
         """Do scrape"""
@@ -30,3 +86,131 @@ class AsyncScraper(ABC):
                 return False
 
         return True
+
+
+async def _read_head(stream: AsyncIterator[bytes], size: int) -> bytes:
+    head = b""
+    async for chunk in stream:
+        head += chunk
+        if len(head) >= size:
+            break
+    return head
+
+
+class HttpScraper(AsyncScraper):
+    """
+    Scraper of a page fetched with a single GET, which lets the page cache revalidate it conditionally.
+
+    Subclasses list the `media_types` they extract. A fetched page is extracted by the scraper registered for its
+    media type, whichever scraper fetched it, and pages of types no scraper handles are not downloaded.
+    """
+
+    # Media types extracted by the scraper, the first scraper imported for a type handles it
+    media_types: ClassVar[tuple[str, ...]] = ()
+    # Whether a page cut at the byte ceiling is still worth extracting
+    partial_ok: ClassVar[bool] = True
+    # Seconds allowed for each phase of the request, None uses the client's timeouts
+    request_timeout: ClassVar[float | None] = None
+
+    _registry: ClassVar[dict[str, type["HttpScraper"]]] = {}
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        for media_type in cls.media_types:
+            HttpScraper._registry.setdefault(media_type, cls)
+
+    @classmethod
+    def max_download_bytes(cls) -> int:
+        return settings.SCRAPER_MAX_DOWNLOAD_BYTES
+
+    @abstractmethod
+    async def extract(self, link: str, response: Response) -> ScrapedContent | None:
+        """Extract the content of a fetched page"""
+        pass
+
+    def scraper_for(self, media_type: str | None) -> type["HttpScraper"] | None:
+        """The scraper extracting pages of the media type, this one if it handles the type"""
+        if media_type in type(self).media_types:
+            return type(self)
+        return HttpScraper._registry.get(media_type or "")
+
+    async def dispatch(self, link: str, response: Response) -> ScrapedContent | None:
+        """Extract a fetched page with the scraper for its media type, as sniffed by `fetch`"""
+        scraper_cls = self.scraper_for(declared_media_type(response.headers))
+        if scraper_cls is None:
+            return None
+        scraper = self if isinstance(self, scraper_cls) else scraper_cls()
+        return await scraper.extract(link, response)
+
+    async def fetch(self, link: str, client: AsyncClient, headers: dict[str, str] | None = None) -> Response | None:
+        """
+        GET the page, None if robots.txt disallows it, the site answers with an error or no scraper handles its
+        media type.
+
+        The media type is told from the Content-Type header and the first bytes of the body, and set as the
+        Content-Type of the returned response. Pages of unsupported types stop downloading as soon as that's known.
+        """
+        if not await self.can_scrape(client, link):
+            return None
+
+        # Stream the body so huge pages stop downloading at the byte ceiling
+        timeout = self.request_timeout if self.request_timeout is not None else USE_CLIENT_DEFAULT
+        async with client.stream("GET", link, headers=headers, timeout=timeout) as response:
+            if response.status_code == 403:
+                logger.exception(f"Error 403 when scraping link {link}")
+                return None
+
+            if response.status_code == 304:
+                return Response(304, headers=response.headers, request=response.request)
+
+            # Error pages are not content
+            if not response.is_success:
+                logger.warning(f"Error {response.status_code} when scraping link {link}")
+                return None
+
+            # Images, videos, archives... are refused on their headers alone
+            declared = declared_media_type(response.headers)
+            if is_binary_media(declared) and self.scraper_for(declared) is None:
+                logger.info(f"Not scraping {link}: unsupported media type {declared}")
+                return None
+
+            stream = response.aiter_bytes()
+            try:
+                head = await _read_head(stream, SNIFF_BYTES)
+                media_type = sniff_media_type(declared, head)
+                scraper_cls = self.scraper_for(media_type)
+                if scraper_cls is None:
+                    logger.info(f"Not scraping {link}: unsupported media type {media_type}")
+                    return None
+
+                max_bytes = scraper_cls.max_download_bytes()
+                length = response.headers.get("content-length", "")
+                if not scraper_cls.partial_ok and length.isdigit() and int(length) > max_bytes:
+                    logger.info(f"Not scraping {link}: {media_type} of {length} bytes is over {max_bytes} bytes")
+                    return None
+
+                body, truncated = await read_capped(
+                    response, max_bytes, settings.SCRAPER_MAX_COMPRESSION_RATIO, head=head, stream=stream
+                )
+            except DecompressionBombError as e:
+                logger.warning(f"Not scraping {link}: {e}")
+                return None
+
+        if truncated:
+            if not scraper_cls.partial_ok:
+                logger.info(f"Not scraping {link}: {media_type} is over {max_bytes} bytes")
+                return None
+            logger.info(f"Stopped reading {link} at {max_bytes} bytes")
+
+        # The body is already decoded
+        decoded_headers = Headers(response.headers)
+        for header in ("content-encoding", "content-length", "transfer-encoding"):
+            decoded_headers.pop(header, None)
+        if media_type != declared:
+            decoded_headers["content-type"] = media_type
+
+        return Response(response.status_code, headers=decoded_headers, content=body, request=response.request)
+
+    async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
+        response = await self.fetch(link, client)
+        return await self.dispatch(link, response) if response is not None else None
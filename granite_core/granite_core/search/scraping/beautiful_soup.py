@@ -11,20 +11,29 @@
 #     http://www.apache.org/licenses/LICENSE-2.0
 #
 # Changes made:
+# - Parse HTML in the CPU pool
+# - Split fetching and extraction so the page cache can revalidate pages
+# - Stop extracting text at the content length limit
+# - Optional lxml main content extraction
+# - Extract the media types sniffed by the fetch path
 
 
-from bs4 import BeautifulSoup
-from httpx import AsyncClient
+from httpx import AsyncClient, Response
 
+from granite_core.config import settings
 from granite_core.logging import get_logger
-from granite_core.search.scraping.base import AsyncScraper
+from granite_core.search.scraping.base import HttpScraper
+from granite_core.search.scraping.readability import extract_main_content
 from granite_core.search.scraping.types import ScrapedContent
-from granite_core.search.scraping.utils import clean_soup, extract_title, get_text_from_soup
+from granite_core.search.scraping.utils import extract_html
+from granite_core.work import cpu_pool
 
 logger = get_logger(__name__)
 
 
-class BeautifulSoupScraper(AsyncScraper):
+class BeautifulSoupScraper(HttpScraper):
+    media_types = ("text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml")
+
     async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
         """
         This function scrapes content from a webpage by making a GET request, parsing the HTML using
@@ -37,26 +46,17 @@ class BeautifulSoupScraper(AsyncScraper):
         occurs during the process, an error message is printed and an empty string is returned.
         """
         try:
-            if not await self.can_scrape(client, link):
-                return None
-
-            response = await client.get(link)
-
-            if response.status_code == 403:
-                logger.exception(f"Error 403 when scraping link {link}")
-                return None
-
-            soup = BeautifulSoup(response.content, "lxml", from_encoding=response.encoding)
-
-            soup = clean_soup(soup)
-            content = get_text_from_soup(soup)
-            # image_urls = get_relevant_images(soup, link)
-
-            # Extract the title using the utility function
-            title = extract_title(soup)
-
-            return ScrapedContent(url=link, content=content, title=title)
+            return await super().ascrape(link, client)
 
         except Exception as e:
             logger.exception(f"Error! : {e!s} scraping link {link}")
             return None
+
+    async def extract(self, link: str, response: Response) -> ScrapedContent | None:
+        # Parsing large pages takes long enough to stall the event loop
+        extractor = extract_main_content if settings.SCRAPER_HTML_EXTRACTOR == "readability" else extract_html
+        content, title = await cpu_pool.run(
+            extractor, response.content, response.encoding, settings.SCRAPER_MAX_CONTENT_LENGTH
+        )
+
+        return ScrapedContent(url=link, content=content, title=title)
@@ -3,23 +3,83 @@
 
 
 import asyncio
-import os
-import tempfile
+import time
+from dataclasses import dataclass
+from io import BytesIO
 from urllib.parse import urlparse
 
-import aiofiles
 from docling_core.types.doc.page import TextCellUnit
 from docling_parse.pdf_parser import DoclingPdfParser, PdfDocument
-from httpx import AsyncClient, TimeoutException
+from httpx import AsyncClient, Response, TimeoutException
 
+from granite_core.config import settings
 from granite_core.logging import get_logger
-from granite_core.search.scraping.base import AsyncScraper
+from granite_core.search.scraping.base import HttpScraper
 from granite_core.search.scraping.types import ScrapedContent
+from granite_core.work import cpu_pool
 
 logger = get_logger(__name__)
 
 
-class DoclingPDFScraper(AsyncScraper):
+@dataclass
+class PdfPage:
+    number: int
+    lines: list[str]
+    seconds: float
+
+
+def _load(source: bytes | str) -> PdfDocument:
+    """Load a PDF from its bytes, or from a file path"""
+    return DoclingPdfParser().load(BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def count_pdf_pages(source: bytes | str) -> int:
+    """Number of pages of a PDF, runs in the CPU pool"""
+    pdf_doc = _load(source)
+    try:
+        return pdf_doc.number_of_pages()
+    finally:
+        pdf_doc.unload()
+
+
+def extract_pdf_pages(
+    source: bytes | str, first: int = 1, last: int | None = None, max_chars: int | None = None
+) -> tuple[list[PdfPage], int]:
+    """
+    Parse the text lines of pages `first` to `last` of a PDF, stopping once `max_chars` of text are collected.
+
+    Returns the pages parsed and the number of pages of the document, runs in the CPU pool.
+    """
+    pdf_doc = _load(source)
+    try:
+        page_count = pdf_doc.number_of_pages()
+        pages: list[PdfPage] = []
+        size = 0
+
+        for number in range(first, min(last or page_count, page_count) + 1):
+            start = time.perf_counter()
+            lines = [line.text for line in pdf_doc.get_page(number).iterate_cells(unit_type=TextCellUnit.LINE)]
+            pages.append(PdfPage(number=number, lines=lines, seconds=time.perf_counter() - start))
+
+            size += sum(len(line) + 1 for line in lines)
+            if max_chars is not None and size >= max_chars:
+                break
+
+        return pages, page_count
+    finally:
+        pdf_doc.unload()
+
+
+class DoclingPDFScraper(HttpScraper):
+    media_types = ("application/pdf",)
+    # A PDF cut short can't be parsed
+    partial_ok = False
+    request_timeout = 8
+
+    @classmethod
+    def max_download_bytes(cls) -> int:
+        return settings.SCRAPER_MAX_PDF_BYTES
+
     def is_url(self, link: str) -> bool:
         """
         Check if the provided `link` is a valid URL.
@@ -34,39 +94,12 @@ class DoclingPDFScraper(AsyncScraper):
             return False
 
     async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
-        if not await self.can_scrape(client=client, link=link):
-            return None
-
-        parser = DoclingPdfParser()
-        temp_filename: str | None = None
-
         try:
             if self.is_url(link):
-                # Download to local
-                async with client.stream("GET", link, timeout=8) as response:
-                    response.raise_for_status()
-
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                        temp_filename = temp_file.name
-
-                    async with aiofiles.open(temp_filename, "wb") as f:
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            await f.write(chunk)
-                path = temp_filename
-            else:
-                # Assumes a local path
-                path = link
+                return await super().ascrape(link, client)
 
-            pdf_doc: PdfDocument = await asyncio.to_thread(parser.load, path)
-            lines: list[str] = []
-
-            for _, pred_page in pdf_doc.iterate_pages():
-                for line in pred_page.iterate_cells(unit_type=TextCellUnit.LINE):
-                    lines.append(line.text)
-                await asyncio.sleep(0)
-
-            content = "\n".join(lines)
-            return ScrapedContent(url=link, content=content, title=lines[0] if lines else "")
+            # Assumes a local path
+            return await self._parse(link, link)
 
         except TimeoutException:
             logger.exception(f"Download timed out. Please check the link: {link}")
@@ -74,6 +107,69 @@ class DoclingPDFScraper(AsyncScraper):
         except Exception:
             logger.exception(f"Error loading PDF: {link}")
             return None
-        finally:
-            if temp_filename and os.path.exists(temp_filename):
-                os.remove(temp_filename)
+
+    async def extract(self, link: str, response: Response) -> ScrapedContent | None:
+        try:
+            # Parsed from memory, the body is already capped at SCRAPER_MAX_PDF_BYTES
+            return await self._parse(link, response.content)
+
+        except Exception:
+            logger.exception(f"Error loading PDF: {link}")
+            return None
+
+    async def _parse(self, link: str, source: bytes | str) -> ScrapedContent:
+        """
+        Parse up to SCRAPER_PDF_MAX_PAGES pages, one after the other until SCRAPER_MAX_CONTENT_LENGTH characters are
+        in. Documents with SCRAPER_PDF_PARALLEL_MIN_PAGES pages or more are split across the CPU workers instead.
+        """
+        start = time.perf_counter()
+        max_pages = settings.SCRAPER_PDF_MAX_PAGES
+        max_chars = settings.SCRAPER_MAX_CONTENT_LENGTH
+
+        page_count = 0
+        if settings.SCRAPER_PDF_PARALLEL_MIN_PAGES > 0 and cpu_pool.max_workers > 1:
+            page_count = await cpu_pool.run(count_pdf_pages, source)
+
+        pages: list[PdfPage]
+        if page_count > 0 and min(page_count, max_pages) >= settings.SCRAPER_PDF_PARALLEL_MIN_PAGES:
+            pages = await self._parse_parallel(source, min(page_count, max_pages), max_chars)
+        else:
+            pages, page_count = await cpu_pool.run(extract_pdf_pages, source, 1, max_pages, max_chars)
+
+        lines = [line for page in pages for line in page.lines]
+        self._log_timings(link, pages, page_count, time.perf_counter() - start)
+
+        content = "\n".join(lines)
+        return ScrapedContent(url=link, content=content, title=lines[0] if lines else "")
+
+    async def _parse_parallel(self, source: bytes | str, page_count: int, max_chars: int) -> list[PdfPage]:
+        """Parse the pages in one contiguous range per CPU worker, each worker loads its own copy of the document"""
+        per_worker = -(-page_count // cpu_pool.max_workers)
+        ranges = [(first, min(first + per_worker - 1, page_count)) for first in range(1, page_count + 1, per_worker)]
+        results = await asyncio.gather(
+            *(cpu_pool.run(extract_pdf_pages, source, first, last, max_chars) for first, last in ranges)
+        )
+
+        # Keep pages in order up to the character budget, later ranges were parsed for nothing past it
+        pages: list[PdfPage] = []
+        size = 0
+        for range_pages, _ in results:
+            for page in range_pages:
+                if size >= max_chars:
+                    return pages
+                pages.append(page)
+                size += sum(len(line) + 1 for line in page.lines)
+        return pages
+
+    def _log_timings(self, link: str, pages: list[PdfPage], page_count: int, elapsed: float) -> None:
+        if not pages:
+            logger.info(f"No text in {link} ({page_count} pages, {elapsed:.2f}s)")
+            return
+
+        slowest = max(pages, key=lambda p: p.seconds)
+        logger.info(
+            f"Parsed {len(pages)} of {page_count} pages of {link} in {elapsed:.2f}s, "
+            f"{sum(p.seconds for p in pages) / len(pages) * 1000:.0f} ms per page, "
+            f"slowest page {slowest.number} in {slowest.seconds * 1000:.0f} ms"
+        )
+        logger.debug(f"Page timings of {link}: " + ", ".join(f"{p.number}: {p.seconds * 1000:.0f} ms" for p in pages))
@@ -0,0 +1,104 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+from httpx import Headers
+
+# Bytes looked at to tell the type of a body
+SNIFF_BYTES = 512
+
+# Types servers send when they don't know better, the body decides
+_GENERIC_TYPES = (
+    "application/octet-stream",
+    "binary/octet-stream",
+    "application/binary",
+    "application/download",
+    "application/force-download",
+    "application/unknown",
+)
+
+_SIGNATURES: tuple[tuple[bytes, str], ...] = (
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"Rar!\x1a\x07", "application/vnd.rar"),
+    (b"OggS", "audio/ogg"),
+    (b"ID3", "audio/mpeg"),
+    (b"fLaC", "audio/flac"),
+    (b"\x1aE\xdf\xa3", "video/webm"),
+    (b"wOFF", "font/woff"),
+    (b"wOF2", "font/woff2"),
+)
+
+# Types that can't be a mislabelled document
+_BINARY_TOP_LEVEL_TYPES = ("image", "video", "audio", "font", "model")
+_ARCHIVE_TYPES = (
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-tar",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.rar",
+    "application/java-archive",
+    "application/vnd.android.package-archive",
+    "application/x-msdownload",
+    "application/x-iso9660-image",
+)
+
+_HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body", b"<title", b"<p>", b"<div", b"<meta")
+
+
+def declared_media_type(headers: Headers) -> str | None:
+    """The Content-Type of a response without its parameters, None if missing"""
+    content_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    return content_type or None
+
+
+def _is_generic(media_type: str | None) -> bool:
+    return media_type is None or media_type in _GENERIC_TYPES
+
+
+def is_binary_media(media_type: str | None) -> bool:
+    """Whether the type is media or an archive, known from the Content-Type alone"""
+    if media_type is None:
+        return False
+    return media_type.split("/", 1)[0] in _BINARY_TOP_LEVEL_TYPES or media_type in _ARCHIVE_TYPES
+
+
+def sniff_media_type(declared: str | None, head: bytes) -> str:
+    """
+    The media type of a body from its Content-Type and its first bytes.
+
+    A PDF signature wins over any declared type, servers often label PDFs as binary or HTML. Other signatures and
+    HTML markup only decide when the declared type is missing or generic.
+    """
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    if not _is_generic(declared):
+        assert declared is not None
+        return declared
+
+    for signature, media_type in _SIGNATURES:
+        if head.startswith(signature):
+            return media_type
+    if head[4:8] == b"ftyp":
+        return "video/mp4"
+    if head.startswith(b"RIFF") and head[8:12] in (b"WAVE", b"AVI ", b"WEBP"):
+        return {b"WAVE": "audio/wav", b"AVI ": "video/x-msvideo", b"WEBP": "image/webp"}[head[8:12]]
+
+    text = head.lstrip(b"\xef\xbb\xbf \t\r\n").lower()
+    if any(marker in text for marker in _HTML_MARKERS):
+        return "text/html"
+    if text.startswith(b"<?xml"):
+        return "text/xml"
+    if head and b"\0" not in head:
+        return "text/plain"
+    return "application/octet-stream"
@@ -0,0 +1,399 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiofiles
+import aiofiles.os
+from httpx import AsyncClient, Headers, Response
+from pydantic import BaseModel, ValidationError
+
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.logging import get_logger
+from granite_core.search.scraping.base import AsyncScraper, HttpScraper
+from granite_core.search.scraping.types import ScrapedContent
+
+logger = get_logger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def canonical_url(url: str) -> str:
+    """Cache key of a page, ignores case of scheme and host, default ports, fragments and tracking parameters"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(_TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def _parse_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Headers, now: float) -> float | None:
+    """Seconds a response stays fresh per Cache-Control, Expires and Last-Modified, None if it may not be stored"""
+    directives: dict[str, str | None] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+
+    # Responses meant for one user can't go in a cache shared between sessions
+    if "no-store" in directives or "private" in directives or headers.get("vary", "").strip() == "*":
+        return None
+
+    lifetime: float | None = None
+
+    if "no-cache" in directives:
+        lifetime = 0
+    else:
+        for name in ("s-maxage", "max-age"):
+            try:
+                lifetime = float(directives[name] or "")
+                break
+            except (KeyError, ValueError):
+                continue
+
+    date = _parse_date(headers.get("date")) or now
+
+    if lifetime is None and "expires" in headers:
+        # An invalid Expires means already expired
+        expires = _parse_date(headers.get("expires"))
+        lifetime = expires - date if expires is not None else 0
+
+    if lifetime is None and (last_modified := _parse_date(headers.get("last-modified"))) is not None:
+        # Heuristic freshness, a tenth of the time since the page last changed
+        lifetime = min((date - last_modified) / 10, settings.PAGE_CACHE_DEFAULT_TTL)
+
+    if lifetime is None:
+        lifetime = settings.PAGE_CACHE_DEFAULT_TTL
+
+    return max(0.0, min(lifetime, settings.PAGE_CACHE_MAX_TTL))
+
+
+class CachedPage(BaseModel):
+    content: ScrapedContent
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float
+    fresh_until: float
+    download_size: int  # bytes downloaded to scrape the page, what a cache hit saves
+
+    @property
+    def size(self) -> int:
+        return len(self.content.content) + len(self.content.title)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers to revalidate the page"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def retain_until(self) -> float:
+        """Stale pages are kept for a while so they can be revalidated"""
+        return self.fresh_until + settings.PAGE_CACHE_MAX_TTL
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (now or time.time()) < self.fresh_until
+
+    @classmethod
+    def from_response(cls, content: ScrapedContent, response: Response) -> "CachedPage | None":
+        now = time.time()
+        lifetime = freshness_lifetime(response.headers, now)
+        if lifetime is None:
+            return None
+
+        return cls(
+            content=content,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            fetched_at=now,
+            fresh_until=now + lifetime,
+            download_size=len(response.content),
+        )
+
+    @classmethod
+    def from_content(cls, content: ScrapedContent) -> "CachedPage":
+        """Page scraped without access to the response, e.g. through an API"""
+        now = time.time()
+        return cls(
+            content=content,
+            fetched_at=now,
+            fresh_until=now + settings.PAGE_CACHE_DEFAULT_TTL,
+            download_size=len(content.content.encode()),
+        )
+
+    def revalidated(self, response: Response) -> "CachedPage | None":
+        """Page refreshed by a 304 Not Modified response"""
+        now = time.time()
+        lifetime = freshness_lifetime(response.headers, now)
+        if lifetime is None:
+            return None
+
+        return self.model_copy(
+            update={
+                "etag": response.headers.get("etag", self.etag),
+                "last_modified": response.headers.get("last-modified", self.last_modified),
+                "fresh_until": now + lifetime,
+            }
+        )
+
+
+class PageStore(ABC):
+    """Backend of the page cache, keyed by canonical URL"""
+
+    @abstractmethod
+    async def get(self, key: str) -> CachedPage | None:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, page: CachedPage) -> None:
+        pass
+
+
+class MemoryPageStore(PageStore):
+    def __init__(self, max_bytes: int) -> None:
+        self._cache: AsyncLRUCache[str, CachedPage] = AsyncLRUCache(max_weight=max_bytes, weigher=lambda p: p.size)
+
+    async def get(self, key: str) -> CachedPage | None:
+        return await self._cache.get(key)
+
+    async def set(self, key: str, page: CachedPage) -> None:
+        await self._cache.set(key, page, ttl=page.retain_until - time.time())
+
+
+def _scan_pages(directory: str) -> list[tuple[float, int, str]]:
+    """(mtime, size, path) of the page files under the directory, oldest first"""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.endswith(".json"):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+    return sorted(files)
+
+
+def _evict_pages(directory: str, max_bytes: int) -> int:
+    """Remove expired page files, then the oldest until the rest fit in `max_bytes`, returns the bytes left"""
+    files = _scan_pages(directory)
+    size = sum(file_size for _, file_size, _ in files)
+    # A page is retained at most PAGE_CACHE_MAX_TTL past a freshness of at most PAGE_CACHE_MAX_TTL from its write
+    expired = time.time() - 2 * settings.PAGE_CACHE_MAX_TTL
+
+    for mtime, file_size, path in files:
+        if size <= max_bytes and mtime >= expired:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        size -= file_size
+
+    return size
+
+
+class DiskPageStore(PageStore):
+    """
+    One JSON file per page, survives restarts and can be shared through a mounted volume.
+
+    Once the files take more than `max_bytes`, expired and then the least recently written pages are removed down to
+    80% of it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._size: int | None = None  # unknown until the directory is scanned
+        self._evict_lock = asyncio.Lock()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self._directory, digest[:2], f"{digest}.json")
+
+    async def get(self, key: str) -> CachedPage | None:
+        path = self._path(key)
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                page = CachedPage.model_validate_json(await f.read())
+        except (FileNotFoundError, ValidationError):
+            return None
+
+        if time.time() > page.retain_until:
+            await aiofiles.os.remove(path)
+            return None
+        return page
+
+    async def set(self, key: str, page: CachedPage) -> None:
+        path = self._path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename so readers never see a partial file, the name is unique to this write
+        data = page.model_dump_json().encode()
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.write(data)
+            await aiofiles.os.replace(temp_path, path)
+        except BaseException:
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+            raise
+
+        if self._size is not None:
+            self._size += len(data)
+        if self._size is None or self._size > self._max_bytes:
+            await self._evict()
+
+    async def _evict(self) -> None:
+        if self._evict_lock.locked():
+            return
+
+        async with self._evict_lock:
+            # Rescan, other processes may share the directory
+            target = self._max_bytes if self._size is None else int(self._max_bytes * 0.8)
+            self._size = await asyncio.to_thread(_evict_pages, self._directory, target)
+
+
+class ObjectStorePageStore(PageStore):
+    """Pages in an obstore ObjectStore e.g. S3, shared between replicas"""
+
+    def __init__(self, store: Any, prefix: str = "") -> None:
+        self._store = store
+        self._prefix = prefix
+
+    def _path(self, key: str) -> str:
+        return f"{self._prefix}{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    async def get(self, key: str) -> CachedPage | None:
+        try:
+            result = await self._store.get_async(self._path(key))
+            page = CachedPage.model_validate_json(bytes(await result.bytes_async()))
+        except (FileNotFoundError, ValidationError):
+            return None
+
+        return page if time.time() <= page.retain_until else None
+
+    async def set(self, key: str, page: CachedPage) -> None:
+        await self._store.put_async(self._path(key), page.model_dump_json().encode())
+
+
+class PageCacheStats(BaseModel):
+    hits: int = 0
+    revalidated: int = 0  # stale pages confirmed unchanged with a conditional request
+    misses: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / lookups if lookups else 0.0
+
+
+class PageCache:
+    """Cache of extracted page content in front of the scrapers, shared by all sessions"""
+
+    def __init__(self, store: PageStore) -> None:
+        self.store = store
+        self.stats = PageCacheStats()
+
+    async def lookup(self, link: str) -> CachedPage | None:
+        """Cached page, fresh or stale"""
+        try:
+            return await self.store.get(canonical_url(link))
+        except Exception as e:
+            logger.warning(f"Failed to read {link} from the page cache: {e!r}")
+            return None
+
+    def hit(self, link: str, page: CachedPage) -> ScrapedContent:
+        """Content of a fresh cached page"""
+        self.stats.hits += 1
+        self.stats.bytes_saved += page.download_size
+        return page.content.model_copy(update={"url": link})
+
+    async def scrape(
+        self, scraper: AsyncScraper, link: str, client: AsyncClient, cached: CachedPage | None = None
+    ) -> ScrapedContent | None:
+        """Scrape a page missing from the cache, or revalidate a stale one, and cache the result"""
+        page: CachedPage | None = None
+
+        if isinstance(scraper, HttpScraper):
+            response = await scraper.fetch(link, client, headers=cached.validators if cached else None)
+            if response is None:
+                return None
+
+            if response.status_code == 304 and cached is not None:
+                self.stats.revalidated += 1
+                self.stats.bytes_saved += cached.download_size
+                page = cached.revalidated(response)
+                content: ScrapedContent | None = cached.content.model_copy(update={"url": link})
+            else:
+                self.stats.misses += 1
+                content = await scraper.dispatch(link, response)
+                if content is not None and response.status_code == 200:
+                    page = CachedPage.from_response(content, response)
+        else:
+            self.stats.misses += 1
+            content = await scraper.ascrape(link, client)
+            if content is not None:
+                page = CachedPage.from_content(content)
+
+        if page is not None:
+            try:
+                await self.store.set(canonical_url(link), page)
+            except Exception as e:
+                logger.warning(f"Failed to write {link} to the page cache: {e!r}")
+
+        return content
+
+
+def create_page_cache() -> PageCache | None:
+    match settings.PAGE_CACHE_PROVIDER:
+        case None:
+            return None
+        case "disk":
+            return PageCache(DiskPageStore(settings.PAGE_CACHE_DIR, max_bytes=settings.PAGE_CACHE_DISK_MAX_BYTES))
+        case "obstore" if settings.PAGE_CACHE_OBSTORE_URL:
+            try:
+                from obstore.store import from_url
+            except ImportError:
+                logger.warning("The obstore package is not installed, using an in-memory page cache")
+            else:
+                return PageCache(ObjectStorePageStore(from_url(settings.PAGE_CACHE_OBSTORE_URL)))
+        case "obstore":
+            logger.warning("PAGE_CACHE_OBSTORE_URL is not set, using an in-memory page cache")
+
+    return PageCache(MemoryPageStore(settings.PAGE_CACHE_MAX_BYTES))
+
+
+page_cache = create_page_cache()
@@ -0,0 +1,114 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from itertools import chain, zip_longest
+from urllib.parse import urlparse
+
+from granite_core.config import settings
+
+# Idle hosts are forgotten once there are more than this many
+_MAX_IDLE_HOSTS = 1024
+
+
+def domain_of(url: str) -> str:
+    """Host of the url without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host.removeprefix("www.")
+
+
+def interleave_by_domain(urls: list[str]) -> list[str]:
+    """Round robin the urls over their domains, keeping the order within each domain"""
+    by_domain: dict[str, list[str]] = {}
+    for url in urls:
+        by_domain.setdefault(domain_of(url), []).append(url)
+    return [url for url in chain.from_iterable(zip_longest(*by_domain.values())) if url is not None]
+
+
+class _Host:
+    def __init__(self, max_concurrent: int) -> None:
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.next_start = 0.0
+        self.users = 0
+        # Turns taken by waiters still sleeping, as (start, interval)
+        self.reserved: list[tuple[float, float]] = []
+        # The latest turn that was used
+        self.last_turn = (0.0, 0.0)
+        # When the latest request holding a slot started, or is due to start
+        self.last_start = -math.inf
+
+
+class HostScheduler:
+    """
+    Limits the concurrent requests to each host and spaces out their start, shared by all sessions.
+
+    Requests to a host start at least `min_interval` seconds apart, or the host's robots.txt Crawl-delay if longer
+    but no more than `max_delay`.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval: float, max_delay: float) -> None:
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self.max_delay = max_delay
+        self._hosts: dict[str, _Host] = {}
+
+    def _forget_idle(self) -> None:
+        now = time.monotonic()
+        for host in [h for h, state in self._hosts.items() if state.users == 0 and state.next_start <= now]:
+            del self._hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str, crawl_delay: float | None = None) -> AsyncIterator[None]:
+        """Wait for the host's turn, then for one of its concurrent slots"""
+        if len(self._hosts) > _MAX_IDLE_HOSTS:
+            self._forget_idle()
+
+        state = self._hosts.setdefault(host, _Host(self.max_concurrent))
+        state.users += 1
+        try:
+            now = time.monotonic()
+            interval = max(self.min_interval, min(crawl_delay or 0, self.max_delay))
+            turn = (max(now, state.next_start), interval)
+            state.next_start = sum(turn)
+
+            # Sleep before taking a slot so waiting for a turn doesn't hold up requests whose turn has come
+            if turn[0] > now:
+                state.reserved.append(turn)
+                try:
+                    await asyncio.sleep(turn[0] - now)
+                except asyncio.CancelledError:
+                    # Give the turn back, later requests start after the turns still taken
+                    state.reserved.remove(turn)
+                    state.next_start = max(sum(t) for t in [state.last_turn, *state.reserved])
+                    raise
+                state.reserved.remove(turn)
+            state.last_turn = max(state.last_turn, turn)
+
+            async with state.semaphore:
+                # Turns that passed while the slots were busy would all start at once, space out the starts again
+                previous = state.last_start
+                start = max(time.monotonic(), previous + interval)
+                state.last_start = start
+                state.next_start = max(state.next_start, start + interval)
+                if start > time.monotonic():
+                    try:
+                        await asyncio.sleep(start - time.monotonic())
+                    except asyncio.CancelledError:
+                        if state.last_start == start:
+                            state.last_start = previous
+                        raise
+                yield
+        finally:
+            state.users -= 1
+
+
+host_scheduler = HostScheduler(
+    max_concurrent=settings.SCRAPER_HOST_MAX_CONCURRENT,
+    min_interval=settings.SCRAPER_HOST_MIN_INTERVAL,
+    max_delay=settings.SCRAPER_TIMEOUT,
+)
@@ -0,0 +1,167 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import re
+from collections.abc import Callable
+
+import lxml.html
+from lxml import etree
+
+# Never content
+_DROP_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "canvas",
+    "iframe",
+    "form",
+    "button",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    "menu",
+)
+
+_BOILERPLATE_CLASSES = ("nav", "menu", "sidebar", "footer")
+_DROP_XPATH = etree.XPath(
+    " | ".join(f'//*[contains(concat(" ", normalize-space(@class), " "), " {c} ")]' for c in _BOILERPLATE_CLASSES)
+)
+
+_POSITIVE = re.compile(r"article|body|content|entry|main|page|post|text|blog|story", re.IGNORECASE)
+_NEGATIVE = re.compile(
+    r"comment|meta|footnote|sidebar|sponsor|banner|ad-|advert|share|social|related|promo|popup|cookie|newsletter",
+    re.IGNORECASE,
+)
+
+_PARAGRAPH_TAGS = ("p", "pre", "td", "li", "blockquote")
+
+# Below this much text the best candidate is not trusted and the whole body is used
+_MIN_MAIN_CONTENT = 250
+
+
+def _class_weight(element: etree._Element) -> float:
+    weight = 0.0
+    for attribute in (element.get("class"), element.get("id")):
+        if attribute:
+            if _POSITIVE.search(attribute):
+                weight += 25
+            if _NEGATIVE.search(attribute):
+                weight -= 25
+    return weight
+
+
+def _text_length(element: etree._Element) -> int:
+    return len(" ".join(element.text_content().split()))
+
+
+def _link_density(element: etree._Element, length: int) -> float:
+    link_length = sum(_text_length(a) for a in element.iter("a"))
+    return link_length / length if length else 1.0
+
+
+def _main_content(body: etree._Element) -> list[etree._Element]:
+    """Readability style: score paragraph containers by their text and pick the best with its related siblings"""
+    scores: dict[etree._Element, float] = {}
+
+    for paragraph in body.iter(*_PARAGRAPH_TAGS):
+        text = " ".join(paragraph.text_content().split())
+        if len(text) < 25:
+            continue
+
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        # The parent gets the full score, the grandparent half and the next ancestor a third
+        ancestor = paragraph.getparent()
+        for divider in (1, 2, 3):
+            if ancestor is None:
+                break
+            if ancestor not in scores:
+                scores[ancestor] = _class_weight(ancestor)
+            scores[ancestor] += score / divider
+            ancestor = ancestor.getparent()
+
+    if not scores:
+        return [body]
+
+    lengths = {element: _text_length(element) for element in scores}
+    for element in scores:
+        scores[element] *= 1 - _link_density(element, lengths[element])
+
+    top = max(scores, key=lambda e: scores[e])
+
+    # Move up while the ancestors keep scoring well, e.g. to a thread from its longest post
+    last_score = scores[top]
+    ancestor = top.getparent()
+    while ancestor is not None and ancestor is not body:
+        if ancestor in scores:
+            if scores[ancestor] < last_score / 3:
+                break
+            if scores[ancestor] > last_score:
+                top = ancestor
+                break
+            last_score = scores[ancestor]
+        ancestor = ancestor.getparent()
+
+    if lengths[top] < _MIN_MAIN_CONTENT:
+        return [body]
+
+    # Siblings that score well enough or look alike belong to the same article, e.g. split by a heading
+    threshold = max(10, scores[top] * 0.2)
+    selected = _siblings(top, lambda e: scores.get(e, 0) >= threshold)
+
+    # A lone post of a thread brings its sibling posts
+    parent = top.getparent()
+    if len(selected) == 1 and parent is not None and parent is not body:
+        posts = _siblings(parent, lambda e: False)
+        if len(posts) > 1:
+            selected = posts
+
+    return selected
+
+
+def _siblings(element: etree._Element, related: Callable[[etree._Element], bool]) -> list[etree._Element]:
+    """The element and those of its siblings that are related or share its class"""
+    parent = element.getparent()
+    if parent is None:
+        return [element]
+
+    cls = element.get("class")
+    return [e for e in parent if e is element or related(e) or (cls and e.get("class") == cls)]
+
+
+def extract_main_content(html: bytes, encoding: str | None = None, max_chars: int | None = None) -> tuple[str, str]:
+    """Parse an HTML page with lxml and return the (text, title) of its main content, runs in the CPU pool"""
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True, remove_pis=True)
+    except LookupError:
+        parser = lxml.html.HTMLParser(remove_comments=True, remove_pis=True)
+
+    try:
+        root = lxml.html.document_fromstring(html, parser=parser)
+    except (etree.ParserError, ValueError):
+        return "", ""
+
+    title = " ".join((root.findtext(".//title") or "").split())
+
+    etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
+    for element in _DROP_XPATH(root):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    body = root.find("body")
+    elements = _main_content(body if body is not None else root)
+
+    parts: list[str] = []
+    size = 0
+    for element in elements:
+        for string in element.itertext():
+            if string := " ".join(string.split()):
+                parts.append(string)
+                size += len(string) + 1
+                if max_chars is not None and size > max_chars:
+                    return " ".join(parts), title
+
+    return " ".join(parts), title
@@ -11,24 +11,34 @@
 #     http://www.apache.org/licenses/LICENSE-2.0
 #
 # Changes made:
+# - Stop at the deadline with the pages scraped so far
+# - Serve pages from the page cache, revalidating stale ones
+# - Scrape pages speculatively ahead of `run`
+# - Use the shared HTTP client
+# - Per-host politeness and a cap on pages per domain, crawl domains round robin
+# - Stop once enough pages are in, keeping a few more scrapes in flight than needed
+# - Fetch the arXiv papers of a run in one API call
 
 import asyncio
-from typing import cast
-
-from httpx import AsyncClient, Timeout
+import math
+from collections.abc import Awaitable
 
 from granite_core.config import settings
 from granite_core.emitter import EventEmitter
 from granite_core.events import TrajectoryEvent
 from granite_core.logging import get_logger_with_prefix
-from granite_core.search.scraping.arxiv import ArxivScraper
+from granite_core.search.http_client import http_clients
+from granite_core.search.robots import crawl_delay
+from granite_core.search.scraping.arxiv import ArxivPaper, ArxivScraper, arxiv_id, arxiv_papers
 from granite_core.search.scraping.base import AsyncScraper
 from granite_core.search.scraping.beautiful_soup import BeautifulSoupScraper
 from granite_core.search.scraping.docling import DoclingPDFScraper
+from granite_core.search.scraping.page_cache import page_cache
+from granite_core.search.scraping.politeness import domain_of, host_scheduler, interleave_by_domain
 from granite_core.search.scraping.types import ScrapedContent
 from granite_core.search.scraping.wikipedia import WikipediaScraper
 from granite_core.search.user_agent import UserAgent
-from granite_core.work import task_pool
+from granite_core.work import Priority, gather_within, task_pool, time_remaining
 
 
 class ScraperRunner(EventEmitter):
@@ -50,29 +60,114 @@ class ScraperRunner(EventEmitter):
         """
         super().__init__()
         self.urls = urls
-        self.async_client = AsyncClient(timeout=Timeout(connect=5, read=10, write=5, pool=5))
-        self.async_client.headers.update(headers={"User-Agent": UserAgent().user_agent})
+        self.async_client = http_clients.get()
         self._counter_lock = asyncio.Lock()
         self._content_count: int = 0
+        self._domain_counts: dict[str, int] = {}
         self._max_scraped_content = max_scraped_content
+        self._prefetched: dict[str, asyncio.Task[ScrapedContent | None]] = {}
+        self._prefetch_count: int = 0
+        self._arxiv_loads: set[asyncio.Task[dict[str, ArxivPaper | None]]] = set()
         self.scraper_key = scraper_key
         self.logger = get_logger_with_prefix(__name__, tool_name=__name__, session_id=session_id)
 
     async def close(self) -> None:
         """
-        Close the async client
+        Discard pages scraped speculatively but never asked for, the shared client stays open
         """
-        if self.async_client is not None:
-            await self.async_client.aclose()
+        pending = [task for task in self._prefetched.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if self._prefetched:
+            self.logger.info(f"Discarded {len(self._prefetched)} speculatively scraped pages")
+        self._prefetched.clear()
 
     async def run(self) -> list[ScrapedContent]:
         """
         Extracts the content from the links
         """
-        contents = await asyncio.gather(*(self.scrape_data_from_url(url) for url in self.urls))
+        # Spread the crawl over domains so one slow or prolific site can't take the whole quota
+        urls = interleave_by_domain(self.urls)
+        self._load_arxiv(urls)
+        if settings.SCRAPER_EARLY_STOP:
+            contents = await self._scrape_first(urls)
+        else:
+            contents = await gather_within(*(self.scrape_data_from_url(url) for url in urls))
         res = [content for content in contents if content is not None]
+
+        if page_cache is not None:
+            stats = page_cache.stats
+            self.logger.info(f"Page cache hit rate {stats.hit_rate:.0%}, {stats.bytes_saved} bytes saved")
+
         return res
 
+    async def _scrape_first(self, urls: list[str]) -> list[ScrapedContent | None]:
+        """
+        Scrape the urls in order, SCRAPER_HEDGE_FACTOR times as many at once as pages are wanted, and cancel the
+        scrapes still in flight once max_scraped_content pages are in or the deadline has passed.
+        """
+        window = max(1, math.ceil(self._max_scraped_content * settings.SCRAPER_HEDGE_FACTOR))
+        contents: list[ScrapedContent | None] = [None] * len(urls)
+        queue = iter(enumerate(urls))
+        running: dict[asyncio.Task[ScrapedContent | None], int] = {}
+
+        async with asyncio.TaskGroup() as group:
+
+            def launch() -> None:
+                while len(running) < window and self._content_count < self._max_scraped_content:
+                    if (item := next(queue, None)) is None:
+                        return
+                    i, url = item
+                    running[group.create_task(self.scrape_data_from_url(url))] = i
+
+            launch()
+            while running:
+                done, _ = await asyncio.wait(running, timeout=time_remaining(), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.logger.info(f"Deadline reached, cancelling {len(running)} scrapes")
+                    break
+
+                for task in done:
+                    contents[running.pop(task)] = task.result()
+
+                if self._content_count >= self._max_scraped_content:
+                    if running:
+                        self.logger.info(f"Scraped {self._content_count} pages, cancelling {len(running)} scrapes")
+                    break
+                launch()
+
+            for task in running:
+                task.cancel()
+
+        return contents
+
+    def prefetch(self, urls: list[str]) -> None:
+        """
+        Start scraping pages that may be asked for later, up to SCRAPER_SPECULATIVE_MAX_PAGES per runner.
+
+        `scrape_data_from_url` picks up the result, pages that are never asked for are discarded by `close`.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url not in self._prefetched]
+        urls = urls[: max(0, settings.SCRAPER_SPECULATIVE_MAX_PAGES - self._prefetch_count)]
+
+        self._load_arxiv(urls)
+        for url in urls:
+            task = asyncio.create_task(self._scrape(url))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._prefetched[url] = task
+            self._prefetch_count += 1
+
+    def _load_arxiv(self, urls: list[str]) -> None:
+        """Fetch the arXiv papers among the urls in one API call, their scrapes wait for it instead of each calling"""
+        ids = [paper_id for url in urls if self.get_scraper(url) is ArxivScraper and (paper_id := arxiv_id(url))]
+        if ids:
+            task = asyncio.create_task(arxiv_papers.load(self.async_client, ids))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._arxiv_loads.add(task)
+            task.add_done_callback(self._arxiv_loads.discard)
+
     async def scrape_data_from_url(self, url: str) -> ScrapedContent | None:
         """
         Extracts the data from the link with logging
@@ -81,20 +176,14 @@ class ScraperRunner(EventEmitter):
             self.logger.info("Max scraped content exceeded!")
             return None
 
-        try:
-            scraper_cls: type[AsyncScraper] = self.get_scraper(url)
-            scraper = scraper_cls()
-
-            # Get scraper name
-            scraper_name = scraper.__class__.__name__
-            self.logger.info(f"=== Using {scraper_name} ===")
+        domain = domain_of(url)
+        if self._domain_counts.get(domain, 0) >= settings.SCRAPER_MAX_PAGES_PER_DOMAIN:
+            self.logger.info(f"Max scraped content for {domain} exceeded, skipping {url}")
+            return None
 
-            # Get content
-            async with task_pool.throttle():
-                scraped_content: ScrapedContent | None = await asyncio.wait_for(
-                    fut=cast(AsyncScraper, scraper).ascrape(link=url, client=self.async_client),
-                    timeout=settings.SCRAPER_TIMEOUT,
-                )
+        try:
+            prefetched = self._prefetched.pop(url, None)
+            scraped_content = await prefetched if prefetched is not None else await self._scrape(url)
 
             if scraped_content is None:
                 self.logger.warning(f"No scraped result for {url}")
@@ -111,11 +200,18 @@ class ScraperRunner(EventEmitter):
             self.logger.info(f"URL: {url}")
             self.logger.info("=" * 50)
 
-            await self._emit(TrajectoryEvent(title="Added source", content=url))
-
             async with self._counter_lock:
+                if self._content_count >= self._max_scraped_content:
+                    self.logger.info(f"Max scraped content exceeded, dropping {url}")
+                    return None
+                if self._domain_counts.get(domain, 0) >= settings.SCRAPER_MAX_PAGES_PER_DOMAIN:
+                    self.logger.info(f"Max scraped content for {domain} exceeded, dropping {url}")
+                    return None
+                self._domain_counts[domain] = self._domain_counts.get(domain, 0) + 1
                 self._content_count += 1
 
+            await self._emit(TrajectoryEvent(title="Added source", content=url))
+
             return scraped_content
 
         except TimeoutError as e:
@@ -126,6 +222,46 @@ class ScraperRunner(EventEmitter):
             self.logger.error(f"Error processing {url}: {e!s}")
             return None
 
+    async def _scrape(self, url: str) -> ScrapedContent | None:
+        scraper_cls: type[AsyncScraper] = self.get_scraper(url)
+        scraper = scraper_cls()
+
+        # Get scraper name
+        scraper_name = scraper.__class__.__name__
+        self.logger.info(f"=== Using {scraper_name} ===")
+
+        # Get content, pages fetched recently by any session come from the cache
+        cached = await page_cache.lookup(url) if page_cache is not None else None
+        if page_cache is not None and cached is not None and cached.is_fresh():
+            return page_cache.hit(url, cached)
+
+        def scrape() -> Awaitable[ScrapedContent | None]:
+            return asyncio.wait_for(
+                fut=page_cache.scrape(scraper, url, self.async_client, cached)
+                if page_cache is not None
+                else scraper.ascrape(link=url, client=self.async_client),
+                timeout=settings.SCRAPER_TIMEOUT,
+            )
+
+        if scraper.api_backed:
+            # API lookups are batched across the run, waiting for host slots would split the batch
+            return await scrape()
+
+        delay = (
+            await asyncio.wait_for(
+                crawl_delay(self.async_client, url, UserAgent().user_agent), timeout=settings.SCRAPER_TIMEOUT
+            )
+            if settings.CHECK_ROBOTS_TXT
+            else None
+        )
+        async with (
+            host_scheduler.slot(domain_of(url), crawl_delay=delay),
+            task_pool.throttle(priority=Priority.BACKGROUND, site="scrape"),
+        ):
+            scraped_content = await scrape()
+
+        return scraped_content
+
     def get_scraper(
         self,
         link: str,
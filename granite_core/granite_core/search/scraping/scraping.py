@@ -11,6 +11,7 @@
 #     http://www.apache.org/licenses/LICENSE-2.0
 #
 # Changes made:
+# - Reuse a runner that has started scraping speculatively
 
 
 from colorama import Fore, Style
@@ -31,13 +32,16 @@ async def scrape_search_results(
     session_id: str = "",
     emitter: EventEmitter | None = None,
     max_scraped_content: int = 10,
+    runner: ScraperRunner | None = None,
 ) -> list[ScrapedSearchResult]:
+    """Scrape the search results, with `runner` if given, which the caller created with its prefetches and closes"""
     url_map = {s.url: s for s in search_results}
 
     scraped_contents: list[ScrapedContent] = []
+    scraper = runner or ScraperRunner([], scraper_key, session_id, max_scraped_content)
 
     try:
-        scraper = ScraperRunner(list(url_map.keys()), scraper_key, session_id, max_scraped_content)
+        scraper.urls = list(url_map.keys())
         if emitter is not None:
             emitter.forward_events_from(scraper)
 
@@ -46,7 +50,8 @@ async def scrape_search_results(
     except Exception:
         logger.exception(f"{Fore.RED}Error in scrape_urls: {Style.RESET_ALL}")
     finally:
-        await scraper.close()
+        if runner is None:
+            await scraper.close()
 
     return [
         ScrapedSearchResult(
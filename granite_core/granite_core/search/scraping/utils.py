@@ -11,6 +11,8 @@
 #     http://www.apache.org/licenses/LICENSE-2.0
 #
 # Changes made:
+# - Picklable HTML extraction entry point
+# - Stop text extraction once the character budget is met
 
 import hashlib
 import re
@@ -148,9 +150,26 @@ def clean_soup(soup: BeautifulSoup) -> BeautifulSoup:
     return soup
 
 
-def get_text_from_soup(soup: BeautifulSoup) -> str:
-    """Get the relevant text from the soup with improved filtering"""
-    text = soup.get_text(strip=True, separator=" ")
+def get_text_from_soup(soup: BeautifulSoup, max_chars: int | None = None) -> str:
+    """Get the relevant text from the soup with improved filtering, stopping after about `max_chars`"""
+    if max_chars is None:
+        text = soup.get_text(strip=True, separator=" ")
+    else:
+        parts: list[str] = []
+        size = 0
+        for string in soup.stripped_strings:
+            parts.append(string)
+            size += len(string) + 1
+            if size > max_chars:
+                break
+        text = " ".join(parts)
     # Remove excess whitespace
     text = re.sub(r"\s{2,}", " ", text)
     return text
+
+
+def extract_html(html: bytes, encoding: str | None = None, max_chars: int | None = None) -> tuple[str, str]:
+    """Parse and clean an HTML page, returning its (text, title), runs in the CPU pool"""
+    soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+    soup = clean_soup(soup)
+    return get_text_from_soup(soup, max_chars), str(extract_title(soup))
@@ -24,6 +24,7 @@ logger = get_logger(__name__)
 
 
 class WikipediaScraper(AsyncScraper):
+    api_backed = True
     wikipedia_api_url = "https://en.wikipedia.org/w/api.php"
 
     async def ascrape(self, link: str, client: AsyncClient) -> ScrapedContent | None:
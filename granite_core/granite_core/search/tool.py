@@ -10,51 +10,87 @@ from langchain_core.documents import Document
 
 from granite_core.config import settings
 from granite_core.logging import get_logger_with_prefix
+from granite_core.memo import structured_memo
 from granite_core.search.engines.factory import SearchEngineFactory
 from granite_core.search.filter import SearchResultsFilter
 from granite_core.search.mixins import ScrapedSearchResultsMixin, SearchResultsMixin
 from granite_core.search.prompts import SearchPrompts
 from granite_core.search.scraping import scrape_search_results
+from granite_core.search.scraping.runner import ScraperRunner
 from granite_core.search.types import SearchQueriesSchema, SearchResult, StandaloneQuerySchema
 from granite_core.search.vector_store.factory import VectorStoreWrapperFactory
-from granite_core.work import chat_pool, task_pool
+from granite_core.work import (
+    Priority,
+    WorkSession,
+    chat_pool,
+    deadline,
+    deadline_stage,
+    gather_within,
+    task_pool,
+    work_session,
+)
 
 
 class SearchTool(SearchResultsMixin, ScrapedSearchResultsMixin):
-    def __init__(self, chat_model: ChatModel, session_id: str, *args: Any, **kwargs: Any) -> None:
+    def __init__(self, chat_model: ChatModel, session_id: str, memoize: bool = True, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.chat_model = chat_model
+        self.memoize = memoize
         self.vector_store = VectorStoreWrapperFactory.create()
 
-        self.llmaaj_search_filter = SearchResultsFilter(chat_model=self.chat_model, session_id=session_id)
+        self.llmaaj_search_filter = SearchResultsFilter(
+            chat_model=self.chat_model, session_id=session_id, memoize=memoize
+        )
 
         self.logger = get_logger_with_prefix(__name__, "SearchTool", session_id)
         self.session_id = session_id
+        self._scraper: ScraperRunner | None = None
 
     async def search(self, messages: list[Message]) -> list[Document]:
-        # Generate contextualized search queries
-
-        search_queries, standalone_msg = await asyncio.gather(
-            self._generate_search_queries(messages), self._generate_standalone(messages)
-        )
-
-        self.logger.info(f'Searching with queries => "{search_queries}"')
-
-        # Perform search
-        await self._perform_web_search(search_queries, max_results=settings.SEARCH_MAX_SEARCH_RESULTS_PER_STEP)
-        # Scraping
-        await self._browse_urls(self.search_results)
-
-        # Load scraped context into vector store
-        await self.vector_store.load(self.scraped_search_results)
-
-        self.logger.info(f'Searching for context => "{standalone_msg}"')
+        with (
+            work_session(WorkSession(session_id=self.session_id, agent_type="search")),
+            deadline(settings.SEARCH_DEADLINE or None),
+        ):
+            # Generate contextualized search queries
+
+            search_queries, standalone_msg = await asyncio.gather(
+                self._generate_search_queries(messages), self._generate_standalone(messages)
+            )
 
-        docs: list[Document] = await self.vector_store.asimilarity_search(
-            query=standalone_msg, k=settings.SEARCH_MAX_DOCS_PER_STEP
-        )
+            self.logger.info(f'Searching with queries => "{search_queries}"')
+
+            # Results start scraping as soon as they are found, while they are being filtered
+            if settings.SCRAPER_SPECULATIVE:
+                self._scraper = ScraperRunner(
+                    [], "bs", self.session_id, max_scraped_content=settings.SEARCH_MAX_SCRAPED_CONTENT
+                )
+
+            # Each stage gets a share of the time left and continues with partial results once it runs out
+            try:
+                # Perform search
+                with deadline_stage(0.4):
+                    await self._perform_web_search(
+                        search_queries, max_results=settings.SEARCH_MAX_SEARCH_RESULTS_PER_STEP
+                    )
+                # Scraping
+                with deadline_stage(0.7):
+                    await self._browse_urls(self.search_results)
+            finally:
+                if self._scraper is not None:
+                    await self._scraper.close()
+                    self._scraper = None
+
+            # Load scraped context into vector store
+            with deadline_stage(0.9):
+                await self.vector_store.load(self.scraped_search_results)
+
+            self.logger.info(f'Searching for context => "{standalone_msg}"')
+
+            docs: list[Document] = await self.vector_store.asimilarity_search(
+                query=standalone_msg, k=settings.SEARCH_MAX_DOCS_PER_STEP
+            )
 
-        return docs
+            return docs
 
     async def _browse_urls(self, search_results: list[SearchResult]) -> None:
         scraped_results = await scrape_search_results(
@@ -62,6 +98,7 @@ class SearchTool(SearchResultsMixin, ScrapedSearchResultsMixin):
             scraper_key="bs",
             session_id=self.session_id,
             max_scraped_content=settings.SEARCH_MAX_SCRAPED_CONTENT,
+            runner=self._scraper,
         )
         self.add_scraped_search_results(scraped_results)
 
@@ -70,7 +107,7 @@ class SearchTool(SearchResultsMixin, ScrapedSearchResultsMixin):
             messages, max_queries=settings.SEARCH_MAX_SEARCH_QUERIES_PER_STEP
         )
 
-        async with chat_pool.throttle():
+        async with chat_pool.throttle(priority=Priority.PLANNING, site="search_queries"):
             response = await self.chat_model.run(
                 [UserMessage(content=search_query_prompt)],
                 response_format=SearchQueriesSchema,
@@ -83,27 +120,32 @@ class SearchTool(SearchResultsMixin, ScrapedSearchResultsMixin):
     async def _generate_standalone(self, messages: list[Message]) -> str:
         standalone_prompt = SearchPrompts.generate_standalone_query(messages)
 
-        async with chat_pool.throttle():
-            response = await self.chat_model.run(
-                [UserMessage(content=standalone_prompt)],
-                response_format=StandaloneQuerySchema,
-                max_retries=settings.MAX_RETRIES,
-            )
+        response = await structured_memo.run(
+            self.chat_model,
+            [UserMessage(content=standalone_prompt)],
+            response_format=StandaloneQuerySchema,
+            memoize=self.memoize,
+            throttle=lambda: chat_pool.throttle(priority=Priority.PLANNING, site="standalone_query"),
+            max_retries=settings.MAX_RETRIES,
+        )
 
         assert isinstance(response.output_structured, StandaloneQuerySchema)
         return response.output_structured.query
 
     async def _perform_web_search(self, queries: list[str], max_results: int = 3) -> None:
-        await asyncio.gather(*(self._search_query(q, max_results) for q in queries))
+        await gather_within(*(self._search_query(q, max_results) for q in queries))
 
     async def _search_query(self, query: str, max_results: int = 3) -> None:
         try:
             engine = SearchEngineFactory.create()
 
             # search engines do not throttle internally
-            async with task_pool.throttle():
+            async with task_pool.throttle(priority=Priority.PLANNING, site="search_engine"):
                 results = await engine.search(query=query, max_results=max_results)
 
+            if self._scraper is not None:
+                self._scraper.prefetch([r.url for r in results])
+
             # llmaaj filtering
             results = await self.llmaaj_search_filter.filter(query=query, results=results)
 
@@ -28,5 +28,14 @@ class SearchResultRelevanceSchema(BaseModel):
     is_relevant: bool = Field(description="Flag indicating if the search result is likely to be relevant.")
 
 
+class SearchResultVerdictSchema(BaseModel):
+    index: int = Field(description="The number of the search result.")
+    is_relevant: bool = Field(description="Flag indicating if the search result is likely to be relevant.")
+
+
+class SearchResultsRelevanceSchema(BaseModel):
+    verdicts: list[SearchResultVerdictSchema] = Field(description="One verdict for each search result.")
+
+
 class StandaloneQuerySchema(BaseModel):
     query: str = Field(description="Standalone query that clearly and concisely reflects the user's intent.")
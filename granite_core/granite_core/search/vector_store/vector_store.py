@@ -13,10 +13,14 @@
 # Changes made:
 # - Configurable chunk size
 # - Add document index
+# - Split documents in the CPU pool
+# - Stop embedding at the deadline
+# - Throttle embedding batches of providers without their own worker pool
 
 
 import asyncio
-from functools import partial
+import math
+from functools import cache
 from typing import Any
 
 from langchain_classic.retrievers import ContextualCompressionRetriever
@@ -24,11 +28,38 @@ from langchain_classic.retrievers.document_compressors import EmbeddingsFilter
 from langchain_classic.text_splitter import RecursiveCharacterTextSplitter
 from langchain_classic.vectorstores import VectorStore
 from langchain_core.documents import Document
-from transformers import AutoTokenizer
+from transformers import AutoTokenizer, PreTrainedTokenizerBase
 
 from granite_core.config import settings
 from granite_core.search.scraping.types import ScrapedSearchResult
-from granite_core.work import task_pool
+from granite_core.utils import batch
+from granite_core.work import Priority, cpu_pool, embeddings_pool, gather_within
+
+
+@cache
+def _load_tokenizer(name: str) -> PreTrainedTokenizerBase:
+    return AutoTokenizer.from_pretrained(name)  # nosec
+
+
+def split_documents(
+    documents: list[Document], chunk_size: int, chunk_overlap: int, tokenizer: str | None = None
+) -> list[Document]:
+    """
+    Split documents into smaller chunks, runs in the CPU pool so the tokenizer is passed by name
+    """
+    if tokenizer:
+        text_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+            tokenizer=_load_tokenizer(tokenizer),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+    else:
+        text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+
+    return text_splitter.split_documents(documents)
 
 
 class VectorStoreWrapper:
@@ -51,7 +82,21 @@ class VectorStoreWrapper:
         """
         langchain_documents = self._create_langchain_documents(content)
         splitted_documents = await self._a_split_documents(langchain_documents)
-        await self.vector_store.aadd_documents(splitted_documents)
+        # Embed in batches so the chunks embedded before the deadline are kept
+        await gather_within(
+            *(
+                self._add_documents(documents)
+                for documents in batch(splitted_documents, settings.MAX_EMBEDDINGS_PER_REQUEST)
+            )
+        )
+
+    async def _add_documents(self, documents: list[Document]) -> list[str]:
+        # watsonx embeddings take their slots from the embeddings pool themselves
+        if settings.EMBEDDINGS_PROVIDER == "watsonx":
+            return await self.vector_store.aadd_documents(documents)
+
+        async with embeddings_pool.throttle(priority=Priority.BACKGROUND, cost=len(documents), site="embeddings"):
+            return await self.vector_store.aadd_documents(documents)
 
     # TODO: subclass Document for better typing support
     def _create_langchain_documents(self, scraped_content: list[ScrapedSearchResult]) -> list[Document]:
@@ -70,39 +115,17 @@ class VectorStoreWrapper:
         ]
 
     async def _a_split_documents(self, documents: list[Document]) -> list[Document]:
-        split_docs: list[Document] = []
-        loop = asyncio.get_running_loop()
-
-        for doc in documents:
-            splitted = await asyncio.wait_for(
-                loop.run_in_executor(
-                    task_pool.executor,
-                    partial(self._split_documents, [doc]),
-                ),
-                timeout=None,
+        # Workers load the tokenizer by the hub ID or path the embeddings loaded it from, once per worker
+        tokenizer = getattr(self.tokenizer, "name_or_path", None) if self.tokenizer else None
+        # One call per worker rather than per document
+        size = max(1, math.ceil(len(documents) / max(1, cpu_pool.max_workers)))
+        splitted = await asyncio.gather(
+            *(
+                cpu_pool.run(split_documents, docs, self.chunk_size, self.chunk_overlap, tokenizer)
+                for docs in batch(documents, size)
             )
-            split_docs.extend(splitted)
-            await asyncio.sleep(0)
-
-        return split_docs
-
-    def _split_documents(self, documents: list[Document]) -> list[Document]:
-        """
-        Split documents into smaller chunks
-        """
-        if self.tokenizer:
-            text_splitter = RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
-                tokenizer=self.tokenizer,  # type: ignore
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap,
-            )
-        else:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap,
-            )
-
-        return text_splitter.split_documents(documents)
+        )
+        return [chunk for chunks in splitted for chunk in chunks]
 
     async def asimilarity_search(self, query: str, k: int, filter: dict[str, Any] | None = None) -> list[Document]:
         """Return query by vector store"""
@@ -21,7 +21,7 @@ from granite_core.events import (
 )
 from granite_core.logging import get_logger_with_prefix
 from granite_core.thinking.prompts import ThinkingPrompts
-from granite_core.work import chat_pool
+from granite_core.work import Priority, WorkSession, chat_pool, work_session
 
 
 class ThinkingTool(EventEmitter):
@@ -40,37 +40,38 @@ class ThinkingTool(EventEmitter):
         self.logger = get_logger_with_prefix(__name__, tool_name="Researcher", session_id=session_id)
 
     async def run(self) -> None:
-        thinking_tokens: list[str] = []
+        with work_session(WorkSession(session_id=self.session_id, agent_type="chat")):
+            thinking_tokens: list[str] = []
 
-        async with chat_pool.throttle():
-            async for event, _ in self.chat_model.run(
-                [
-                    SystemMessage(content=ThinkingPrompts.two_step_thinking_system_prompt()),
-                    *self.messages,
-                ],
-                stream=True,
-                max_retries=settings.MAX_RETRIES,
-            ):
-                if isinstance(event, ChatModelNewTokenEvent):
-                    content = event.value.get_text_content()
-                    thinking_tokens.append(content)
-                    await self._emit(ThinkEvent(text=content))
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="thinking"):
+                async for event, _ in self.chat_model.run(
+                    [
+                        SystemMessage(content=ThinkingPrompts.two_step_thinking_system_prompt()),
+                        *self.messages,
+                    ],
+                    stream=True,
+                    max_retries=settings.MAX_RETRIES,
+                ):
+                    if isinstance(event, ChatModelNewTokenEvent):
+                        content = event.value.get_text_content()
+                        thinking_tokens.append(content)
+                        await self._emit(ThinkEvent(text=content))
 
-        thinking_str = "".join(thinking_tokens)
+            thinking_str = "".join(thinking_tokens)
 
-        async with chat_pool.throttle():
-            async for event, _ in self.chat_model.run(
-                [
-                    SystemMessage(
-                        content=ThinkingPrompts.two_step_thinking_answer_system_prompt(thinking=thinking_str)
-                    ),
-                    *self.messages,
-                ],
-                stream=True,
-                max_retries=settings.MAX_RETRIES,
-            ):
-                if isinstance(event, ChatModelNewTokenEvent):
-                    content = event.value.get_text_content()
-                    await self._emit(TextEvent(text=content))
-                elif isinstance(event, ChatModelSuccessEvent):
-                    await self._emit(PassThroughEvent(event=event))
+            async with chat_pool.throttle(priority=Priority.INTERACTIVE, site="thinking"):
+                async for event, _ in self.chat_model.run(
+                    [
+                        SystemMessage(
+                            content=ThinkingPrompts.two_step_thinking_answer_system_prompt(thinking=thinking_str)
+                        ),
+                        *self.messages,
+                    ],
+                    stream=True,
+                    max_retries=settings.MAX_RETRIES,
+                ):
+                    if isinstance(event, ChatModelNewTokenEvent):
+                        content = event.value.get_text_content()
+                        await self._emit(TextEvent(text=content))
+                    elif isinstance(event, ChatModelSuccessEvent):
+                        await self._emit(PassThroughEvent(event=event))
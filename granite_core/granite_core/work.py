@@ -14,17 +14,426 @@
 # - Allow max_workers to default via None
 # - Configure semaphore via max_concurrent_tasks
 # - Rate limiter
+# - Priority classes with aging
+# - Weighted fair share between sessions
+# - Adaptive (AIMD) concurrency
+# - Cost weighted rate limiting
+# - Queue wait and service time metrics
+# - Process pool for CPU bound work
+# - Deadline budgets
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from contextlib import asynccontextmanager
+import importlib
+import math
+import multiprocessing
+import re
+import time
+from collections import Counter, OrderedDict, deque
+from collections.abc import Callable, Coroutine, Generator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager, suppress
+from contextvars import ContextVar
+from enum import IntEnum
+from functools import partial
+from typing import Any, Literal, NamedTuple, TypeVar
 
+import httpx
 from aiolimiter import AsyncLimiter
+from pydantic import BaseModel, ConfigDict
 
 from granite_core.logging import get_logger, settings
+from granite_core.metrics import PoolMetrics
 
 logger = get_logger(__name__)
 
+AgentType = Literal["chat", "search", "research"]
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Scheduling class of work submitted to a WorkerPool, lower values are served first"""
+
+    INTERACTIVE = 0  # user facing streamed responses
+    PLANNING = 1  # short calls on the critical path of a turn e.g. query generation, guardrails
+    BACKGROUND = 2  # bulk work e.g. search result filtering, scraping, citations
+
+
+class WorkSession(BaseModel):
+    """Identifies the session and agent type that work submitted to a WorkerPool belongs to"""
+
+    model_config = ConfigDict(frozen=True)
+
+    session_id: str
+    agent_type: AgentType = "chat"
+
+    @property
+    def weight(self) -> float:
+        """Fair share weight of the session, sessions with higher weights are granted slots more often"""
+        match self.agent_type:
+            case "search":
+                return settings.SESSION_WEIGHT_SEARCH
+            case "research":
+                return settings.SESSION_WEIGHT_RESEARCH
+            case _:
+                return settings.SESSION_WEIGHT_CHAT
+
+
+_current_work_session: ContextVar[WorkSession | None] = ContextVar("work_session", default=None)
+
+
+@contextmanager
+def work_session(session: WorkSession) -> Generator[None, None, None]:
+    """
+    Attribute all pool usage within the block, including tasks spawned from it, to a session.
+
+    Nested blocks keep the outermost session e.g. a SearchTool run as part of research is accounted as research.
+    """
+    if _current_work_session.get() is not None:
+        yield
+        return
+
+    token = _current_work_session.set(session)
+    try:
+        yield
+    finally:
+        _current_work_session.reset(token)
+
+
+def current_work_session() -> WorkSession | None:
+    return _current_work_session.get()
+
+
+_current_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Generator[None, None, None]:
+    """
+    Bound all work within the block, including tasks spawned from it, to `seconds` from now.
+
+    Nested deadlines can only shorten the enclosing one, `None` leaves it unchanged.
+    """
+    if seconds is None:
+        yield
+        return
+
+    expires_at = time.monotonic() + max(0.0, seconds)
+    outer = _current_deadline.get()
+    token = _current_deadline.set(expires_at if outer is None else min(outer, expires_at))
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def deadline_stage(share: float) -> Generator[None, None, None]:
+    """Give a pipeline stage a share of the time remaining, no-op without a deadline"""
+    remaining = time_remaining()
+    with deadline(None if remaining is None else remaining * share):
+        yield
+
+
+def time_remaining() -> float | None:
+    """Seconds left before the current deadline, None if there is no deadline"""
+    expires_at = _current_deadline.get()
+    return None if expires_at is None else max(0.0, expires_at - time.monotonic())
+
+
+async def gather_within(*coros: Coroutine[Any, Any, T | None]) -> list[T | None]:
+    """
+    Like asyncio.gather, but stops waiting once the current deadline has passed.
+
+    Unfinished tasks are cancelled and give None, so callers carry on with the results that made it. Tasks run in a
+    task group, if the caller is cancelled (e.g. the client went away) they are cancelled with it and have released
+    their pool slots by the time this returns.
+    """
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(coro) for coro in coros]
+            if not tasks:
+                return []
+
+            _, pending = await asyncio.wait(tasks, timeout=time_remaining())
+            if pending:
+                logger.info(f"Deadline reached, continuing with {len(tasks) - len(pending)} of {len(tasks)} results")
+                for task in pending:
+                    task.cancel()
+
+    except ExceptionGroup as e:
+        # Surface the first failure as asyncio.gather does, the remaining tasks have been cancelled
+        raise e.exceptions[0]  # noqa: B904
+
+    return [None if task.cancelled() else task.result() for task in tasks]
+
+
+class _Waiter(NamedTuple):
+    session_id: str | None
+    weight: float
+    enqueued_at: float
+    future: asyncio.Future[None]
+
+
+class PrioritySemaphore:
+    """
+    Semaphore that hands out free slots by priority class and shares them fairly between sessions.
+
+    Within a priority class waiters are queued per session and served by weighted deficit round robin.
+    A waiter's class is promoted by one for every `aging_period` seconds it has waited so that background
+    work cannot be starved indefinitely. A single session never holds more than `max_session_slots` slots,
+    work without a session is not capped.
+    """
+
+    def __init__(self, value: int, aging_period: float = 0, max_session_slots: int | None = None) -> None:
+        self._value = value
+        self._in_use = 0
+        self._aging_period = aging_period
+        self._max_session_slots = max_session_slots or value
+        self._session_in_use: dict[str | None, int] = {}
+        self._waiters: dict[Priority, OrderedDict[str | None, deque[_Waiter]]] = {p: OrderedDict() for p in Priority}
+        self._deficits: dict[tuple[Priority, str | None], float] = {}
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    @property
+    def limit(self) -> int:
+        return self._value
+
+    def resize(self, value: int, max_session_slots: int | None = None) -> None:
+        """Change the number of slots, tasks holding slots above a reduced limit finish normally"""
+        self._value = value
+        self._max_session_slots = max_session_slots or value
+        self._wake_up_next()
+
+    def session_in_use(self, session_id: str | None) -> int:
+        return self._session_in_use.get(session_id, 0)
+
+    def queue_depth(self, priority: Priority) -> int:
+        return sum(len(waiters) for waiters in self._waiters[priority].values())
+
+    def is_idle(self, session_id: str | None) -> bool:
+        """True if the session neither holds nor waits for a slot"""
+        return self.session_in_use(session_id) == 0 and not any(session_id in q for q in self._waiters.values())
+
+    def locked(self) -> bool:
+        return self._in_use >= self._value
+
+    async def acquire(
+        self, priority: Priority = Priority.PLANNING, session_id: str | None = None, weight: float = 1
+    ) -> None:
+        if not self.locked() and not self._at_capacity(session_id) and not any(self._waiters.values()):
+            self._grant(session_id)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(session_id, weight, loop.time(), loop.create_future())
+        self._waiters[priority].setdefault(session_id, deque()).append(waiter)
+
+        # Free slots may be held back from sessions at capacity, let the scheduler decide
+        if not self.locked():
+            self._wake_up_next()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted just before cancellation, hand it on
+                self.release(session_id)
+            else:
+                self._remove_waiter(priority, waiter)
+            raise
+
+    def release(self, session_id: str | None = None) -> None:
+        self._in_use -= 1
+        self._session_in_use[session_id] -= 1
+        if self._session_in_use[session_id] == 0:
+            del self._session_in_use[session_id]
+        self._wake_up_next()
+
+    def _grant(self, session_id: str | None) -> None:
+        self._in_use += 1
+        self._session_in_use[session_id] = self._session_in_use.get(session_id, 0) + 1
+
+    def _at_capacity(self, session_id: str | None) -> bool:
+        return session_id is not None and self.session_in_use(session_id) >= self._max_session_slots
+
+    def _remove_waiter(self, priority: Priority, waiter: _Waiter) -> None:
+        waiters = self._waiters[priority].get(waiter.session_id)
+        if waiters is None:
+            return
+        with suppress(ValueError):
+            waiters.remove(waiter)
+        if not waiters:
+            del self._waiters[priority][waiter.session_id]
+            self._deficits.pop((priority, waiter.session_id), None)
+
+    def _wake_up_next(self) -> None:
+        while not self.locked():
+            waiter = self._pop_next_waiter()
+            if waiter is None:
+                return
+            if not waiter.future.done():
+                self._grant(waiter.session_id)
+                waiter.future.set_result(None)
+
+    def _pop_next_waiter(self) -> _Waiter | None:
+        now = asyncio.get_running_loop().time()
+        selected: Priority | None = None
+        selected_key: tuple[int, float] | None = None
+
+        for priority, queues in self._waiters.items():
+            heads = [w[0].enqueued_at for s, w in queues.items() if not self._at_capacity(s)]
+            if not heads:
+                continue
+
+            enqueued_at = min(heads)
+            promotion = int((now - enqueued_at) / self._aging_period) if self._aging_period > 0 else 0
+            key = (priority - promotion, enqueued_at)
+
+            if selected_key is None or key < selected_key:
+                selected, selected_key = priority, key
+
+        if selected is None:
+            return None
+
+        return self._pop_fair(selected)
+
+    def _pop_fair(self, priority: Priority) -> _Waiter:
+        """Deficit round robin over the sessions queued in a priority class, at least one must be eligible"""
+        queues = self._waiters[priority]
+
+        while True:
+            session_id, waiters = next(iter(queues.items()))
+
+            if self._at_capacity(session_id):
+                queues.move_to_end(session_id)
+                continue
+
+            key = (priority, session_id)
+            deficit = self._deficits.get(key, 0.0)
+            if deficit < 1:
+                deficit += waiters[0].weight
+
+            if deficit < 1:
+                # Not enough credit yet, try the next session
+                self._deficits[key] = deficit
+                queues.move_to_end(session_id)
+                continue
+
+            waiter = waiters.popleft()
+            deficit -= 1
+
+            if not waiters:
+                del queues[session_id]
+                self._deficits.pop(key, None)
+            else:
+                self._deficits[key] = deficit
+                if deficit < 1:
+                    queues.move_to_end(session_id)
+
+            return waiter
+
+
+class AdaptiveConcurrency:
+    """
+    Additive increase / multiplicative decrease (AIMD) of a concurrency limit.
+
+    The limit grows by roughly one slot per `limit` successful calls while the pool is saturated and latency
+    stays within target. Rate limiting (HTTP 429), timeouts and latency above target shrink it by
+    `decrease_factor`, at most once per `cooldown` seconds so that a burst of failures counts as one signal.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target: float,
+        decrease_factor: float = 0.5,
+        cooldown: float = 5,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._last_decrease = -math.inf
+        self.latency_ewma: float | None = None
+        self.last_signal: str | None = None
+        self.signals: Counter[str] = Counter()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_success(self, latency: float | None, saturated: bool) -> None:
+        if latency is not None:
+            self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+            if latency > self.latency_target:
+                self._decrease("latency")
+                return
+
+        self.signals["ok"] += 1
+
+        if saturated:
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+    def on_error(self, error: BaseException) -> None:
+        signal = overload_signal(error)
+        if signal is not None:
+            self._decrease(signal)
+
+    def _decrease(self, signal: str) -> None:
+        self.signals[signal] += 1
+        self.last_signal = signal
+
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+
+        self._last_decrease = now
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "latency_ewma": self.latency_ewma,
+            "last_signal": self.last_signal,
+            "signals": dict(self.signals),
+        }
+
+
+def overload_signal(error: BaseException) -> str | None:
+    """Classify an error as a backend overload signal: 'throttled' for HTTP 429, 'timeout' or None"""
+    current: BaseException | None = error
+    seen: set[int] = set()
+
+    # Provider errors are frequently wrapped, inspect the whole chain
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+
+        if isinstance(current, TimeoutError | httpx.TimeoutException):
+            return "timeout"
+
+        status_code = getattr(current, "status_code", None)
+        response = getattr(current, "response", None)
+        if status_code is None and isinstance(response, httpx.Response):
+            status_code = response.status_code
+
+        message = str(current).lower()
+        if status_code == 429 or re.search(r"\b429\b", message) or "too many requests" in message:
+            return "throttled"
+
+        current = current.__cause__ or current.__context__
+
+    return None
+
 
 class WorkerPool:
     def __init__(
@@ -34,47 +443,234 @@ class WorkerPool:
         max_concurrent_tasks: int = 8,
         rate_limit: int = 8,
         rate_period: float = 2,
+        aging_period: float = 0,
+        session_share: float = 1,
+        adaptive: AdaptiveConcurrency | None = None,
     ) -> None:
         self.name = name
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
+        self.adaptive = adaptive
+        self._session_share = session_share
+
+        if adaptive is not None:
+            max_concurrent_tasks = adaptive.limit
+
+        self.semaphore = PrioritySemaphore(
+            max_concurrent_tasks,
+            aging_period=aging_period,
+            max_session_slots=self._max_session_slots(max_concurrent_tasks),
+        )
         self.rate_limiter = AsyncLimiter(rate_limit, rate_period)
-        self._semaphore_acquired_count = 0
-        self._rate_limiter_acquired_count = 0
-        self._counter_lock = asyncio.Lock()
+        self._session_rate = max(1.0, rate_limit * session_share)
+        self._rate_period = rate_period
+        self._session_rate_limiters: dict[str, AsyncLimiter] = {}
+        self.metrics = PoolMetrics(name, gauges=self._gauges)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self.semaphore.limit
+
+    def _max_session_slots(self, limit: int) -> int:
+        return max(1, math.ceil(limit * self._session_share))
+
+    def _adapt(self, error: BaseException | None = None, latency: float | None = None) -> None:
+        if self.adaptive is None:
+            return
+
+        previous = self.semaphore.limit
+
+        if error is not None:
+            self.adaptive.on_error(error)
+        else:
+            self.adaptive.on_success(latency, saturated=self.semaphore.in_use >= previous)
+
+        if self.adaptive.limit != previous:
+            reason = self.adaptive.last_signal if self.adaptive.limit < previous else "ok"
+            logger.info(
+                f"[{self.name}] Concurrency limit {previous} -> {self.adaptive.limit} ({reason}), "
+                f"signals={dict(self.adaptive.signals)}"
+            )
+            self.semaphore.resize(self.adaptive.limit, self._max_session_slots(self.adaptive.limit))
+
+    def queue_depths(self) -> dict[str, int]:
+        """Number of tasks waiting for a slot, per priority class"""
+        return {p.name.lower(): self.semaphore.queue_depth(p) for p in Priority}
+
+    def _gauges(self) -> dict[str, Any]:
+        gauges: dict[str, Any] = {"concurrency_limit": self.concurrency_limit, "queued": self.queue_depths()}
+        if self.adaptive is not None:
+            gauges["adaptive"] = self.adaptive.snapshot()
+        return gauges
+
+    def _session_rate_limiter(self, session_id: str) -> AsyncLimiter:
+        if session_id not in self._session_rate_limiters:
+            self._session_rate_limiters[session_id] = AsyncLimiter(self._session_rate, self._rate_period)
+        return self._session_rate_limiters[session_id]
 
     @asynccontextmanager
-    async def throttle(self):  # noqa: ANN201
+    async def throttle(  # noqa: ANN201
+        self,
+        priority: Priority = Priority.PLANNING,
+        session: WorkSession | None = None,
+        cost: float = 1,
+        site: str = "other",
+    ):
+        """
+        Hold a slot and spend `cost` units of the rate budget (e.g. the number of items in a batch request).
+
+        `site` labels the metrics of the call site e.g. filter, report or citations.
+        """
+        session = session or current_work_session()
+        session_id = session.session_id if session else None
+        metrics = self.metrics.site(site)
+
         logger.debug(
-            f"[{self.name}] Before acquire - semaphore={self._semaphore_acquired_count}, "
-            f"rate_limiter={self._rate_limiter_acquired_count}"
+            f"[{self.name}] Before acquire ({site}, {priority.name.lower()}, {session_id}) - "
+            f"in_flight={self.metrics.in_flight}, queued={self.queue_depths()}"
         )
 
-        async with self.semaphore:
-            async with self._counter_lock:
-                self._semaphore_acquired_count += 1
+        queued = time.monotonic()
+        try:
+            await self.semaphore.acquire(priority, session_id=session_id, weight=session.weight if session else 1)
+        except asyncio.CancelledError:
+            metrics.outcomes["abandoned"] += 1
+            raise
+
+        acquired = time.monotonic()
+        metrics.semaphore_wait.observe(acquired - queued)
+        metrics.in_flight += 1
+        outcome = "abandoned"
+        try:
+            # Sessions are limited to their share of the rate budget
+            if session_id is not None:
+                await self._session_rate_limiter(session_id).acquire(min(cost, self._session_rate))
+
+            # A single request can never cost more than the whole budget
+            await self.rate_limiter.acquire(min(cost, self.rate_limiter.max_rate))
+
+            started = time.monotonic()
+            metrics.rate_limit_wait.observe(started - acquired)
+            logger.debug(f"[{self.name}] After acquire ({site}) - in_flight={self.metrics.in_flight}")
+
+            try:
+                yield
+
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                metrics.wasted_seconds += time.monotonic() - started
+                raise
+
+            except Exception as e:
+                outcome = "error"
+                self._adapt(error=e)
+                raise
 
-            async with self.rate_limiter:
-                async with self._counter_lock:
-                    self._rate_limiter_acquired_count += 1
+            else:
+                outcome = "ok"
+                # Streamed responses take as long as the output is, their duration says little about load
+                self._adapt(latency=None if priority == Priority.INTERACTIVE else time.monotonic() - started)
 
-                logger.debug(
-                    f"[{self.name}] After acquire - semaphore={self._semaphore_acquired_count}, "
-                    f"rate_limiter={self._rate_limiter_acquired_count}"
+            finally:
+                metrics.service_time.observe(time.monotonic() - started)
+
+        finally:
+            metrics.in_flight -= 1
+            metrics.outcomes[outcome] += 1
+            self.semaphore.release(session_id)
+            if session_id is not None and self.semaphore.is_idle(session_id):
+                self._session_rate_limiters.pop(session_id, None)
+
+            logger.debug(f"[{self.name}] After release ({site}, {outcome}) - in_flight={self.metrics.in_flight}")
+
+
+def _warm_up(modules: tuple[str, ...]) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+class CpuPool:
+    """
+    Runs CPU bound functions (parsing, splitting) in worker processes so they neither block the event loop nor
+    contend for the GIL. Functions and their arguments must be picklable, i.e. module level functions.
+
+    Falls back to threads when configured with no workers or when worker processes cannot be started.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 2,
+        warm_start: bool = True,
+        warm_up_modules: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.warm_start = warm_start
+        self.warm_up_modules = warm_up_modules
+        self.thread_executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=name)
+        self._process_executor: ProcessPoolExecutor | None = None
+        self._processes_unavailable = max_workers < 1
+
+    @property
+    def uses_processes(self) -> bool:
+        return not self._processes_unavailable
+
+    def _executor(self) -> ProcessPoolExecutor | None:
+        if self._processes_unavailable:
+            return None
+
+        if self._process_executor is None:
+            try:
+                # Fork, spawning would re-import the agent entry points which start servers at import time
+                self._process_executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("fork")
                 )
+            except (OSError, ValueError) as e:
+                self._fall_back(e)
+
+        return self._process_executor
+
+    def _fall_back(self, error: BaseException) -> None:
+        logger.warning(f"[{self.name}] Worker processes unavailable, running CPU bound work in threads: {error!r}")
+        self._processes_unavailable = True
+        self._discard_executor()
 
-                try:
-                    yield
+    def _discard_executor(self) -> None:
+        if self._process_executor is not None:
+            self._process_executor.shutdown(wait=False, cancel_futures=True)
+            self._process_executor = None
 
-                finally:
-                    async with self._counter_lock:
-                        self._rate_limiter_acquired_count -= 1
-                        self._semaphore_acquired_count -= 1
+    def start(self) -> None:
+        """Start the worker processes and import heavy modules before serving traffic, if warm start is enabled"""
+        if not self.warm_start or (executor := self._executor()) is None:
+            return
 
-                    logger.debug(
-                        f"[{self.name}] After release - semaphore={self._semaphore_acquired_count}, "
-                        f"rate_limiter={self._rate_limiter_acquired_count}"
-                    )
+        try:
+            # Start all workers while the process is still quiet, forking later copies whatever is in flight
+            for _ in range(self.max_workers):
+                executor.submit(_warm_up, self.warm_up_modules)
+        except (BrokenProcessPool, OSError) as e:
+            self._fall_back(e)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run `fn(*args)` in a worker process, or a thread if processes are unavailable"""
+        loop = asyncio.get_running_loop()
+
+        if (executor := self._executor()) is not None:
+            try:
+                return await loop.run_in_executor(executor, partial(fn, *args))
+            except BrokenProcessPool as e:
+                # A worker died (e.g. a native parser crashed), replace the pool and retry this task in a thread
+                logger.warning(f"[{self.name}] Worker process pool broken, restarting: {e!r}")
+                self._discard_executor()
+            except OSError as e:
+                self._fall_back(e)
+
+        return await loop.run_in_executor(self.thread_executor, partial(fn, *args))
+
+    def shutdown(self) -> None:
+        self._discard_executor()
+        self.thread_executor.shutdown(wait=False)
 
 
 # Control access to the chat backend
@@ -83,10 +679,30 @@ chat_pool = WorkerPool(
     max_concurrent_tasks=settings.MAX_CONCURRENT_INFERENCE_TASKS,
     rate_limit=settings.RATE_LIMIT_INFERENCE_TASKS,
     rate_period=settings.RATE_PERIOD_INFERENCE_TASKS,
+    aging_period=settings.PRIORITY_AGING_PERIOD,
+    session_share=settings.SESSION_MAX_SHARE,
+    adaptive=(
+        AdaptiveConcurrency(
+            initial=settings.MAX_CONCURRENT_INFERENCE_TASKS,
+            min_limit=settings.ADAPTIVE_MIN_CONCURRENT_INFERENCE_TASKS,
+            max_limit=settings.ADAPTIVE_MAX_CONCURRENT_INFERENCE_TASKS,
+            latency_target=settings.ADAPTIVE_LATENCY_TARGET,
+            decrease_factor=settings.ADAPTIVE_DECREASE_FACTOR,
+        )
+        if settings.ADAPTIVE_CONCURRENCY
+        else None
+    ),
 )
 
-# Control access to the embeddings backend, share with chat for now
-embeddings_pool = chat_pool
+# Control access to the embeddings backend, rate is counted in texts embedded
+embeddings_pool = WorkerPool(
+    name="embeddings",
+    max_concurrent_tasks=settings.MAX_CONCURRENT_EMBEDDINGS_TASKS,
+    rate_limit=settings.RATE_LIMIT_EMBEDDINGS_TASKS,
+    rate_period=settings.RATE_PERIOD_EMBEDDINGS_TASKS,
+    aging_period=settings.PRIORITY_AGING_PERIOD,
+    session_share=settings.SESSION_MAX_SHARE,
+)
 
 # General task control
 task_pool = WorkerPool(
@@ -94,4 +710,14 @@ task_pool = WorkerPool(
     max_concurrent_tasks=settings.MAX_CONCURRENT_TASKS,
     rate_limit=settings.RATE_LIMIT_TASKS,
     rate_period=settings.RATE_PERIOD_TASKS,
+    aging_period=settings.PRIORITY_AGING_PERIOD,
+    session_share=settings.SESSION_MAX_SHARE,
+)
+
+# CPU bound parsing, kept off the event loop
+cpu_pool = CpuPool(
+    name="cpu",
+    max_workers=settings.MAX_CPU_WORKERS,
+    warm_start=settings.CPU_POOL_WARM_START,
+    warm_up_modules=("bs4", "lxml", "langchain_classic.text_splitter", "docling_parse.pdf_parser"),
 )
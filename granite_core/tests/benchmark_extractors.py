@@ -0,0 +1,86 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compare the HTML text extractors on a corpus of pages, by speed and by overlap of the extracted text.
+
+    python tests/benchmark_extractors.py [--repeat 20] [--scale 1] [page.html ...]
+
+Pages default to tests/fixtures/pages. `--scale` repeats the body of each page to simulate large pages.
+"""
+
+import argparse
+import re
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from granite_core.search.scraping.readability import extract_main_content
+from granite_core.search.scraping.utils import extract_html
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pages"
+
+EXTRACTORS: dict[str, Callable[[bytes, str | None, int | None], tuple[str, str]]] = {
+    "beautifulsoup": extract_html,
+    "readability": extract_main_content,
+}
+
+
+def tokens(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def overlap(text: str, reference: str) -> tuple[float, float]:
+    """Share of the text's tokens found in the reference, and share of the reference's tokens kept"""
+    a, b = tokens(text), tokens(reference)
+    common = len(a & b)
+    return common / max(len(a), 1), common / max(len(b), 1)
+
+
+def scaled(html: bytes, scale: int) -> bytes:
+    match = re.search(rb"<body[^>]*>(.*)</body>", html, re.DOTALL)
+    if scale <= 1 or match is None:
+        return html
+    return html[: match.start(1)] + match.group(1) * scale + html[match.end(1) :]
+
+
+def time_extractor(extract: Callable[..., tuple[str, str]], html: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(html, "utf-8", None)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(FIXTURES.glob("*.html"))
+    print(f"{'page':<24}{'kB':>8}{'bs4 ms':>10}{'lxml ms':>10}{'speedup':>9}{'precision':>11}{'recall':>8}")
+
+    speedups = []
+    for page in pages:
+        html = scaled(page.read_bytes(), args.scale)
+        times = {name: time_extractor(extract, html, args.repeat) for name, extract in EXTRACTORS.items()}
+        reference, _ = extract_html(html)
+        text, _ = extract_main_content(html)
+        precision, recall = overlap(text, reference)
+        speedup = times["beautifulsoup"] / times["readability"]
+        speedups.append(speedup)
+
+        print(
+            f"{page.name:<24}{len(html) / 1024:>8.1f}{times['beautifulsoup'] * 1000:>10.2f}"
+            f"{times['readability'] * 1000:>10.2f}{speedup:>8.1f}x{precision:>11.2f}{recall:>8.2f}"
+        )
+
+    print(f"median speedup {statistics.median(speedups):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
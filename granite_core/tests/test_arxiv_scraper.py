@@ -4,10 +4,14 @@
 
 import asyncio
 
+import httpx
 import pytest
 from httpx import AsyncClient
 
-from granite_core.search.scraping.arxiv import ArxivScraper
+from granite_core.config import settings
+from granite_core.search.scraping import arxiv, runner
+from granite_core.search.scraping.arxiv import ArxivPapers, ArxivScraper, arxiv_id
+from granite_core.search.scraping.runner import ScraperRunner
 
 
 @pytest.fixture
@@ -39,3 +43,69 @@ async def test_arxix_scrape(scraper: ArxivScraper, client: AsyncClient) -> None:
         assert r.title is not None
         assert len(r.title) > 0
         assert len(r.content) > 0
+
+
+def feed(ids: list[str]) -> str:
+    entries = "".join(
+        f"""
+        <entry>
+            <id>http://arxiv.org/abs/{paper_id}v3</id>
+            <updated>2024-01-02T00:00:00Z</updated>
+            <published>2023-01-01T00:00:00Z</published>
+            <title>Paper
+                {paper_id}</title>
+            <summary>{"Abstract of the paper. " * 20}</summary>
+            <author><name>Ada Lovelace</name></author>
+            <author><name>Alan Turing</name></author>
+            <link href="http://arxiv.org/abs/{paper_id}v3" rel="alternate" type="text/html"/>
+            <link title="pdf" href="http://arxiv.org/pdf/{paper_id}v3" rel="related" type="application/pdf"/>
+            <category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+        </entry>"""
+        for paper_id in ids
+        if paper_id != "9999.99999"
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'
+
+
+def test_arxiv_id() -> None:
+    assert arxiv_id("https://arxiv.org/abs/2402.05749v2") == "2402.05749v2"
+    assert arxiv_id("https://arxiv.org/pdf/1706.03762") == "1706.03762"
+    assert arxiv_id("https://arxiv.org/pdf/1706.03762v7.pdf") == "1706.03762v7"
+    assert arxiv_id("https://arxiv.org/html/2303.12712v5#S1") == "2303.12712v5"
+    assert arxiv_id("https://arxiv.org/abs/hep-th/9901001") == "hep-th/9901001"
+    assert arxiv_id("https://arxiv.org/list/cs.CL/recent") is None
+
+
+@pytest.mark.asyncio
+async def test_arxiv_batched(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    papers = ArxivPapers(ttl=60)
+    monkeypatch.setattr(arxiv, "arxiv_papers", papers)
+    monkeypatch.setattr(runner, "arxiv_papers", papers)
+    monkeypatch.setattr(runner, "page_cache", None)
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, text=feed(request.url.params["id_list"].split(",")))
+
+    links = [
+        "https://arxiv.org/abs/2402.05749",
+        "https://arxiv.org/pdf/2303.12712",
+        "https://arxiv.org/abs/9999.99999",
+    ]
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        scraper_runner = ScraperRunner(urls=links)
+        scraper_runner.async_client = client
+        results = await scraper_runner.run()
+
+        assert len(requests) == 1
+        assert requests[0].url.params["id_list"] == "2402.05749,2303.12712,9999.99999"
+        assert [r.title for r in results] == ["Paper 2402.05749", "Paper 2303.12712"]
+        assert results[0].content.startswith("Published: 2023-01-01; Author: Ada Lovelace, Alan Turing; Content: ")
+
+        # Cached
+        content = await ArxivScraper().ascrape("https://arxiv.org/abs/2402.05749", client)
+        assert content is not None
+        assert len(requests) == 1
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
+
 import pytest
 
 from granite_core.cache import AsyncLRUCache
@@ -38,3 +40,72 @@ async def test_async_cache() -> None:
 
     # get Z, does not exist
     assert await cache.get("z") is None
+
+
+@pytest.mark.asyncio
+async def test_async_cache_ttl() -> None:
+    cache: AsyncLRUCache[str, int] = AsyncLRUCache[str, int](ttl=0.05)
+
+    await cache.set("a", 1)
+    await cache.set("b", 2, ttl=10)
+    assert await cache.get("a") == 1
+
+    await asyncio.sleep(0.1)
+
+    # a expired, b has its own ttl
+    assert await cache.get("a") is None
+    assert await cache.get("b") == 2
+    assert cache.stats.expirations == 1
+
+    # max_age rejects entries older than the caller accepts
+    assert await cache.get("b", max_age=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_async_cache_weight() -> None:
+    cache: AsyncLRUCache[str, bytes] = AsyncLRUCache[str, bytes](max_weight=10, weigher=len)
+
+    await cache.set("a", b"1234")
+    await cache.set("b", b"1234")
+    assert cache.weight == 8
+
+    # c needs room, ejects a
+    await cache.set("c", b"1234")
+    assert not await cache.exists("a")
+    assert cache.weight == 8
+    assert cache.stats.evictions == 1
+
+    # Heavier than the whole cache, not cached and nothing ejected
+    await cache.set("d", b"12345678901")
+    assert not await cache.exists("d")
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_async_cache_single_flight() -> None:
+    cache: AsyncLRUCache[str, int] = AsyncLRUCache[str, int](max_size=10)
+    loads = 0
+
+    async def loader() -> int:
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return 42
+
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert loads == 1
+    assert cache.stats.coalesced == 4
+    assert await cache.get_or_load("a", loader) == 42
+    assert loads == 1
+    assert cache.stats.hits == 1
+
+    async def failing() -> int:
+        raise ValueError("boom")
+
+    # Failed loads are not cached
+    with pytest.raises(ValueError):
+        await cache.get_or_load("b", failing)
+    assert not await cache.exists("b")
+    assert await cache.get_or_load("b", loader) == 42
@@ -86,6 +86,18 @@ def test_retriever_tavily_missing_key(clean_env) -> None:  # noqa: ANN001
     assert "Tavily retriever requires TAVILY_API_KEY" in str(excinfo.value)
 
 
+def test_prefilter_thresholds(clean_env) -> None:  # noqa: ANN001
+    """Test that the pre-filter rejects below the similarity it accepts above."""
+
+    settings = Settings(SEARCH_PREFILTER_REJECT_BELOW=0.3, SEARCH_PREFILTER_ACCEPT_ABOVE=0.8)  # type: ignore[call-arg]
+    assert settings.SEARCH_PREFILTER_ENABLED is False
+
+    with pytest.raises(ValidationError) as excinfo:
+        Settings(SEARCH_PREFILTER_REJECT_BELOW=0.8, SEARCH_PREFILTER_ACCEPT_ABOVE=0.8)  # type: ignore[call-arg]
+
+    assert "SEARCH_PREFILTER_REJECT_BELOW must be below SEARCH_PREFILTER_ACCEPT_ABOVE" in str(excinfo.value)
+
+
 def test_temperature_constraints(clean_env) -> None:  # noqa: ANN001
     """Test validation boundaries for TEMPERATURE."""
 
@@ -4,10 +4,12 @@
 
 import asyncio
 
+import httpx
 import pytest
 from httpx import AsyncClient
 
-from granite_core.search.scraping.docling import DoclingPDFScraper
+from granite_core.config import settings
+from granite_core.search.scraping.docling import DoclingPDFScraper, extract_pdf_pages
 from granite_core.search.scraping.types import ScrapedContent
 
 
@@ -45,3 +47,67 @@ async def test_docling_pdf_timeout(scraper: DoclingPDFScraper, client: AsyncClie
             scraper.ascrape(link="https://hai.stanford.edu/assets/files/hai_ai_index_report_2025.pdf", client=client),
             timeout=10,
         )
+
+
+def make_pdf(texts: list[str]) -> bytes:
+    """A PDF with one line of text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", "", "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+PAGES = [f"Page {i} " + "text " * 20 for i in range(1, 11)]
+
+
+def test_extract_pdf_pages_budget() -> None:
+    pdf = make_pdf(PAGES)
+
+    pages, page_count = extract_pdf_pages(pdf)
+    assert page_count == 10
+    assert [page.lines for page in pages] == [[text.strip()] for text in PAGES]
+
+    pages, _ = extract_pdf_pages(pdf, 3, 5)
+    assert [page.number for page in pages] == [3, 4, 5]
+
+    # Stops at the page that takes the text over the budget
+    pages, _ = extract_pdf_pages(pdf, max_chars=200)
+    assert [page.number for page in pages] == [1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parallel_min_pages", [0, 2])
+async def test_docling_pdf_in_memory(monkeypatch: pytest.MonkeyPatch, parallel_min_pages: int) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    monkeypatch.setattr(settings, "SCRAPER_PDF_MAX_PAGES", 6)
+    monkeypatch.setattr(settings, "SCRAPER_PDF_PARALLEL_MIN_PAGES", parallel_min_pages)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_CONTENT_LENGTH", 100_000)
+    pdf = make_pdf(PAGES)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=pdf, headers={"content-type": "application/pdf"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        content = await DoclingPDFScraper().ascrape("https://example.com/paper.pdf", client)
+
+    assert content is not None
+    assert content.title == PAGES[0].strip()
+    assert content.content.splitlines() == [text.strip() for text in PAGES[:6]]
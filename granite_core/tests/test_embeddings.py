@@ -2,8 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from pathlib import Path
+
+import numpy as np
 import pytest
+from langchain_core.embeddings import Embeddings
 
+from granite_core.search.embeddings.cache import CachedEmbeddings, EmbeddingCache, MmapVectorStore, embedding_key
 from granite_core.search.embeddings.factory import EmbeddingsFactory
 from granite_core.search.embeddings.model import EmbeddingsModel
 
@@ -25,3 +30,62 @@ async def test_bad_encoding() -> None:
     ]
     vectors: list[list[float]] = await embeddings_model.embeddings.aembed_documents(texts=bad_texts)
     assert len(vectors) == len(bad_texts)
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.texts += texts
+        return [[float(len(t)), 1.0, 0.5] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_cache(tmp_path: Path) -> None:
+    """Test embeddings are cached in memory and on disk, and deduped within a batch"""
+    upstream = CountingEmbeddings()
+    cache = EmbeddingCache("test", max_bytes=1024, directory=str(tmp_path), disk_max_bytes=1024 * 1024)
+    embeddings = CachedEmbeddings(upstream, cache)
+
+    vectors = await embeddings.aembed_documents(["King", "Queen", "King"])
+    assert vectors == [[4.0, 1.0, 0.5], [5.0, 1.0, 0.5], [4.0, 1.0, 0.5]]
+    assert upstream.texts == ["King", "Queen"]
+
+    assert await embeddings.aembed_query("Queen") == [5.0, 1.0, 0.5]
+    await embeddings.aembed_documents(["King", "Prince"])
+    assert upstream.texts == ["King", "Queen", "Prince"]
+
+    # A new process finds the vectors in the memory-mapped tier
+    reopened = CachedEmbeddings(upstream, EmbeddingCache("test", 0, str(tmp_path), disk_max_bytes=1024 * 1024))
+    assert await reopened.aembed_documents(["Prince", "King"]) == [[6.0, 1.0, 0.5], [4.0, 1.0, 0.5]]
+    assert upstream.texts == ["King", "Queen", "Prince"]
+
+
+def test_mmap_vector_store_orphaned_row(tmp_path: Path) -> None:
+    """Test a vector written without its key is dropped on reopen, and stores sharing files see each other's rows"""
+    path = str(tmp_path / "vectors")
+    king, queen, prince = embedding_key("King"), embedding_key("Queen"), embedding_key("Prince")
+
+    store = MmapVectorStore(path, max_bytes=1024 * 1024)
+    store.append([king], np.array([[1.0, 1.0]], dtype=np.float32))
+
+    # A writer died between the vector and its key
+    with open(f"{path}.f32", "ab") as f:
+        f.write(np.array([[9.0, 9.0]], dtype=np.float32).tobytes())
+
+    reopened = MmapVectorStore(path, max_bytes=1024 * 1024)
+    reopened.append([queen], np.array([[2.0, 2.0]], dtype=np.float32))
+    assert (tmp_path / "vectors.f32").stat().st_size == 2 * 2 * 4
+
+    # The first store picks up the row appended by the other one before appending its own
+    store.append([prince], np.array([[3.0, 3.0]], dtype=np.float32))
+
+    for s in (store, MmapVectorStore(path, max_bytes=1024 * 1024)):
+        assert s.get(king).tolist() == [1.0, 1.0]  # type: ignore[union-attr]
+        assert s.get(prince).tolist() == [3.0, 3.0]  # type: ignore[union-attr]
+    assert MmapVectorStore(path, max_bytes=1024 * 1024).get(queen).tolist() == [2.0, 2.0]  # type: ignore[union-attr]
+    assert store.get(queen).tolist() == [2.0, 2.0]  # type: ignore[union-attr]
@@ -0,0 +1,178 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import gzip
+from collections.abc import AsyncIterator
+
+import httpx
+import pytest
+
+from granite_core.config import settings
+from granite_core.search.scraping.beautiful_soup import BeautifulSoupScraper
+from granite_core.search.scraping.docling import DoclingPDFScraper
+from granite_core.search.scraping.media import sniff_media_type
+from granite_core.search.scraping.types import ScrapedContent
+from granite_core.search.scraping.utils import extract_html
+
+PARAGRAPH = "<p>" + "word " * 200 + "</p>"
+
+
+@pytest.mark.asyncio
+async def test_fetch_byte_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_DOWNLOAD_BYTES", 10_000)
+
+    page = ("<html><body>" + PARAGRAPH * 100 + "</body></html>").encode()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=gzip.compress(page), headers={"content-encoding": "gzip"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        response = await BeautifulSoupScraper().fetch("https://example.com/", client)
+
+    assert response is not None
+    assert response.content == page[:10_000]
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_fetch_decompression_bomb(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bomb = gzip.compress(b"\0" * settings.SCRAPER_MAX_DOWNLOAD_BYTES)
+        return httpx.Response(200, content=bomb, headers={"content-encoding": "gzip", "content-type": "text/html"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await BeautifulSoupScraper().fetch("https://example.com/", client) is None
+
+
+class CountingStream(httpx.AsyncByteStream):
+    def __init__(self, chunk: bytes, count: int) -> None:
+        self.chunk = chunk
+        self.count = count
+        self.sent = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for _ in range(self.count):
+            self.sent += 1
+            yield self.chunk
+
+
+def test_sniff_media_type() -> None:
+    assert sniff_media_type("text/html", b"<!DOCTYPE html><html>") == "text/html"
+    assert sniff_media_type("text/html", b"%PDF-1.7\n") == "application/pdf"
+    assert sniff_media_type("application/octet-stream", b"%PDF-1.4") == "application/pdf"
+    assert sniff_media_type(None, b"\xef\xbb\xbf  <!doctype html>") == "text/html"
+    assert sniff_media_type(None, b"\x89PNG\r\n\x1a\n...") == "image/png"
+    assert sniff_media_type(None, b"\x00\x00\x00\x18ftypmp42") == "video/mp4"
+    assert sniff_media_type("application/octet-stream", b"PK\x03\x04") == "application/zip"
+    assert sniff_media_type(None, b"plain words") == "text/plain"
+    assert sniff_media_type(None, b"\x00\x01\x02") == "application/octet-stream"
+
+
+@pytest.mark.asyncio
+async def test_fetch_unsupported_media(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    streams: dict[str, CountingStream] = {
+        "/video": CountingStream(b"\0" * 1024, 1000),
+        "/archive": CountingStream(b"PK\x03\x04" + b"\0" * 1020, 1000),
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": "video/mp4"} if request.url.path == "/video" else {}
+        return httpx.Response(200, headers=headers, stream=streams[request.url.path])
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await BeautifulSoupScraper().fetch("https://example.com/video", client) is None
+        assert await BeautifulSoupScraper().fetch("https://example.com/archive", client) is None
+
+    # Refused on the headers, and on the first chunk
+    assert streams["/video"].sent == 0
+    assert streams["/archive"].sent == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_error_status(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = int(request.url.path.strip("/"))
+        return httpx.Response(status, html="<html><body>" + PARAGRAPH + "</body></html>")
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await BeautifulSoupScraper().fetch("https://example.com/404", client) is None
+        assert await DoclingPDFScraper().fetch("https://example.com/503", client) is None
+        assert await BeautifulSoupScraper().fetch("https://example.com/200", client) is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_routes_pdf(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    pdf = b"%PDF-1.4\n" + b"0" * 10_000
+    requests: list[httpx.Request] = []
+    extracted: list[bytes] = []
+
+    async def extract(self: DoclingPDFScraper, link: str, response: httpx.Response) -> ScrapedContent:
+        extracted.append(response.content)
+        return ScrapedContent(url=link, content="pdf text", title="pdf")
+
+    monkeypatch.setattr(DoclingPDFScraper, "extract", extract)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=pdf, headers={"content-type": "application/octet-stream"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        content = await BeautifulSoupScraper().ascrape("https://example.com/download?id=1", client)
+
+    assert content is not None
+    assert content.content == "pdf text"
+    assert extracted == [pdf]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_oversized_pdf(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_PDF_BYTES", 4096)
+    stream = CountingStream(b"%PDF-1.4" + b"0" * 1016, 8)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        headers = {"content-type": "application/pdf", "content-length": "8192"}
+        return httpx.Response(200, headers=headers, stream=stream)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await DoclingPDFScraper().fetch("https://example.com/paper.pdf", client) is None
+
+    assert stream.sent == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_pdf_at_byte_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A PDF of exactly the byte cap is whole, one byte more is cut short"""
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_PDF_BYTES", 4096)
+    pdf = b"%PDF-1.4" + b"0" * (4096 - 8)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = pdf if request.url.path == "/exact.pdf" else pdf + b"0"
+        return httpx.Response(200, content=content, headers={"content-type": "application/pdf"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        response = await DoclingPDFScraper().fetch("https://example.com/exact.pdf", client)
+        assert response is not None
+        assert response.content == pdf
+        assert await DoclingPDFScraper().fetch("https://example.com/over.pdf", client) is None
+
+
+def test_extract_html_budget() -> None:
+    html = ("<html><head><title>Title</title></head><body>" + PARAGRAPH * 100 + "</body></html>").encode()
+
+    full, title = extract_html(html)
+    text, _ = extract_html(html, max_chars=1500)
+
+    assert title == "Title"
+    assert 1500 < len(text) < 2600
+    assert full.startswith(text)
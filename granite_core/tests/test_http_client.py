@@ -0,0 +1,114 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import socket
+from typing import Any
+
+import httpcore
+import httpx
+import pytest
+
+from granite_core.config import settings
+from granite_core.search.http_client import CachingResolver, HostLimitedTransport, create_http_client, http_clients
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self) -> None:
+        self.hosts: list[str] = []
+
+    async def connect_tcp(self, host: str, port: int, *args: Any, **kwargs: Any) -> httpcore.AsyncNetworkStream:
+        self.hosts.append(host)
+        return httpcore.AsyncMockStream([])
+
+
+@pytest.mark.asyncio
+async def test_shared_client() -> None:
+    client = http_clients.get()
+    assert http_clients.get() is client
+    await http_clients.aclose()
+    assert client.is_closed
+    assert http_clients.get() is not client
+    await http_clients.aclose()
+
+
+def test_shared_client_closed_on_shutdown() -> None:
+    async def main() -> httpx.AsyncClient:
+        return http_clients.get()
+
+    client = asyncio.run(main())
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_caching_resolver(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups: list[str] = []
+
+    async def getaddrinfo(host: str, port: int, **kwargs: Any) -> list[Any]:
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port))]
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+
+    backend = FakeBackend()
+    resolver = CachingResolver(backend, ttl=60)
+    for _ in range(3):
+        await resolver.connect_tcp("example.com", 443)
+    await resolver.connect_tcp("192.0.2.7", 443)
+
+    assert lookups == ["example.com"]
+    assert backend.hosts == ["192.0.2.1", "192.0.2.1", "192.0.2.1", "192.0.2.7"]
+
+
+@pytest.mark.asyncio
+async def test_client_resolves_through_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The pooled client connects by the addresses of the caching resolver, httpcore errors surface as httpx ones"""
+    lookups: list[str] = []
+    connected: list[str] = []
+
+    async def getaddrinfo(host: str, port: int, **kwargs: Any) -> list[Any]:
+        lookups.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", port))]
+
+    async def connect_tcp(self: httpcore.AnyIOBackend, host: str, port: int, *args: Any) -> httpcore.AsyncNetworkStream:
+        connected.append(host)
+        if port == 81:
+            raise httpcore.ConnectError("refused")
+        return httpcore.AsyncMockStream([b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"])
+
+    monkeypatch.setattr(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(httpcore.AnyIOBackend, "connect_tcp", connect_tcp)
+    monkeypatch.setattr(settings, "HTTP_DNS_CACHE_TTL", 60)
+
+    async with create_http_client() as client:
+        response = await client.get("http://example.com/")
+        assert response.text == "ok"
+        with pytest.raises(httpx.ConnectError):
+            await client.get("http://example.com:81/")
+
+    assert lookups == ["example.com", "example.com"]
+    assert connected == ["192.0.2.1", "192.0.2.1"]
+
+
+@pytest.mark.asyncio
+async def test_host_limited_transport() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, text="ok")
+
+    transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        urls = [f"https://{host}/{i}" for host in ("a.com", "b.com") for i in range(5)]
+        responses = await asyncio.gather(*(client.get(url) for url in urls))
+
+    assert all(r.status_code == 200 for r in responses)
+    assert peak == {"a.com": 2, "b.com": 2}
+    assert transport._hosts == {}
@@ -0,0 +1,88 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+from beeai_framework.backend import AnyMessage, AssistantMessage, ChatModelOutput, ChatModelParameters, UserMessage
+from pydantic import BaseModel
+
+from granite_core.memo import MemoryStructuredRunStore, StructuredRunMemo
+
+
+class LanguageSchema(BaseModel):
+    language: str
+
+
+class FakeChatModel:
+    provider_id = "fake"
+    model_id = "granite"
+
+    def __init__(self, temperature: float) -> None:
+        self.parameters = ChatModelParameters(temperature=temperature)
+        self.calls = 0
+
+    async def run(self, messages: list[AnyMessage], **kwargs: Any) -> ChatModelOutput:
+        self.calls += 1
+        return ChatModelOutput(output=[AssistantMessage("{}")], output_structured=LanguageSchema(language="english"))
+
+
+@pytest.mark.asyncio
+async def test_structured_memo() -> None:
+    memo = StructuredRunMemo(MemoryStructuredRunStore(max_size=10), ttl=60)
+    chat_model = FakeChatModel(temperature=0)
+
+    for _ in range(3):
+        response = await memo.run(
+            chat_model,  # type: ignore[arg-type]
+            [UserMessage("Hello")],
+            response_format=LanguageSchema,
+            max_retries=3,
+        )
+        assert response.output_structured == LanguageSchema(language="english")
+    assert chat_model.calls == 1
+
+    # Different messages, or a site opting out, go to the model
+    await memo.run(chat_model, [UserMessage("Bonjour")], response_format=LanguageSchema)  # type: ignore[arg-type]
+    await memo.run(chat_model, [UserMessage("Hello")], response_format=LanguageSchema, memoize=False)  # type: ignore[arg-type]
+    assert chat_model.calls == 3
+
+    # Another model, or the same model with other parameters, gets its own results
+    other_model = FakeChatModel(temperature=0)
+    other_model.model_id = "granite-other"
+    await memo.run(other_model, [UserMessage("Hello")], response_format=LanguageSchema)  # type: ignore[arg-type]
+    capped_model = FakeChatModel(temperature=0)
+    capped_model.parameters.max_tokens = 10
+    await memo.run(capped_model, [UserMessage("Hello")], response_format=LanguageSchema)  # type: ignore[arg-type]
+    assert other_model.calls == 1
+    assert capped_model.calls == 1
+
+    # Sampling is not deterministic, never memoized
+    sampling_model = FakeChatModel(temperature=0.7)
+    await memo.run(sampling_model, [UserMessage("Hello")], response_format=LanguageSchema)  # type: ignore[arg-type]
+    await memo.run(sampling_model, [UserMessage("Hello")], response_format=LanguageSchema)  # type: ignore[arg-type]
+    assert sampling_model.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_structured_memo_throttle() -> None:
+    """Only calls that go to the model take the throttle"""
+    memo = StructuredRunMemo(MemoryStructuredRunStore(max_size=10), ttl=60)
+    chat_model = FakeChatModel(temperature=0)
+    throttled = 0
+
+    @asynccontextmanager
+    async def throttle() -> AsyncIterator[None]:
+        nonlocal throttled
+        throttled += 1
+        yield
+
+    for _ in range(3):
+        await memo.run(chat_model, [UserMessage("Hello")], response_format=LanguageSchema, throttle=throttle)  # type: ignore[arg-type]
+    await memo.run(chat_model, [UserMessage("Hello")], response_format=LanguageSchema, memoize=False, throttle=throttle)  # type: ignore[arg-type]
+
+    assert chat_model.calls == 2
+    assert throttled == 2
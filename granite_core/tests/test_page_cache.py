@@ -0,0 +1,137 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import os
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from granite_core.config import settings
+from granite_core.search.scraping.beautiful_soup import BeautifulSoupScraper
+from granite_core.search.scraping.page_cache import (
+    CachedPage,
+    DiskPageStore,
+    MemoryPageStore,
+    PageCache,
+    canonical_url,
+    freshness_lifetime,
+)
+from granite_core.search.scraping.types import ScrapedContent
+
+PAGE = "<html><head><title>Granite</title></head><body><p>Hello world</p></body></html>"
+
+
+def test_canonical_url() -> None:
+    assert canonical_url("HTTPS://Example.com:443/a?b=2&a=1&utm_source=x#top") == "https://example.com/a?a=1&b=2"
+    assert canonical_url("http://example.com") == "http://example.com/"
+    assert canonical_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_freshness_lifetime() -> None:
+    now = time.time()
+    assert freshness_lifetime(httpx.Headers({"cache-control": "public, max-age=60"}), now) == 60
+    assert freshness_lifetime(httpx.Headers({"cache-control": "max-age=60, s-maxage=120"}), now) == 120
+    assert freshness_lifetime(httpx.Headers({"cache-control": "no-cache"}), now) == 0
+    assert freshness_lifetime(httpx.Headers({"cache-control": "no-store"}), now) is None
+    assert freshness_lifetime(httpx.Headers({"cache-control": "private, max-age=60"}), now) is None
+    assert freshness_lifetime(httpx.Headers({"expires": "0"}), now) == 0
+    assert freshness_lifetime(httpx.Headers({"cache-control": "max-age=999999999"}), now) == settings.PAGE_CACHE_MAX_TTL
+    assert freshness_lifetime(httpx.Headers(), now) == settings.PAGE_CACHE_DEFAULT_TTL
+
+
+@pytest.mark.asyncio
+async def test_page_cache_revalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "CHECK_ROBOTS_TXT", False)
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"', "cache-control": "max-age=60"})
+        return httpx.Response(200, html=PAGE, headers={"etag": '"v1"', "cache-control": "no-cache"})
+
+    cache = PageCache(MemoryPageStore(max_bytes=1024 * 1024))
+    scraper = BeautifulSoupScraper()
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        link = "https://example.com/page?utm_source=test"
+        content = await cache.scrape(scraper, link, client)
+        assert content is not None
+        assert "Hello world" in content.content
+
+        # no-cache pages are stored but must be revalidated before use
+        cached = await cache.lookup("https://example.com/page")
+        assert cached is not None
+        assert not cached.is_fresh()
+
+        revalidated = await cache.scrape(scraper, "https://example.com/page", client, cached)
+        assert revalidated is not None
+        assert revalidated.content == content.content
+        assert revalidated.url == "https://example.com/page"
+        assert requests[-1].headers["if-none-match"] == '"v1"'
+
+        # The 304 made the page fresh for max-age
+        cached = await cache.lookup(link)
+        assert cached is not None
+        assert cached.is_fresh()
+        assert cache.hit(link, cached).content == content.content
+
+    assert len(requests) == 2
+    assert cache.stats.misses == 1
+    assert cache.stats.revalidated == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.bytes_saved == 2 * len(PAGE)
+    assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_disk_page_store(tmp_path: Path) -> None:
+    store = DiskPageStore(str(tmp_path), max_bytes=1024 * 1024)
+    now = time.time()
+    page = CachedPage(
+        content=ScrapedContent(url="https://example.com/", content="content", title="title"),
+        etag='"v1"',
+        fetched_at=now,
+        fresh_until=now + 60,
+        download_size=100,
+    )
+
+    assert await store.get("https://example.com/") is None
+
+    await store.set("https://example.com/", page)
+    assert await store.get("https://example.com/") == page
+
+    # Past retention the page is gone
+    await store.set("https://example.com/", page.model_copy(update={"fresh_until": now - settings.PAGE_CACHE_MAX_TTL}))
+    assert await store.get("https://example.com/") is None
+
+
+def files_under(directory: Path) -> list[Path]:
+    return [path for path in directory.rglob("*") if path.is_file()]
+
+
+@pytest.mark.asyncio
+async def test_disk_page_store_eviction(tmp_path: Path) -> None:
+    store = DiskPageStore(str(tmp_path), max_bytes=4000)
+    now = time.time()
+
+    for i in range(10):
+        page = CachedPage(
+            content=ScrapedContent(url=f"https://example.com/{i}", content="x" * 800, title=str(i)),
+            fetched_at=now,
+            fresh_until=now + 60,
+            download_size=1000,
+        )
+        await store.set(f"https://example.com/{i}", page)
+        # Distinct write times, in the past so the page just written is the latest
+        os.utime(store._path(f"https://example.com/{i}"), (now - 100 + i, now - 100 + i))
+
+    files = files_under(tmp_path)
+    assert sum(path.stat().st_size for path in files) <= 4000
+    assert not any(path.name.endswith(".tmp") for path in files)
+    # The latest pages are kept
+    assert await store.get("https://example.com/9") is not None
+    assert await store.get("https://example.com/0") is None
@@ -0,0 +1,42 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+from pathlib import Path
+
+import pytest
+
+from granite_core.search.scraping.readability import extract_main_content
+from granite_core.search.scraping.utils import extract_html
+from tests.benchmark_extractors import overlap
+
+FIXTURES = Path(__file__).parent / "fixtures" / "pages"
+
+
+@pytest.mark.parametrize(
+    "page,content,boilerplate",
+    [
+        ("article.html", "electric field at the junction", ["We use cookies", "Most read", "Great article"]),
+        ("docs.html", "waiting for a connection from the pool", ["Docs home", "Edit this page"]),
+        ("forum.html", "smells strongly of acetone", ["Similar threads", "Community guidelines"]),
+    ],
+)
+def test_extract_main_content(page: str, content: str, boilerplate: list[str]) -> None:
+    html = (FIXTURES / page).read_bytes()
+
+    text, title = extract_main_content(html, "utf-8")
+    reference, reference_title = extract_html(html, "utf-8")
+
+    assert title == reference_title
+    assert content in text
+    assert not any(b in text for b in boilerplate)
+
+    precision, recall = overlap(text, reference)
+    assert precision > 0.95
+    assert recall > 0.8
+
+
+def test_extract_main_content_budget() -> None:
+    text, _ = extract_main_content((FIXTURES / "article.html").read_bytes(), max_chars=500)
+    assert 500 < len(text) < 1000
+    assert extract_main_content(b"") == ("", "")
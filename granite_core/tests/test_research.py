@@ -2,17 +2,23 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
+from typing import Any
+
 import pytest
 from beeai_framework.backend import AnyMessage, AssistantMessage, UserMessage
+from langchain_core.documents import Document
 
 from granite_core.chat_model import ChatModelFactory
 from granite_core.citations.events import CitationEvent
 from granite_core.citations.types import Citation
 from granite_core.emitter import Event
 from granite_core.events import GeneratingCitationsCompleteEvent, GeneratingCitationsEvent, TextEvent, TrajectoryEvent
+from granite_core.research import researcher as researcher_module
 from granite_core.research.prompts import ResearchPrompts
-from granite_core.research.researcher import Researcher
+from granite_core.research.researcher import NO_FINDINGS_REPORT, Researcher
 from granite_core.research.types import ResearchQuery
+from granite_core.work import deadline
 
 
 @pytest.mark.asyncio
@@ -56,6 +62,50 @@ async def test_basic_researcher() -> None:
     assert "Geoffrey Hinton" in "".join(final_agent_response_text)
 
 
+class StalledChatModel:
+    """Chat model that never answers"""
+
+    async def run(self, *args: Any, **kwargs: Any) -> Any:
+        await asyncio.Event().wait()
+
+
+class FakeVectorStore:
+    async def asimilarity_search(self, query: str, k: int) -> list[Document]:
+        return [Document(page_content=f"About {query}", metadata={"title": query})]
+
+
+@pytest.mark.asyncio
+async def test_researcher_without_findings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test research steps cut off by the deadline give a short report without citations"""
+    monkeypatch.setattr(researcher_module.VectorStoreWrapperFactory, "create", lambda: FakeVectorStore())
+    researcher = Researcher(
+        chat_model=StalledChatModel(),  # type: ignore[arg-type]
+        structured_chat_model=StalledChatModel(),  # type: ignore[arg-type]
+        messages=[UserMessage("Write a report on lighthouses.")],
+        session_id="test_session",
+    )
+    researcher.research_topic = "Lighthouses"
+    researcher.research_plan = [
+        ResearchQuery(question="How do lighthouses work?", search_query="lighthouse optics", rationale="Basics")
+    ]
+
+    text: list[str] = []
+
+    async def research_listener(event: Event) -> None:
+        if isinstance(event, TextEvent):
+            text.append(event.text)
+
+    researcher.subscribe(handler=research_listener)
+
+    with deadline(0.1):
+        await researcher._perform_research()
+    await researcher._generate_final_report()
+
+    assert researcher.interim_reports == []
+    assert researcher.final_report_docs == []
+    assert "".join(text) == researcher.final_report == NO_FINDINGS_REPORT
+
+
 @pytest.mark.asyncio
 async def test_interactive_researcher() -> None:
     """Test basic research infrastructure"""
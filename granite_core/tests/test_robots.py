@@ -8,6 +8,9 @@ import httpx
 import pytest
 
 import granite_core.search.robots as robots
+from granite_core.cache import AsyncLRUCache
+from granite_core.config import settings
+from granite_core.search.robots_store import LocalRobotsStore
 from granite_core.search.user_agent import UserAgent
 
 
@@ -69,3 +72,49 @@ async def test_cache_ttl() -> None:
 
         # Verify cache hit
         assert cached_robots_parser == new_robots_parser
+
+
+@pytest.mark.asyncio
+async def test_robots_single_flight_and_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    requests = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        return httpx.Response(200, text="User-agent: *\nDisallow: /private")
+
+    store = LocalRobotsStore()
+    monkeypatch.setattr(robots, "_robots_store", store)
+    monkeypatch.setattr(robots, "_robot_cache", AsyncLRUCache(max_size=10))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        # Concurrent checks of one host fetch robots.txt once, through the given client
+        results = await asyncio.gather(
+            *(robots.can_fetch(client=client, url=f"https://example.com/page{i}") for i in range(5)),
+            robots.can_fetch(client=client, url="https://example.com/private/page"),
+        )
+        assert results == [True] * 5 + [False]
+        assert requests == 1
+
+        # Another process with an empty local cache reads the rules from the shared store
+        monkeypatch.setattr(robots, "_robot_cache", AsyncLRUCache(max_size=10))
+        assert not await robots.can_fetch(client=client, url="https://example.com/private/page")
+        assert requests == 1
+
+
+@pytest.mark.asyncio
+async def test_robots_negative_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("unreachable")
+
+    store = LocalRobotsStore()
+    monkeypatch.setattr(robots, "_robots_store", store)
+    monkeypatch.setattr(robots, "_robot_cache", AsyncLRUCache(max_size=10))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await robots.can_fetch(client=client, url="https://unreachable.example.com/")
+
+    record = await store.get("https://unreachable.example.com/robots.txt")
+    assert record is not None
+    assert record.negative
+    assert record.ttl == settings.ROBOTS_NEGATIVE_CACHE_TTL
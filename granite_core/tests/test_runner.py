@@ -0,0 +1,153 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import time
+from itertools import pairwise
+
+import pytest
+
+from granite_core.config import settings
+from granite_core.search.scraping.politeness import HostScheduler, interleave_by_domain
+from granite_core.search.scraping.runner import ScraperRunner
+from granite_core.search.scraping.types import ScrapedContent
+
+
+@pytest.mark.asyncio
+async def test_runner_prefetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    scraped: list[str] = []
+    cancelled: list[str] = []
+
+    async def scrape(self: ScraperRunner, url: str) -> ScrapedContent | None:
+        scraped.append(url)
+        try:
+            await asyncio.sleep(0 if url.endswith("fast") else 10)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return ScrapedContent(url=url, content="x" * 500, title="")
+
+    monkeypatch.setattr(ScraperRunner, "_scrape", scrape)
+
+    runner = ScraperRunner([], max_scraped_content=5)
+    runner.prefetch(["https://a.com/fast", "https://b.com/slow"])
+    runner.prefetch(["https://a.com/fast"])
+    await asyncio.sleep(0.01)
+
+    # The accepted result is picked up from its speculative scrape, not scraped again
+    runner.urls = ["https://a.com/fast", "https://c.com/fast"]
+    contents = await runner.run()
+    assert [c.url for c in contents] == ["https://a.com/fast", "https://c.com/fast"]
+    assert scraped == ["https://a.com/fast", "https://b.com/slow", "https://c.com/fast"]
+
+    # The rejected result is discarded
+    await runner.close()
+    assert cancelled == ["https://b.com/slow"]
+
+
+def test_interleave_by_domain() -> None:
+    urls = ["https://a.com/1", "https://www.a.com/2", "https://a.com/3", "https://b.com/1", "https://c.com/1"]
+    assert interleave_by_domain(urls) == [
+        "https://a.com/1",
+        "https://b.com/1",
+        "https://c.com/1",
+        "https://www.a.com/2",
+        "https://a.com/3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_runner_domain_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def scrape(self: ScraperRunner, url: str) -> ScrapedContent | None:
+        return ScrapedContent(url=url, content="x" * 500, title="")
+
+    monkeypatch.setattr(ScraperRunner, "_scrape", scrape)
+    monkeypatch.setattr(settings, "SCRAPER_MAX_PAGES_PER_DOMAIN", 2)
+
+    runner = ScraperRunner([f"https://a.com/{i}" for i in range(5)] + ["https://b.com/1"], max_scraped_content=10)
+    contents = await runner.run()
+    assert sorted(c.url for c in contents) == ["https://a.com/0", "https://a.com/1", "https://b.com/1"]
+
+
+@pytest.mark.asyncio
+async def test_host_scheduler() -> None:
+    scheduler = HostScheduler(max_concurrent=1, min_interval=0.2, max_delay=0.4)
+    starts: dict[str, list[float]] = {"a.com": [], "b.com": []}
+
+    async def request(host: str, crawl_delay: float | None = None) -> None:
+        async with scheduler.slot(host, crawl_delay=crawl_delay):
+            starts[host].append(time.monotonic())
+
+    await asyncio.gather(*(request("a.com") for _ in range(3)), *(request("b.com", crawl_delay=60) for _ in range(2)))
+
+    assert all(b - a >= 0.19 for a, b in pairwise(starts["a.com"]))
+    # Crawl-delay capped at max_delay
+    assert 0.39 <= starts["b.com"][1] - starts["b.com"][0] < 2
+    # Hosts don't wait for each other
+    assert starts["b.com"][0] < starts["a.com"][1]
+
+
+@pytest.mark.asyncio
+async def test_host_scheduler_slow_requests() -> None:
+    scheduler = HostScheduler(max_concurrent=1, min_interval=0.1, max_delay=1)
+    starts: list[float] = []
+
+    async def request(duration: float) -> None:
+        async with scheduler.slot("a.com"):
+            starts.append(time.monotonic())
+            await asyncio.sleep(duration)
+
+    # The turns of the quick requests pass while the slow one holds the slot
+    await asyncio.gather(request(0.3), request(0), request(0))
+
+    assert all(b - a >= 0.09 for a, b in pairwise(starts))
+
+
+@pytest.mark.asyncio
+async def test_host_scheduler_cancelled_waiter() -> None:
+    scheduler = HostScheduler(max_concurrent=1, min_interval=0.2, max_delay=1)
+
+    async def request() -> float:
+        async with scheduler.slot("a.com"):
+            return time.monotonic()
+
+    start = await request()
+    waiter = asyncio.create_task(request())
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    # The cancelled waiter's turn is given back
+    assert await request() - start < 0.35
+
+
+@pytest.mark.asyncio
+async def test_runner_early_stop(monkeypatch: pytest.MonkeyPatch) -> None:
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def scrape(self: ScraperRunner, url: str) -> ScrapedContent | None:
+        started.append(url)
+        try:
+            await asyncio.sleep(10 if "slow" in url else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return None if "empty" in url else ScrapedContent(url=url, content="x" * 500, title="")
+
+    monkeypatch.setattr(ScraperRunner, "_scrape", scrape)
+    monkeypatch.setattr(settings, "SCRAPER_HEDGE_FACTOR", 1.5)
+
+    urls = ["https://slow.com/", "https://empty.com/", "https://a.com/", "https://b.com/", "https://c.com/"]
+    runner = ScraperRunner(urls, max_scraped_content=2)
+
+    start = time.monotonic()
+    contents = await runner.run()
+
+    # Three at a time, the failed page makes room for the next ones, pages past the quota are dropped
+    assert time.monotonic() - start < 1
+    assert [c.url for c in contents] == ["https://a.com/", "https://b.com/"]
+    assert started == urls
+    assert cancelled == ["https://slow.com/"]
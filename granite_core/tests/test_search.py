@@ -2,12 +2,26 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+import asyncio
+from typing import Any
+
 import pytest
+from beeai_framework.backend import AnyMessage, AssistantMessage, ChatModelOutput, ChatModelParameters
+from langchain_core.embeddings import Embeddings
 
 from granite_core.chat_model import ChatModelFactory
+from granite_core.config import settings
+from granite_core.search.embeddings.model import EmbeddingsModel
+from granite_core.search.engines.cache import CachingSearchEngine, MemorySearchResultStore, normalize_query
+from granite_core.search.engines.engine import SearchEngine
 from granite_core.search.engines.factory import SearchEngineFactory
 from granite_core.search.filter import SearchResultsFilter
-from granite_core.search.types import SearchResult
+from granite_core.search.types import (
+    SearchResult,
+    SearchResultRelevanceSchema,
+    SearchResultsRelevanceSchema,
+    SearchResultVerdictSchema,
+)
 
 
 @pytest.mark.asyncio
@@ -42,3 +56,114 @@ async def test_search_filter() -> None:
 
     assert len(filtered_results) == 1
     assert filtered_results[0].url == "https://en.wikipedia.org/wiki/IBM"
+
+
+class CountingSearch(SearchEngine):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def search(self, query: str, domains: list[str] | None = None, max_results: int = 7) -> list[SearchResult]:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [SearchResult(url=f"https://example.com/{i}", title=query, snippet="") for i in range(max_results)]
+
+
+@pytest.mark.asyncio
+async def test_search_cache() -> None:
+    """Test search result caching and coalescing"""
+    assert normalize_query("  What is  IBM Granite? ") == "what is ibm granite"
+
+    upstream = CountingSearch()
+    engine = CachingSearchEngine(upstream, store=MemorySearchResultStore(max_size=10), ttl=60)
+
+    # Concurrent identical queries share one upstream call
+    results = await asyncio.gather(*(engine.search("What is IBM Granite?", max_results=3) for _ in range(5)))
+    assert all(len(r) == 3 for r in results)
+    assert upstream.calls == 1
+
+    # Normalized repeats are served from the cache
+    assert len(await engine.search("what is ibm granite", max_results=3)) == 3
+    assert upstream.calls == 1
+
+    # Different parameters are different queries
+    await engine.search("what is ibm granite", max_results=2)
+    await engine.search("what is ibm granite", max_results=3, domains=["ibm.com"])
+    assert upstream.calls == 3
+
+
+class FakeFilterModel:
+    """Relevant if the url mentions ibm, leaves the last result out of batched verdicts"""
+
+    provider_id = "fake"
+    model_id = "granite"
+    parameters = ChatModelParameters(temperature=0.5)
+
+    def __init__(self) -> None:
+        self.calls: list[type] = []
+
+    async def run(self, messages: list[AnyMessage], response_format: type, **kwargs: Any) -> ChatModelOutput:
+        self.calls.append(response_format)
+        prompt = messages[0].text
+        if response_format is SearchResultsRelevanceSchema:
+            urls = [line.split("URL: ")[1] for line in prompt.splitlines() if line.startswith("- URL: ")]
+            output: Any = SearchResultsRelevanceSchema(
+                verdicts=[SearchResultVerdictSchema(index=i, is_relevant="ibm" in u) for i, u in enumerate(urls, 1)][
+                    :-1
+                ]
+            )
+        else:
+            output = SearchResultRelevanceSchema(is_relevant="https://ibm" in prompt)
+        return ChatModelOutput(output=[AssistantMessage("")], output_structured=output)
+
+
+@pytest.mark.asyncio
+async def test_search_filter_batched(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test batched search filter with per result fallback"""
+    monkeypatch.setattr(settings, "SEARCH_FILTER_MODE", "batched")
+    monkeypatch.setattr(settings, "SEARCH_PREFILTER_ENABLED", False)
+    monkeypatch.setattr(settings, "SEARCH_FILTER_BATCH_TOKENS", 100)
+
+    chat_model = FakeFilterModel()
+    filter = SearchResultsFilter(chat_model=chat_model, session_id="test_session")  # type: ignore[arg-type]
+    results = [
+        SearchResult(url=f"https://{site}.com/{i}", title="title", snippet="x" * 150)
+        for i, site in enumerate(["ibm", "spam", "ibm", "spam", "ibm"])
+    ]
+
+    filtered = await filter.filter("IBM", results)
+
+    assert [r.url for r in filtered] == ["https://ibm.com/0", "https://ibm.com/2", "https://ibm.com/4"]
+    # 2 batches of 2 and 1 single, last result of each batch judged on its own
+    assert chat_model.calls.count(SearchResultsRelevanceSchema) == 2
+    assert chat_model.calls.count(SearchResultRelevanceSchema) == 3
+
+
+class KeywordEmbeddings(Embeddings):
+    """2d vectors, close to the query when the text mentions ibm, opposite when it mentions spam"""
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0, 0.0] if "ibm" in t.lower() else [-1.0, 0.0] if "spam" in t else [0.5, 0.5] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+@pytest.mark.asyncio
+async def test_search_prefilter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test clear cut results are settled by embedding similarity, only ambiguous ones reach the LLM"""
+    monkeypatch.setattr(settings, "SEARCH_FILTER_MODE", "per_result")
+    monkeypatch.setattr(settings, "SEARCH_PREFILTER_ENABLED", True)
+
+    chat_model = FakeFilterModel()
+    filter = SearchResultsFilter(chat_model=chat_model, session_id="test_session")  # type: ignore[arg-type]
+    filter._embeddings_model = EmbeddingsModel(KeywordEmbeddings(), type="similarity")
+    results = [
+        SearchResult(url="https://ibm.com/granite", title="IBM Granite", snippet=""),
+        SearchResult(url="https://spam.com/", title="spam", snippet=""),
+        SearchResult(url="https://other.com/", title="other", snippet=""),
+    ]
+
+    filtered = await filter.filter("IBM", results)
+
+    assert [r.url for r in filtered] == ["https://ibm.com/granite"]
+    assert chat_model.calls == [SearchResultRelevanceSchema]
@@ -2,11 +2,19 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.vectorstores import InMemoryVectorStore
 
+from granite_core.config import settings
 from granite_core.search.scraping.types import ScrapedSearchResult
 from granite_core.search.types import SearchResult
-from granite_core.search.vector_store import VectorStoreWrapper
+from granite_core.search.vector_store import VectorStoreWrapper, vector_store
 from granite_core.search.vector_store.factory import VectorStoreWrapperFactory
 
 
@@ -44,3 +52,54 @@ As one of the world's oldest and largest technology companies, IBM has been resp
     docs = await vs.asimilarity_search(query="When IBM was founded what was the company called?", k=1)
     assert docs and len(docs) == 1
     assert "Computing-Tabulating-Recording Company" in docs[0].page_content
+
+
+@pytest.mark.asyncio
+async def test_vector_store_throttles_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Embedding batches of providers without a worker pool go through the embeddings pool"""
+    costs: list[float] = []
+
+    @asynccontextmanager
+    async def throttle(**kwargs: Any) -> AsyncIterator[None]:
+        costs.append(kwargs["cost"])
+        yield
+
+    monkeypatch.setattr(settings, "EMBEDDINGS_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "MAX_EMBEDDINGS_PER_REQUEST", 2)
+    monkeypatch.setattr(vector_store.embeddings_pool, "throttle", throttle)
+
+    vs = VectorStoreWrapper(InMemoryVectorStore(DeterministicFakeEmbedding(size=8)), chunk_size=100, chunk_overlap=0)
+    content = [
+        ScrapedSearchResult(
+            search_result=SearchResult(title=f"Page {i}", snippet="", url=f"https://example.com/{i}"),
+            url=f"https://example.com/{i}",
+            title=f"Page {i}",
+            raw_content=f"Paragraph {i} of the page.",
+        )
+        for i in range(5)
+    ]
+
+    await vs.load(content)
+
+    assert costs == [2, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_vector_store_splits_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Documents are split in one CPU pool call per worker, in order"""
+    batches: list[int] = []
+
+    async def run(fn: Any, documents: list[Document], *args: Any) -> Any:
+        batches.append(len(documents))
+        return fn(documents, *args)
+
+    monkeypatch.setattr(vector_store.cpu_pool, "max_workers", 2)
+    monkeypatch.setattr(vector_store.cpu_pool, "run", run)
+
+    vs = VectorStoreWrapper(InMemoryVectorStore(DeterministicFakeEmbedding(size=8)), chunk_size=100, chunk_overlap=0)
+    documents = [Document(page_content=f"Paragraph {i} of the page.") for i in range(5)]
+
+    chunks = await vs._a_split_documents(documents)
+
+    assert batches == [3, 2]
+    assert [c.page_content for c in chunks] == [d.page_content for d in documents]
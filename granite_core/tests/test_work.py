@@ -0,0 +1,404 @@
+# © Copyright IBM Corporation 2025
+# SPDX-License-Identifier: Apache-2.0
+
+
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from granite_core.metrics import PrometheusExporter, export_metrics
+from granite_core.search.scraping.utils import extract_html
+from granite_core.work import (
+    AdaptiveConcurrency,
+    CpuPool,
+    Priority,
+    PrioritySemaphore,
+    WorkerPool,
+    WorkSession,
+    chat_pool,
+    current_work_session,
+    deadline,
+    deadline_stage,
+    embeddings_pool,
+    gather_within,
+    overload_signal,
+    time_remaining,
+    work_session,
+)
+
+REQUEST = httpx.Request("POST", "http://localhost/v1/chat/completions")
+
+
+@pytest.mark.asyncio
+async def test_priority_order() -> None:
+    """Free slots go to the highest priority waiter first"""
+    semaphore = PrioritySemaphore(1)
+    await semaphore.acquire()
+
+    order: list[Priority] = []
+
+    async def worker(priority: Priority) -> None:
+        await semaphore.acquire(priority)
+        order.append(priority)
+        semaphore.release()
+
+    tasks = [asyncio.create_task(worker(p)) for p in (Priority.BACKGROUND, Priority.PLANNING, Priority.INTERACTIVE)]
+    await asyncio.sleep(0)
+
+    assert semaphore.queue_depth(Priority.BACKGROUND) == 1
+    assert semaphore.queue_depth(Priority.INTERACTIVE) == 1
+
+    semaphore.release()
+    await asyncio.gather(*tasks)
+
+    assert order == [Priority.INTERACTIVE, Priority.PLANNING, Priority.BACKGROUND]
+    assert semaphore.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_priority_aging() -> None:
+    """Long waiting background work is promoted ahead of newer interactive work"""
+    semaphore = PrioritySemaphore(1, aging_period=0.05)
+    await semaphore.acquire()
+
+    order: list[Priority] = []
+
+    async def worker(priority: Priority) -> None:
+        await semaphore.acquire(priority)
+        order.append(priority)
+        semaphore.release()
+
+    background = asyncio.create_task(worker(Priority.BACKGROUND))
+    await asyncio.sleep(0.15)
+    interactive = asyncio.create_task(worker(Priority.INTERACTIVE))
+    await asyncio.sleep(0)
+
+    semaphore.release()
+    await asyncio.gather(background, interactive)
+
+    assert order == [Priority.BACKGROUND, Priority.INTERACTIVE]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_slot() -> None:
+    """A cancelled waiter leaves the queue and does not leak a slot"""
+    pool = WorkerPool(name="test", max_concurrent_tasks=1, rate_limit=100, rate_period=1)
+
+    async with pool.throttle():
+        waiter = asyncio.create_task(pool.throttle(priority=Priority.BACKGROUND).__aenter__())
+        await asyncio.sleep(0)
+        assert pool.queue_depths()["background"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert pool.queue_depths()["background"] == 0
+
+    assert pool.semaphore.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_session_fair_share() -> None:
+    """Sessions in the same priority class are served by weighted round robin"""
+    semaphore = PrioritySemaphore(1)
+    await semaphore.acquire()
+
+    order: list[str] = []
+
+    async def worker(session_id: str, weight: float) -> None:
+        await semaphore.acquire(Priority.BACKGROUND, session_id=session_id, weight=weight)
+        order.append(session_id)
+        semaphore.release(session_id)
+
+    # A research session floods the queue before a chat session arrives
+    tasks = [asyncio.create_task(worker("research", 1)) for _ in range(6)]
+    await asyncio.sleep(0)
+    tasks += [asyncio.create_task(worker("chat", 2)) for _ in range(4)]
+    await asyncio.sleep(0)
+
+    semaphore.release()
+    await asyncio.gather(*tasks)
+
+    assert order[:6] == ["research", "chat", "chat", "research", "chat", "chat"]
+
+
+@pytest.mark.asyncio
+async def test_session_slot_cap() -> None:
+    """A single session cannot hold more than its share of slots"""
+    semaphore = PrioritySemaphore(4, max_session_slots=2)
+
+    await semaphore.acquire(session_id="a")
+    await semaphore.acquire(session_id="a")
+
+    blocked = asyncio.create_task(semaphore.acquire(session_id="a"))
+    await asyncio.sleep(0)
+    assert not blocked.done()
+
+    # Other sessions can still use the free slots
+    await asyncio.wait_for(semaphore.acquire(session_id="b"), timeout=1)
+    assert semaphore.session_in_use("b") == 1
+
+    semaphore.release("a")
+    await asyncio.wait_for(blocked, timeout=1)
+    assert semaphore.session_in_use("a") == 2
+
+
+@pytest.mark.asyncio
+async def test_work_session_context() -> None:
+    """Work sessions propagate to spawned tasks and nested sessions keep the outermost"""
+    research = WorkSession(session_id="s1", agent_type="research")
+
+    async def get_session() -> WorkSession | None:
+        return current_work_session()
+
+    with work_session(research):
+        with work_session(WorkSession(session_id="s1", agent_type="search")):
+            assert current_work_session() == research
+        assert await asyncio.create_task(get_session()) == research
+
+    assert current_work_session() is None
+    assert research.weight < WorkSession(session_id="s2", agent_type="chat").weight
+
+
+def test_adaptive_concurrency() -> None:
+    """The limit grows additively while healthy and shrinks multiplicatively on overload"""
+    adaptive = AdaptiveConcurrency(initial=4, min_limit=1, max_limit=8, latency_target=1, cooldown=0)
+
+    for _ in range(8):
+        adaptive.on_success(latency=0.1, saturated=True)
+    assert adaptive.limit == 5
+
+    # Not saturated, no evidence more capacity is needed
+    adaptive.on_success(latency=0.1, saturated=False)
+    assert adaptive.limit == 5
+
+    adaptive.on_error(httpx.HTTPStatusError("Too Many Requests", request=REQUEST, response=httpx.Response(429)))
+    assert adaptive.limit == 2
+    assert adaptive.last_signal == "throttled"
+
+    adaptive.on_success(latency=2, saturated=True)
+    assert adaptive.limit == 1
+    assert adaptive.snapshot()["signals"] == {"ok": 9, "throttled": 1, "latency": 1}
+
+    # Errors that are not overload signals are ignored
+    adaptive.on_error(ValueError("bad output"))
+    assert adaptive.limit == 1
+
+
+def test_overload_signal() -> None:
+    try:
+        try:
+            raise TimeoutError()
+        except TimeoutError as e:
+            raise RuntimeError("Chat model error") from e
+    except RuntimeError as wrapped:
+        assert overload_signal(wrapped) == "timeout"
+
+    assert overload_signal(RuntimeError("Error code: 429 - rate limit exceeded")) == "throttled"
+    assert overload_signal(RuntimeError("4290 tokens")) is None
+
+
+@pytest.mark.asyncio
+async def test_adaptive_pool_resizes() -> None:
+    adaptive = AdaptiveConcurrency(initial=4, min_limit=1, max_limit=8, latency_target=10, cooldown=0)
+    pool = WorkerPool(name="test", rate_limit=100, rate_period=1, adaptive=adaptive)
+    assert pool.concurrency_limit == 4
+
+    with pytest.raises(TimeoutError):
+        async with pool.throttle():
+            raise TimeoutError()
+
+    assert pool.concurrency_limit == 2
+    assert pool.semaphore.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_cost_weighted_rate_limit() -> None:
+    """Batch requests spend the rate budget by cost, and a single request never exceeds the whole budget"""
+    pool = WorkerPool(name="test", rate_limit=10, rate_period=60)
+
+    async with pool.throttle(cost=6):
+        pass
+    assert not pool.rate_limiter.has_capacity(5)
+
+    # Clamped to the budget, waits for the bucket to drain rather than failing
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.1):
+            async with pool.throttle(cost=100):
+                pass
+
+    assert pool.semaphore.in_use == 0
+
+
+def test_embeddings_pool_is_separate() -> None:
+    assert embeddings_pool is not chat_pool
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics() -> None:
+    """Queue wait, service time and outcomes are recorded per call site"""
+    pool = WorkerPool(name="metrics_test", max_concurrent_tasks=1, rate_limit=100, rate_period=1)
+
+    async def work(site: str, fail: bool = False) -> None:
+        async with pool.throttle(site=site):
+            await asyncio.sleep(0.01)
+            if fail:
+                raise ValueError("bad output")
+
+    await asyncio.gather(work("filter"), work("filter"), work("report", fail=True), return_exceptions=True)
+
+    filter_metrics = pool.metrics.site("filter")
+    assert filter_metrics.outcomes == {"ok": 2}
+    assert filter_metrics.service_time.count == 2
+    assert filter_metrics.semaphore_wait.count == 2
+    assert filter_metrics.in_flight == 0
+    assert pool.metrics.site("report").outcomes == {"error": 1}
+
+    snapshot = export_metrics()["metrics_test"]
+    assert snapshot["concurrency_limit"] == 1
+    assert snapshot["queued"]["background"] == 0
+    assert snapshot["sites"]["filter"]["rate_limit_wait"]["count"] == 2
+
+    text = export_metrics(PrometheusExporter())
+    assert "# TYPE granite_pool_service_time_seconds histogram" in text
+    assert 'granite_pool_requests_total{pool="metrics_test",site="report",outcome="error"} 1' in text
+    assert 'granite_pool_semaphore_wait_seconds_bucket{pool="metrics_test",site="filter",le="+Inf"} 2' in text
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_abandoned() -> None:
+    pool = WorkerPool(name="test", max_concurrent_tasks=1, rate_limit=100, rate_period=1)
+
+    async with pool.throttle():
+        waiter = asyncio.create_task(pool.throttle(site="filter").__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    assert pool.metrics.site("filter").outcomes == {"abandoned": 1}
+    assert pool.metrics.site("other").outcomes == {"ok": 1}
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _exit_in_worker(parent: int) -> str:
+    if os.getpid() != parent:
+        os._exit(1)
+    return "thread"
+
+
+@pytest.mark.asyncio
+async def test_cpu_pool_processes() -> None:
+    pool = CpuPool(name="test", max_workers=1, warm_up_modules=("bs4",))
+    try:
+        pool.start()
+        assert pool.uses_processes
+        assert await pool.run(_pid) != os.getpid()
+
+        html = b"<html><head><title>Granite</title></head><body><nav>menu</nav><p>Hello   world</p></body></html>"
+        assert await pool.run(extract_html, html, "utf-8") == ("Granite Hello world", "Granite")
+
+        # A crashed worker is replaced, the task is retried in a thread
+        assert await pool.run(_exit_in_worker, os.getpid()) == "thread"
+        assert pool.uses_processes
+        assert await pool.run(_pid) != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cpu_pool_thread_fallback() -> None:
+    pool = CpuPool(name="test", max_workers=0)
+    pool.start()
+
+    assert not pool.uses_processes
+    assert await pool.run(_pid) == os.getpid()
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_deadline_nesting() -> None:
+    """Nested deadlines and stages can only shorten the enclosing deadline"""
+    assert time_remaining() is None
+
+    with deadline(10):
+        with deadline(60):
+            assert (remaining := time_remaining()) is not None and remaining <= 10
+
+        with deadline_stage(0.5):
+            assert (remaining := time_remaining()) is not None and remaining <= 5
+
+        assert (remaining := time_remaining()) is not None and remaining > 5
+
+    with deadline_stage(0.5):
+        assert time_remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_gather_within_partial_results() -> None:
+    """Stragglers are cancelled at the deadline, releasing their pool slots"""
+    pool = WorkerPool(name="test", max_concurrent_tasks=1, rate_limit=100, rate_period=1)
+
+    async def work(delay: float) -> float:
+        async with pool.throttle(site="filter"):
+            await asyncio.sleep(delay)
+        return delay
+
+    with deadline(0.2):
+        results = await gather_within(work(0), work(10), work(0))
+
+    # The second task holds the only slot until cancelled, the third never gets one
+    assert results == [0, None, None]
+    assert pool.semaphore.in_use == 0
+    assert pool.metrics.site("filter").outcomes == {"ok": 1, "cancelled": 1, "abandoned": 1}
+
+    # Without a deadline everything is awaited
+    assert await gather_within(work(0), work(0.01)) == [0, 0.01]
+
+
+@pytest.mark.asyncio
+async def test_gather_within_cancellation() -> None:
+    """Cancelling the caller cancels the fan out, releases slots and records the wasted work"""
+    pool = WorkerPool(name="test", max_concurrent_tasks=1, rate_limit=100, rate_period=1)
+
+    async def work() -> None:
+        async with pool.throttle(site="research_step"):
+            await asyncio.sleep(10)
+
+    run = asyncio.create_task(gather_within(work(), work()))
+    await asyncio.sleep(0.05)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+    assert pool.semaphore.in_use == 0
+    metrics = pool.metrics.site("research_step")
+    assert metrics.outcomes == {"cancelled": 1, "abandoned": 1}
+    assert metrics.wasted_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_gather_within_error() -> None:
+    """The first failure is raised as is and the remaining tasks are cancelled"""
+    cancelled = asyncio.Event()
+
+    async def fail() -> None:
+        raise ValueError("bad output")
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(ValueError, match="bad output"):
+        await gather_within(slow(), fail())
+
+    assert cancelled.is_set()
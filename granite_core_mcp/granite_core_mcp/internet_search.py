@@ -13,6 +13,7 @@ from granite_core.search.engines.factory import SearchEngineFactory
 from granite_core.search.scraping.runner import ScraperRunner
 from granite_core.search.scraping.types import ScrapedContent
 from granite_core.search.types import SearchResult
+from granite_core.work import cpu_pool
 
 from granite_core_mcp.base import MCPService, TransportType
 
@@ -70,7 +71,10 @@ class InternetSearchService(MCPService):
                 max_scraped_content=self.max_scraped,
             )
 
-            contents: list[ScrapedContent] = await scraper.run()
+            try:
+                contents: list[ScrapedContent] = await scraper.run()
+            finally:
+                await scraper.close()
 
             for sc in contents:
                 if len(sc.content) > self.max_scraped_content_length:
@@ -121,6 +125,7 @@ def main() -> None:
         transport=args.transport,  # type: ignore[arg-type]
         max_search_results=args.max_results,
     )
+    cpu_pool.start()
     service.run()
 
 